@@ -61,9 +61,11 @@ class MemoryManager:
         return -1  
     
     # Funcion para obtener la dirección de memoria de una constante
+    # (2 y 2.0 son constantes distintas: la llave incluye el tipo)
     def get_constant_address(self, value):
-        if value in self.constants:
-            return self.constants[value]      
+        key = (type(value), value)
+        if key in self.constants:
+            return self.constants[key]      
         if isinstance(value, int):
             addr = self.CONST_INT_START + self.const_int_counter
             self.const_int_counter += 1
@@ -73,7 +75,7 @@ class MemoryManager:
         else:
             return -1  
         
-        self.constants[value] = addr
+        self.constants[key] = addr
         return addr
     
     # Resetear los contadores locales y temporales
@@ -82,4 +84,23 @@ class MemoryManager:
         self.local_float_counter = 0
         self.temp_int_counter = 0
         self.temp_float_counter = 0
-        self.temp_bool_counter = 0  
+        self.temp_bool_counter = 0
+
+    # Tamaño del registro de activación de la función que se está compilando
+    def get_frame_sizes(self):
+        return (self.local_int_counter, self.local_float_counter,
+                self.temp_int_counter, self.temp_float_counter, self.temp_bool_counter)
+
+    # Tamaño usado de cada segmento, en el orden de sus direcciones
+    def get_segment_sizes(self):
+        return {
+            'global_int': self.global_int_counter,
+            'global_float': self.global_float_counter,
+            'local_int': self.local_int_counter,
+            'local_float': self.local_float_counter,
+            'temp_int': self.temp_int_counter,
+            'temp_float': self.temp_float_counter,
+            'temp_bool': self.temp_bool_counter,
+            'const_int': self.const_int_counter,
+            'const_float': self.const_float_counter,
+        }
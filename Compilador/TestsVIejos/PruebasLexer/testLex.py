@@ -8,7 +8,7 @@ import ply.lex as lex
 
 # Importar el lexer y parser
 from lex import lexer, tokens
-from yacc import parser
+from yacc import Compiler
 
 # Categorías de pruebas
 lexer_tests = [
@@ -614,7 +614,7 @@ def run_parser_test(test_id, code, description):
         sys.stdout = redirected_output
         
         # Parsear el código
-        result = parser.parse(code)
+        result, errors = Compiler().parse(code)
         
         # Restaurar la salida estándar
         sys.stdout = old_stdout
@@ -770,7 +770,7 @@ def run_tests():
                     tokens_list.append((tok.type, tok.value))
                 print("Tokens:", tokens_list)
             elif code.startswith("P-"):
-                result = parser.parse(input_text, lexer=lexer)
+                result, errors = Compiler().parse(input_text)
                 print("Resultado del parser:", result)
         except Exception as e:
             print("Error durante la prueba:")
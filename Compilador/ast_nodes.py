@@ -0,0 +1,116 @@
+from semantic_cube import Type
+
+# Nodos de expresión que arma el parser. Cada nodo guarda su tipo (resuelto
+# con el cubo semántico al reducir la regla) y la dirección donde queda su
+# valor: la de la variable o la constante en cuanto se reconoce, o el temporal
+# del cuádruplo que la calcula. La clase del nodo indica de qué clase de
+# operando se trata, así que consultar el tipo o el operando de una expresión
+# es leer un atributo y la generación de cuádruplos ya recibe direcciones.
+
+# Operando de una expresión cuya dirección no se pudo resolver (por un error)
+UNRESOLVED = -1
+
+class Expression:
+    """Base de los nodos de expresión"""
+    __slots__ = ('type', 'address')
+
+    def __init__(self, type, address=None):
+        self.type = type
+        self.address = address
+
+    @property
+    def operand(self):
+        """Dirección que recibe QuadrupleGenerator para usar este valor"""
+        if self.address is None:
+            return UNRESOLVED
+        return self.address
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self._fields())
+        return f"{type(self).__name__}({fields})"
+
+    def _fields(self):
+        names = []
+        for cls in reversed(type(self).__mro__):
+            names.extend(getattr(cls, '__slots__', ()))
+        return names
+
+class Id(Expression):
+    """Variable referenciada por nombre, con la dirección que le tocó al declararla"""
+    __slots__ = ('name',)
+
+    def __init__(self, name, type, address):
+        super().__init__(type, address)
+        self.name = name
+
+class Constant(Expression):
+    """Constante numérica (entera o flotante) y su dirección en la tabla de constantes"""
+    __slots__ = ('value',)
+
+    def __init__(self, value, type, address):
+        super().__init__(type, address)
+        self.value = value
+
+class StringLiteral(Expression):
+    """Cadena constante; solo aparece como argumento de print"""
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        super().__init__(Type.STRING)
+        self.value = value
+
+    @property
+    def operand(self):
+        return self.value
+
+class TempResult(Expression):
+    """Resultado de una cadena de sumas/restas o multiplicaciones/divisiones,
+    ya guardado en un temporal"""
+    __slots__ = ()
+
+class BinaryOperation(Expression):
+    """Operación binaria cuyo cuádruplo no se pudo generar (error de tipos)"""
+    __slots__ = ('left', 'operator', 'right')
+
+    def __init__(self, left, operator, right, type):
+        super().__init__(type)
+        self.left = left
+        self.operator = operator
+        self.right = right
+
+class Comparison(Expression):
+    """Comparación (>, <, !=); su resultado es un temporal booleano"""
+    __slots__ = ('left', 'operator', 'right')
+
+    def __init__(self, left, operator, right, type, address):
+        super().__init__(type, address)
+        self.left = left
+        self.operator = operator
+        self.right = right
+
+class Unary(Expression):
+    """Signo aplicado a un id, constante o llamada. El '-' genera un
+    cuádruplo (-1 * x) y deja su temporal en address; el '+' usa el
+    operando de la expresión tal cual"""
+    __slots__ = ('sign', 'expression')
+
+    def __init__(self, sign, expression, type, address=None):
+        super().__init__(type, address)
+        self.sign = sign
+        self.expression = expression
+
+    @property
+    def operand(self):
+        if self.address is None:
+            return self.expression.operand
+        return self.address
+
+class FunctionCall(Expression):
+    """Llamada a función dentro de una expresión; address es el temporal
+    donde GOSUB deja el valor de regreso"""
+    __slots__ = ('name', 'arguments')
+
+    def __init__(self, name, arguments, type, address=None):
+        super().__init__(type, address)
+        self.name = name
+        self.arguments = arguments
@@ -0,0 +1,60 @@
+# Tiempo de arranque de un programa según de dónde sale: compilarlo desde el
+# código fuente, cargarlo de la caché en disco (pickle) o cargar su bytecode
+# con mmap. Cada variante termina con la VM construida y lista para execute().
+#
+# Uso:
+#   python benchmarks/bench_bytecode.py
+#   python benchmarks/bench_bytecode.py --repeat 20 --optimize
+import argparse
+import os
+import tempfile
+
+from bench_utils import load_test_programs, silenced, best_time
+
+def build_vm(execution_data):
+    from virtual_machine import VirtualMachine, VERBOSITY_SILENT
+    return VirtualMachine(execution_data['quadruples'], execution_data['constants_table'],
+                          execution_data['function_directory'], execution_data['memory_sizes'],
+                          verbosity=VERBOSITY_SILENT)
+
+def main():
+    parser = argparse.ArgumentParser(description="Arranque desde fuente, caché pickle y bytecode")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--optimize", action="store_true")
+    args = parser.parse_args()
+
+    import bytecode
+    from yacc import compile_program
+    from compile_cache import CompileCache
+
+    header = (f"{'programa':32} {'bytes':>6} {'fuente':>9} {'pickle':>9} {'bytecode':>9} "
+              f"{'vs fuente':>9}")
+    print(header)
+    print("-" * len(header))
+    with tempfile.TemporaryDirectory() as directory:
+        cache = CompileCache(os.path.join(directory, 'cache'))
+        for name, code in load_test_programs():
+            data, _ = silenced(compile_program, code, args.optimize, False)
+            cache.store(code, data, args.optimize)
+            path = os.path.join(directory, name + bytecode.FILE_EXTENSION)
+            bytecode.dump(data, path)
+
+            def from_source():
+                build_vm(silenced(compile_program, code, args.optimize, False)[0])
+
+            def from_cache():
+                build_vm(cache.load(code, args.optimize))
+
+            def from_bytecode():
+                program = bytecode.load(path)
+                build_vm(program.execution_data())
+                program.close()
+
+            source = best_time(from_source, args.repeat)
+            pickled = best_time(from_cache, args.repeat)
+            binary = best_time(from_bytecode, args.repeat)
+            print(f"{name:32} {os.path.getsize(path):6} {source * 1000:7.2f}ms {pickled * 1000:7.2f}ms "
+                  f"{binary * 1000:7.2f}ms {source / binary:8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# Tiempo de compilación sin caché (lexer, parser LALR, análisis semántico y
+# cuádruplos) contra cargar el programa ya compilado de la caché en disco.
+# Usa un directorio temporal para no tocar la caché del usuario.
+#
+# Uso:
+#   python benchmarks/bench_compile_cache.py
+#   python benchmarks/bench_compile_cache.py --repeat 10 --optimize
+import argparse
+import tempfile
+
+from bench_utils import load_test_programs, silenced, best_time
+
+def main():
+    parser = argparse.ArgumentParser(description="Compilación completa contra acierto en la caché")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--optimize", action="store_true")
+    args = parser.parse_args()
+
+    from yacc import compile_program
+    from compile_cache import CompileCache
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = CompileCache(directory)
+        header = f"{'programa':32} {'compilar':>10} {'caché':>10} {'mejora':>8}"
+        print(header)
+        print("-" * len(header))
+        total_cold = total_warm = 0
+        for name, code in load_test_programs():
+            cold = best_time(lambda: silenced(compile_program, code, args.optimize, False), args.repeat)
+            silenced(compile_program, code, args.optimize, cache)
+            warm = best_time(lambda: silenced(compile_program, code, args.optimize, cache), args.repeat)
+            total_cold += cold
+            total_warm += warm
+            print(f"{name:32} {cold * 1000:8.2f}ms {warm * 1000:8.2f}ms {cold / warm:7.1f}x")
+        print("-" * len(header))
+        print(f"{'TOTAL':32} {total_cold * 1000:8.2f}ms {total_warm * 1000:8.2f}ms "
+              f"{total_cold / total_warm:7.1f}x")
+        print(cache.stats())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# Efecto del plegado y propagación de constantes (optimizer.fold_constants):
+# cuántos cuádruplos quita de cada programa de testsPorSeparado y cuántas
+# instrucciones deja de despachar la VM. Verifica que el programa plegado
+# imprima lo mismo que el original.
+#
+# Uso:
+#   python benchmarks/bench_constant_folding.py
+#   python benchmarks/bench_constant_folding.py --program fold.txt
+import argparse
+import io
+from contextlib import redirect_stdout
+
+from bench_utils import load_test_programs, silenced
+
+def compile_folded(code, fold):
+    """Datos de ejecución del programa, con o sin fold_constants"""
+    from yacc import Compiler
+    import optimizer
+    compiler = Compiler()
+    with redirect_stdout(io.StringIO()):
+        result, errors = compiler.parse(code)
+    if errors:
+        raise RuntimeError(f"El programa tiene errores semánticos: {errors}")
+    if fold:
+        optimizer.fold_constants(compiler.quad_gen)
+    return compiler.get_execution_data()
+
+def run(data):
+    from virtual_machine import VirtualMachine, VERBOSITY_SILENT
+    vm = VirtualMachine(data['quadruples'], data['constants_table'], data['function_directory'],
+                        data['memory_sizes'], verbosity=VERBOSITY_SILENT)
+    silenced(vm.execute)
+    return vm
+
+def main():
+    parser = argparse.ArgumentParser(description="Cuádruplos e instrucciones ahorrados al plegar constantes")
+    parser.add_argument("--program", nargs="*", default=[], help="programas extra a medir")
+    args = parser.parse_args()
+
+    programs = load_test_programs()
+    for path in args.program:
+        with open(path, 'r', encoding='utf-8') as f:
+            programs.append((path, f.read()))
+    header = (f"{'programa':32} {'quads':>6} {'pleg.':>6} {'menos':>6} {'desp.':>8} {'pleg.':>8} "
+              f"{'ahorro':>7}")
+    print(header)
+    print("-" * len(header))
+    totals = [0, 0, 0, 0]
+    for name, code in programs:
+        plain = compile_folded(code, fold=False)
+        folded = compile_folded(code, fold=True)
+        plain_vm = run(plain)
+        folded_vm = run(folded)
+        if plain_vm.program_outputs != folded_vm.program_outputs:
+            raise SystemExit(f"{name}: el programa plegado imprime otra cosa")
+        counts = (len(plain['quadruples']), len(folded['quadruples']),
+                  plain_vm.instructions_executed, folded_vm.instructions_executed)
+        print(f"{name:32} {counts[0]:6} {counts[1]:6} {counts[0] - counts[1]:6} {counts[2]:8} "
+              f"{counts[3]:8} {1 - counts[3] / counts[2]:7.1%}")
+        for position, value in enumerate(counts):
+            totals[position] += value
+    print("-" * len(header))
+    print(f"{'TOTAL':32} {totals[0]:6} {totals[1]:6} {totals[0] - totals[1]:6} {totals[2]:8} "
+          f"{totals[3]:8} {1 - totals[3] / totals[2]:7.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# Benchmark de despacho de la máquina virtual: cuádruplos ejecutados por segundo.
+#
+# Uso:
+#   python benchmarks/bench_dispatch.py                 # solo la VM actual
+#   python benchmarks/bench_dispatch.py --ref 6901e23   # compara contra la VM de otro commit
+#   python benchmarks/bench_dispatch.py --verbosity 2   # VM actual con traza completa
+#   python benchmarks/bench_dispatch.py --backend closure
+#
+# Con --ref se carga virtual_machine.py de ese commit (git show) y se ejecuta
+# sobre los mismos cuádruplos, para ver el "antes" y el "después".
+import argparse
+import inspect
+
+from bench_utils import (load_module_at, load_test_programs, compile_program, legacy_execution_data,
+                         silenced, best_time)
+
+def load_reference_vm(ref):
+    """Carga la clase VirtualMachine de virtual_machine.py en el commit indicado"""
+    return load_module_at(ref, "virtual_machine.py").VirtualMachine
+
+def count_instructions(data):
+    """Cuenta los cuádruplos que ejecuta el programa con la VM actual"""
+    from virtual_machine import VirtualMachine, VERBOSITY_SILENT
+    vm = VirtualMachine(data['quadruples'], data['constants_table'], data['function_directory'],
+                        data['memory_sizes'], verbosity=VERBOSITY_SILENT)
+    vm.execute()
+    return vm.instructions_executed
+
+def supported_options(vm_class, options):
+    """Opciones que acepta el constructor de esa versión de la VM"""
+    parameters = inspect.signature(vm_class.__init__).parameters
+    return {name: value for name, value in options.items() if name in parameters}
+
+def run_once(vm_class, data, **options):
+    vm = vm_class(data['quadruples'], data['constants_table'], data['function_directory'], **options)
+    silenced(vm.execute)
+
+def main():
+    parser = argparse.ArgumentParser(description="Cuádruplos por segundo de la VM")
+    parser.add_argument("--ref", help="commit de git con la VM a comparar (antes)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--backend", default="vm", help="backend a medir: vm o closure")
+    parser.add_argument("--verbosity", type=int, default=0,
+                        help="verbosidad de la VM actual (0 silencio, 1 outputs, 2 traza)")
+    args = parser.parse_args()
+
+    from yacc import get_machine_class
+    machine_class = get_machine_class(args.backend)
+    reference = load_reference_vm(args.ref) if args.ref else None
+
+    header = f"{'programa':32} {'quads':>9} {'actual q/s':>12}"
+    if reference:
+        header += f" {'antes q/s':>12} {'mejora':>8}"
+    print(header)
+    print("-" * len(header))
+    total_quads = total_new = total_old = 0.0
+    for name, code in load_test_programs():
+        data = compile_program(code)
+        executed = count_instructions(data)
+        options = {'memory_sizes': data['memory_sizes'], 'verbosity': args.verbosity}
+        new_time = best_time(lambda: run_once(machine_class, data, **options), args.repeat)
+        line = f"{name:32} {executed:>9} {executed / new_time:>12,.0f}"
+        total_quads += executed
+        total_new += new_time
+        if reference:
+            old_options = supported_options(reference, options)
+            legacy = legacy_execution_data(data)
+            old_time = best_time(lambda: run_once(reference, legacy, **old_options), args.repeat)
+            total_old += old_time
+            line += f" {executed / old_time:>12,.0f} {old_time / new_time:>7.2f}x"
+        print(line)
+    print("-" * len(header))
+    line = f"{'TOTAL':32} {int(total_quads):>9} {total_quads / total_new:>12,.0f}"
+    if reference:
+        line += f" {total_quads / total_old:>12,.0f} {total_old / total_new:>7.2f}x"
+    print(line)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# Tiempo de compilación según el largo de las listas que arma la gramática:
+# sentencias de un bloque, argumentos de print, ids de una declaración,
+# funciones, parámetros y argumentos de una llamada. Con reglas recursivas por
+# la izquierda que agregan a la misma lista el costo por elemento se mantiene
+# constante; con `[p[1]] + p[2]` crece con el tamaño de la lista.
+#
+# Uso:
+#   python benchmarks/bench_grammar_lists.py
+#   python benchmarks/bench_grammar_lists.py --sizes 1000 10000 20000
+#   python benchmarks/bench_grammar_lists.py --ref <commit>   # compara contra yacc.py de otro commit
+import argparse
+import os
+import sys
+import tempfile
+
+from bench_utils import load_module_at, silenced, best_time
+from bench_quad_storage import generated_program
+
+def print_arguments(size):
+    """Un solo print con size argumentos, alternando cadenas y expresiones"""
+    arguments = ", ".join('"x"' if index % 2 else f"x + {index}" for index in range(size))
+    return f"program lista;\nvar x : int;\nmain {{\n    print({arguments});\n}}\nend\n"
+
+def declared_ids(size):
+    """Declaraciones con size ids en total, repartidos en varias líneas de var"""
+    lines = []
+    for start in range(0, size, 100):
+        names = ", ".join(f"v{index}" for index in range(start, min(start + 100, size)))
+        lines.append(f"    {names} : int;")
+    return "program lista;\nvar\n" + "\n".join(lines) + "\nmain {\n    v0 = 1;\n}\nend\n"
+
+def declared_functions(size):
+    """size funciones void vacías antes de main"""
+    functions = "".join(f"void f{index}()\n[\n    {{\n    }}\n];\n" for index in range(size))
+    return f"program lista;\n{functions}main {{\n}}\nend\n"
+
+def call_arguments(size):
+    """Una función con size parámetros y una llamada que le pasa size argumentos"""
+    params = ", ".join(f"p{index} : int" for index in range(size))
+    arguments = ", ".join(str(index) for index in range(size))
+    return (f"program lista;\nvoid f({params})\n[\n    {{\n    }}\n];\n"
+            f"main {{\n    f({arguments});\n}}\nend\n")
+
+WORKLOADS = [
+    ("sentencias", generated_program),
+    ("argumentos de print", print_arguments),
+    ("ids declarados", declared_ids),
+    ("funciones", declared_functions),
+    ("parámetros y argumentos", call_arguments),
+]
+
+def compile_with(module, code):
+    compiler = module.Compiler()
+    result, errors = compiler.parse(code)
+    if errors:
+        raise RuntimeError(f"El programa tiene errores semánticos: {errors[:3]}")
+    return compiler
+
+def reference_parser(ref, directory):
+    """yacc.py del commit indicado, con sus tablas LALR en un archivo aparte"""
+    module = load_module_at(ref, "yacc.py")
+    sys.modules[module.__name__] = module
+    module.PARSER_TABLES = os.path.join(directory, "parser_tables.pickle")
+    return module
+
+def main():
+    parser = argparse.ArgumentParser(description="Compilación con listas largas en la gramática")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--ref", help="commit de git con el yacc.py a comparar (antes)")
+    args = parser.parse_args()
+
+    import yacc
+    with tempfile.TemporaryDirectory() as directory:
+        reference = reference_parser(args.ref, directory) if args.ref else None
+        header = f"{'lista':24} {'tamaño':>7} {'actual':>10} {'µs/elem':>8}"
+        if reference:
+            header += f" {'ref':>10} {'µs/elem':>8} {'mejora':>7}"
+        print(header)
+        print("-" * len(header))
+        for name, build in WORKLOADS:
+            for size in args.sizes:
+                code = build(size)
+                current = best_time(lambda: silenced(compile_with, yacc, code), args.repeat)
+                line = f"{name:24} {size:7} {current:9.3f}s {current / size * 1e6:8.1f}"
+                if reference:
+                    before = best_time(lambda: silenced(compile_with, reference, code), args.repeat)
+                    line += f" {before:9.3f}s {before / size * 1e6:8.1f} {before / current:6.2f}x"
+                print(line)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Rendimiento del tokenizador: lexer de PLY contra lex.FastLexer, en tokens
+# por segundo. Usa los casos de TestsVIejos/PruebasLexer/testLex.py, los
+# programas de testsPorSeparado y fuentes sintéticas grandes. Antes de medir
+# verifica que los dos produzcan la misma secuencia de tokens.
+#
+# Uso:
+#   python benchmarks/bench_lexer.py
+#   python benchmarks/bench_lexer.py --repeat 10 --size 200000
+import argparse
+import os
+import sys
+
+from bench_utils import COMPILER_DIR, load_test_programs, silenced, best_time
+
+LEXER_TESTS_DIR = os.path.join(COMPILER_DIR, "TestsVIejos", "PruebasLexer")
+
+def lexer_test_cases():
+    """Código de todos los casos de testLex.py (léxicos y de parser)"""
+    if LEXER_TESTS_DIR not in sys.path:
+        sys.path.insert(0, LEXER_TESTS_DIR)
+    import testLex
+    cases = []
+    for name in sorted(vars(testLex)):
+        value = getattr(testLex, name)
+        if name.endswith('_tests') and isinstance(value, list):
+            cases.extend(code for _, code, _ in value)
+    return cases
+
+def synthetic_source(size):
+    """Programa con unos size tokens: declaraciones, expresiones, flotantes,
+    cadenas, comentarios y llamadas"""
+    lines = ["program sintetico;", "var a, b, c : int; x, y : float;"]
+    count = 0
+    index = 0
+    while count < size:
+        lines.append(f"    a = b * {index} + (c - 3) / 2;  # comentario {index}")
+        lines.append(f"    x = y + {index}.25 * 1.5;")
+        lines.append(f"    if (a != b) {{ print(\"valor\", a, x); }} else {{ c = f(a, {index}); }};")
+        count += 60
+        index += 1
+    return "\n".join(lines) + "\nend\n"
+
+def ply_tokenize(data):
+    from lex import lexer
+    ply_lexer = lexer.clone()
+    ply_lexer.lineno = 1
+    ply_lexer.input(data)
+    return list(ply_lexer)
+
+def fast_tokenize(data):
+    from lex import tokenize
+    return tokenize(data)
+
+def stream(tokens):
+    return [(token.type, token.value, token.lineno, token.lexpos) for token in tokens]
+
+def main():
+    parser = argparse.ArgumentParser(description="Tokens por segundo: PLY contra FastLexer")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--size", type=int, default=100000, help="tokens de la fuente sintética grande")
+    args = parser.parse_args()
+
+    workloads = [
+        ("casos testLex", lexer_test_cases()),
+        ("testsPorSeparado", [code for _, code in load_test_programs()]),
+        ("sintético 10k", [synthetic_source(10000)]),
+        (f"sintético {args.size // 1000}k", [synthetic_source(args.size)]),
+    ]
+    header = f"{'entrada':20} {'textos':>6} {'tokens':>8} {'PLY tok/s':>12} {'rápido tok/s':>13} {'mejora':>7}"
+    print(header)
+    print("-" * len(header))
+    for name, sources in workloads:
+        expected = [stream(silenced(ply_tokenize, source)) for source in sources]
+        actual = [stream(silenced(fast_tokenize, source)) for source in sources]
+        if expected != actual:
+            raise SystemExit(f"{name}: los tokenizadores producen secuencias distintas")
+        count = sum(len(tokens) for tokens in expected)
+        ply_time = best_time(lambda: [silenced(ply_tokenize, source) for source in sources], args.repeat)
+        fast_time = best_time(lambda: [silenced(fast_tokenize, source) for source in sources], args.repeat)
+        print(f"{name:20} {len(sources):6} {count:8} {count / ply_time:12,.0f} "
+              f"{count / fast_time:13,.0f} {ply_time / fast_time:6.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# Efecto de la memorización de funciones puras: tiempo e instrucciones
+# despachadas con la caché desactivada (memo_capacity=0) y con distintas
+# capacidades, sobre un fibonacci recursivo y los programas de testsPorSeparado.
+#
+# Uso:
+#   python benchmarks/bench_memo.py
+#   python benchmarks/bench_memo.py --n 22 --backend closure --capacity 0 16 4096
+import argparse
+
+from bench_utils import load_test_programs, compile_program, silenced, best_time
+
+FIBONACCI = """
+program memo_fib;
+var r : int;
+
+int fib(n : int)
+[
+    {
+        if (n < 2) {
+            return n;
+        } else {
+            return fib(n - 1) + fib(n - 2);
+        };
+    }
+];
+
+main {
+    r = fib(%d);
+    print(r);
+}
+end
+"""
+
+def run(machine_class, data, capacity):
+    from virtual_machine import VERBOSITY_SILENT
+    vm = machine_class(data['quadruples'], data['constants_table'], data['function_directory'],
+                       data['memory_sizes'], verbosity=VERBOSITY_SILENT, memo_capacity=capacity)
+    silenced(vm.execute)
+    return vm
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo con y sin memorización de funciones puras")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--n", type=int, default=20, help="argumento de fib")
+    parser.add_argument("--backend", default="vm")
+    parser.add_argument("--capacity", type=int, nargs="+", default=[0, 8, 4096])
+    args = parser.parse_args()
+
+    from yacc import get_machine_class
+    machine_class = get_machine_class(args.backend)
+
+    programs = [(f"fib({args.n})", FIBONACCI % args.n)] + load_test_programs()
+    header = f"{'programa':32} {'puras':>5} " + " ".join(f"{'cap=' + str(c):>10}" for c in args.capacity)
+    print(header)
+    print("-" * len(header))
+    for name, code in programs:
+        data = compile_program(code)
+        pure = sum(1 for info in data['function_directory'].values() if info.is_pure)
+        cells = []
+        baseline = None
+        for capacity in args.capacity:
+            elapsed = best_time(lambda: run(machine_class, data, capacity), args.repeat)
+            baseline = baseline or elapsed
+            cells.append(f"{baseline / elapsed:9.2f}x")
+        print(f"{name:32} {pure:5} " + " ".join(cells))
+        if pure:
+            for capacity in args.capacity:
+                memo = run(machine_class, data, capacity).memo
+                if memo is not None:
+                    stats = memo.stats()
+                    print(f"{'':32}   cap={capacity}: {stats['hits']} aciertos, "
+                          f"{stats['misses']} fallos, {stats['evictions']} desalojos")
+
+if __name__ == "__main__":
+    main()
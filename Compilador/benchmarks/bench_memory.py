@@ -0,0 +1,111 @@
+# Benchmark de la memoria de ejecución: listas por segmento contra los
+# diccionarios por segmento de la versión original de ExecutionMemory.
+#
+# Uso:
+#   python benchmarks/bench_memory.py               # compara contra el primer commit
+#   python benchmarks/bench_memory.py --ref <commit>
+#
+# Se ejecuta cada programa una vez con la VM actual registrando todas las
+# lecturas y escrituras de memoria; luego se reproduce esa misma secuencia
+# sobre cada memoria, así que la diferencia de tiempo es la del acceso a
+# memoria. (La memoria de diccionarios no tiene registros de activación, por
+# eso no se puede ejecutar la VM actual sobre ella.) El tamaño reportado es el
+# de los contenedores de cada segmento al terminar la secuencia.
+import argparse
+import sys
+
+from bench_utils import (load_module_at, root_commit, load_test_programs, compile_program,
+                         best_time)
+
+def container_bytes(memory):
+    """Bytes de los contenedores de segmento (listas o diccionarios)"""
+    if hasattr(memory, 'segments'):
+        return sum(sys.getsizeof(cells) for cells in memory.segments)
+    return sum(sys.getsizeof(cells) for name, cells in vars(memory).items()
+               if name.endswith('_memory'))
+
+READ = object()
+
+def record_accesses(data):
+    """Ejecuta el programa y regresa [(dirección, valor o READ)] en orden"""
+    from virtual_machine import VirtualMachine, VERBOSITY_SILENT
+    vm = VirtualMachine(data['quadruples'], data['constants_table'], data['function_directory'],
+                        data['memory_sizes'], verbosity=VERBOSITY_SILENT)
+    memory = vm.memory
+    get_value, set_value, store = memory.get_value, memory.set_value, memory.store
+    accesses = []
+    def recording_get(address):
+        accesses.append((address, READ))
+        return get_value(address)
+    def recording_set(address, value):
+        accesses.append((address, value))
+        set_value(address, value)
+    def recording_store(address, value):
+        accesses.append((address, value))
+        store(address, value)
+    memory.get_value, memory.set_value, memory.store = recording_get, recording_set, recording_store
+    vm.execute()
+    return accesses
+
+def largest_frame(data):
+    """Tamaño por segmento del registro de activación más grande del programa"""
+    from virtual_machine import VirtualMachine, EMPTY_FRAME, VERBOSITY_SILENT
+    vm = VirtualMachine(data['quadruples'], data['constants_table'], data['function_directory'],
+                        data['memory_sizes'], verbosity=VERBOSITY_SILENT)
+    sizes = EMPTY_FRAME
+    for layout in vm.frame_layouts.values():
+        sizes = tuple(max(pair) for pair in zip(sizes, layout.sizes))
+    return sizes
+
+def make_memory(data, frame_sizes, memory_class=None):
+    """Memoria con las constantes cargadas; la de listas con un registro de
+    activación de tamaño frame_sizes"""
+    if memory_class is None:
+        from virtual_machine import ExecutionMemory
+        memory = ExecutionMemory(data['memory_sizes'])
+        memory.install_frame(memory.new_frame(frame_sizes))
+    else:
+        memory = memory_class()
+    for address, value in data['constants_table'].items():
+        memory.set_value(address, value)
+    return memory
+
+def replay(memory, accesses):
+    for address, value in accesses:
+        if value is READ:
+            memory.get_value(address)
+        else:
+            memory.set_value(address, value)
+
+def main():
+    parser = argparse.ArgumentParser(description="Memoria por listas contra memoria por diccionarios")
+    parser.add_argument("--ref", help="commit con la ExecutionMemory de diccionarios (default: primer commit)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    dict_memory = load_module_at(args.ref or root_commit(), "virtual_machine.py").ExecutionMemory
+
+    header = (f"{'programa':32} {'listas s':>9} {'dicts s':>9} {'mejora':>7}"
+              f" {'listas B':>9} {'dicts B':>9}")
+    print(header)
+    print("-" * len(header))
+    total_list = total_dict = 0.0
+    for name, code in load_test_programs():
+        data = compile_program(code)
+        accesses = record_accesses(data)
+        sizes = largest_frame(data)
+        list_time = best_time(lambda: replay(make_memory(data, sizes), accesses), args.repeat)
+        dict_time = best_time(lambda: replay(make_memory(data, sizes, dict_memory), accesses), args.repeat)
+        list_memory = make_memory(data, sizes)
+        replay(list_memory, accesses)
+        dict_memory_used = make_memory(data, sizes, dict_memory)
+        replay(dict_memory_used, accesses)
+        total_list += list_time
+        total_dict += dict_time
+        print(f"{name:32} {list_time:>9.4f} {dict_time:>9.4f} {dict_time / list_time:>6.2f}x"
+              f" {container_bytes(list_memory):>9} {container_bytes(dict_memory_used):>9}")
+    print("-" * len(header))
+    print(f"{'TOTAL':32} {total_list:>9.4f} {total_dict:>9.4f} {total_dict / total_list:>6.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# Memoria de la lista de cuádruplos: QuadrupleArrays (columnas array('i') y
+# tabla de cadenas) contra la lista de objetos Quadruple que usaba antes
+# QuadrupleGenerator. Se mide con tracemalloc sobre programas generados de
+# distintos tamaños y sobre testsPorSeparado.
+#
+# Uso:
+#   python benchmarks/bench_quad_storage.py
+#   python benchmarks/bench_quad_storage.py --statements 1000 5000 20000
+import argparse
+import tracemalloc
+
+from bench_utils import load_test_programs, compile_program
+
+def generated_program(statements):
+    """Programa con una función y muchas asignaciones, llamadas y prints"""
+    body = []
+    for index in range(statements):
+        kind = index % 4
+        if kind == 0:
+            body.append(f"    x = x + {index} * y;")
+        elif kind == 1:
+            body.append(f"    z = z / 2.5 - x;")
+        elif kind == 2:
+            body.append(f"    y = doble(x);")
+        else:
+            body.append(f"    print(\"paso\", x);")
+    return ("program grande;\nvar x, y : int; z : float;\n"
+            "int doble(n : int)\n[\n    {\n        return n * 2;\n    }\n];\n"
+            "main {\n" + "\n".join(body) + "\n}\nend\n")
+
+def measured(build):
+    """(objeto construido, bytes asignados mientras se construyó)"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return result, allocated
+
+def main():
+    parser = argparse.ArgumentParser(description="Memoria por cuádruplo: columnas contra objetos")
+    parser.add_argument("--statements", type=int, nargs="+", default=[1000, 5000])
+    args = parser.parse_args()
+
+    from quadruple_generator import Quadruple, QuadrupleArrays
+
+    programs = [(f"generado {count}", generated_program(count)) for count in args.statements]
+    programs += load_test_programs()
+    header = f"{'programa':32} {'quads':>7} {'objetos':>10} {'columnas':>10} {'B/quad':>11} {'menos':>6}"
+    print(header)
+    print("-" * len(header))
+    for name, code in programs:
+        quads = compile_program(code)['quadruples']
+        rows = [(quad.operator, quad.left_operand, quad.right_operand, quad.result) for quad in quads]
+        _, object_bytes = measured(lambda: [Quadruple(*row) for row in rows])
+        _, column_bytes = measured(lambda: QuadrupleArrays(Quadruple(*row) for row in rows))
+        count = len(rows)
+        print(f"{name:32} {count:7} {object_bytes:10} {column_bytes:10} "
+              f"{object_bytes / count:5.0f}/{column_bytes / count:<5.0f} {object_bytes / column_bytes:5.1f}x")
+
+if __name__ == "__main__":
+    main()
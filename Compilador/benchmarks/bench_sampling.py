@@ -0,0 +1,62 @@
+# Costo del perfilador por muestreo (profiler.SamplingProfiler) comparado con
+# la misma ejecución sin perfilador y con el perfilador por cuádruplo.
+# Termina con error si el muestreo cuesta más de --max-overhead por ciento.
+#
+# Uso:
+#   python benchmarks/bench_sampling.py
+#   python benchmarks/bench_sampling.py --program 13_fiboRecursivo.txt --interval 1 --repeat 5
+import argparse
+import sys
+import time
+
+from bench_utils import load_test_programs, compile_program, silenced
+
+def run(data, profiler=None):
+    from virtual_machine import VirtualMachine, VERBOSITY_SILENT
+    vm = VirtualMachine(data['quadruples'], data['constants_table'], data['function_directory'],
+                        data['memory_sizes'], verbosity=VERBOSITY_SILENT)
+    vm.profiler = profiler
+    silenced(vm.execute)
+    return vm
+
+def main():
+    from profiler import SamplingProfiler, QuadProfiler, DEFAULT_SAMPLE_INTERVAL
+    parser = argparse.ArgumentParser(description="Sobrecosto del perfilador por muestreo")
+    parser.add_argument("--program", default="13_fiboRecursivo.txt")
+    parser.add_argument("--interval", type=float, default=DEFAULT_SAMPLE_INTERVAL * 1000,
+                        help="milisegundos entre muestras")
+    parser.add_argument("--repeat", type=int, default=9)
+    parser.add_argument("--max-overhead", type=float, default=5.0,
+                        help="sobrecosto máximo aceptado del muestreo, en por ciento")
+    args = parser.parse_args()
+
+    code = dict(load_test_programs())[args.program]
+    data = compile_program(code)
+    sampler = SamplingProfiler(args.interval / 1000)
+
+    # Las tres variantes se alternan en cada repetición para que el ruido de
+    # la máquina afecte a todas por igual; se reporta el mejor tiempo de cada una
+    variants = {'plain': lambda: run(data), 'sampled': lambda: run(data, sampler),
+                'per_quad': lambda: run(data, QuadProfiler())}
+    best = {name: None for name in variants}
+    for _ in range(args.repeat):
+        for name, function in variants.items():
+            start = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - start
+            if best[name] is None or elapsed < best[name]:
+                best[name] = elapsed
+    plain, sampled, per_quad = best['plain'], best['sampled'], best['per_quad']
+    print(f"programa: {args.program}")
+    print(f"sin perfilador:        {plain:.4f} s")
+    print(f"muestreo cada {args.interval:g} ms:  {sampled:.4f} s  ({sampled / plain - 1:+.1%}, "
+          f"{sampler.sample_count} muestras)")
+    print(f"por cuádruplo:         {per_quad:.4f} s  ({per_quad / plain - 1:+.1%})")
+    overhead = sampled / plain - 1
+    if overhead * 100 > args.max_overhead:
+        print(f"El muestreo cuesta {overhead:+.1%}, más que el máximo de {args.max_overhead:g}%")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
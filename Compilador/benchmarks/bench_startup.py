@@ -0,0 +1,70 @@
+# Latencia de arranque: desde `import yacc` en un intérprete nuevo hasta
+# terminar la primera compilación. Compara tener las tablas LALR ya guardadas
+# (yacc.PARSER_TABLES) contra regenerarlas, y el lexer de PLY contra FastLexer.
+# Cada medición corre en un proceso aparte desde otro directorio de trabajo.
+#
+# Uso:
+#   python benchmarks/bench_startup.py
+#   python benchmarks/bench_startup.py --repeat 10 --program 12_calculadora_avanzada.txt
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from bench_utils import COMPILER_DIR, TESTS_DIR
+
+MEASURE = """
+import sys, time, io, json
+from contextlib import redirect_stdout
+start = time.perf_counter()
+sys.path.insert(0, {compiler_dir!r})
+import yacc
+imported = time.perf_counter()
+if {tables!r} is not None:
+    yacc.PARSER_TABLES = {tables!r}
+code = open({program!r}, encoding='utf-8').read()
+with redirect_stdout(io.StringIO()):
+    compiler = yacc.Compiler(fast_lexer={fast_lexer!r})
+    result, errors = compiler.parse(code)
+done = time.perf_counter()
+print(json.dumps({{'import': imported - start, 'compile': done - imported, 'errors': len(errors)}}))
+"""
+
+def measure(program, tables, fast_lexer, directory):
+    script = MEASURE.format(compiler_dir=COMPILER_DIR, tables=tables, program=program,
+                            fast_lexer=fast_lexer)
+    output = subprocess.run([sys.executable, "-c", script], cwd=directory, capture_output=True,
+                            text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo de import + primera compilación")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--program", default="12_calculadora_avanzada.txt")
+    args = parser.parse_args()
+
+    program = os.path.join(TESTS_DIR, args.program)
+    header = f"{'variante':34} {'import':>9} {'1a compilación':>15} {'total':>9}"
+    print(header)
+    print("-" * len(header))
+    with tempfile.TemporaryDirectory() as directory:
+        missing = os.path.join(directory, "no_existen.pickle")
+        variants = [
+            ("tablas guardadas, lexer PLY", None, False),
+            ("tablas guardadas, FastLexer", None, True),
+            ("regenerando tablas, lexer PLY", missing, False),
+        ]
+        for name, tables, fast_lexer in variants:
+            runs = []
+            for _ in range(args.repeat):
+                if tables is not None and os.path.exists(tables):
+                    os.remove(tables)
+                runs.append(measure(program, tables, fast_lexer, directory))
+            best = min(runs, key=lambda run: run['import'] + run['compile'])
+            print(f"{name:34} {best['import'] * 1000:7.1f}ms {best['compile'] * 1000:13.1f}ms "
+                  f"{(best['import'] + best['compile']) * 1000:7.1f}ms")
+
+if __name__ == "__main__":
+    main()
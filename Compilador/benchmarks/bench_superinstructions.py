@@ -0,0 +1,54 @@
+# Efecto de las superinstrucciones (optimizer.fuse_superinstructions): cuántos
+# cuádruplos tiene cada programa y cuántos despacha la VM antes y después de
+# fusionar comparación + gotof, operación + asignación y -1 * x. El programa
+# optimizado pasa por optimizer.optimize, que antes pliega constantes
+# (benchmarks/bench_constant_folding.py mide esa pasada por separado).
+#
+# Uso:
+#   python benchmarks/bench_superinstructions.py
+#   python benchmarks/bench_superinstructions.py --repeat 5 --backend closure
+import argparse
+
+from bench_utils import load_test_programs, compile_program, silenced, best_time
+
+def run(machine_class, data):
+    from virtual_machine import VERBOSITY_SILENT
+    vm = machine_class(data['quadruples'], data['constants_table'], data['function_directory'],
+                       data['memory_sizes'], verbosity=VERBOSITY_SILENT)
+    silenced(vm.execute)
+    return vm
+
+def main():
+    parser = argparse.ArgumentParser(description="Instrucciones despachadas con y sin superinstrucciones")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--backend", default="vm", help="backend para medir el tiempo")
+    args = parser.parse_args()
+
+    from yacc import get_machine_class
+    from virtual_machine import VirtualMachine
+    machine_class = get_machine_class(args.backend)
+
+    header = (f"{'programa':32} {'quads':>6} {'fus.':>6} {'desp.':>8} {'fus.':>8} "
+              f"{'ahorro':>7} {'tiempo':>7}")
+    print(header)
+    print("-" * len(header))
+    totals = [0, 0, 0, 0]
+    for name, code in load_test_programs():
+        plain = compile_program(code)
+        fused = compile_program(code, optimize=True)
+        dispatched = run(VirtualMachine, plain).instructions_executed
+        dispatched_fused = run(VirtualMachine, fused).instructions_executed
+        old_time = best_time(lambda: run(machine_class, plain), args.repeat)
+        new_time = best_time(lambda: run(machine_class, fused), args.repeat)
+        saving = 1 - dispatched_fused / dispatched
+        print(f"{name:32} {len(plain['quadruples']):6} {len(fused['quadruples']):6} "
+              f"{dispatched:8} {dispatched_fused:8} {saving:7.1%} {old_time / new_time:6.2f}x")
+        for position, value in enumerate((len(plain['quadruples']), len(fused['quadruples']),
+                                          dispatched, dispatched_fused)):
+            totals[position] += value
+    print("-" * len(header))
+    print(f"{'TOTAL':32} {totals[0]:6} {totals[1]:6} {totals[2]:8} {totals[3]:8} "
+          f"{1 - totals[3] / totals[2]:7.1%}")
+
+if __name__ == "__main__":
+    main()
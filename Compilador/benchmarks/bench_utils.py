@@ -0,0 +1,87 @@
+# Utilidades compartidas por los benchmarks del compilador.
+# Los scripts se ejecutan desde cualquier carpeta: agregamos Compilador/ al path
+# para poder importar los módulos igual que lo hacen testSeparado.py y testgeneral.py.
+import os
+import sys
+import io
+import time
+import types
+import subprocess
+from contextlib import redirect_stdout
+
+COMPILER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TESTS_DIR = os.path.join(COMPILER_DIR, "testsPorSeparado")
+
+if COMPILER_DIR not in sys.path:
+    sys.path.insert(0, COMPILER_DIR)
+
+def load_test_programs():
+    """Regresa [(nombre, código)] de testsPorSeparado ordenados por número"""
+    names = [name for name in os.listdir(TESTS_DIR) if name.endswith(".txt")]
+    names.sort(key=lambda name: int(name.split('_')[0]))
+    programs = []
+    for name in names:
+        with open(os.path.join(TESTS_DIR, name), 'r', encoding='utf-8') as f:
+            programs.append((name, f.read()))
+    return programs
+
+def compile_program(code, optimize=False):
+    """Compila un programa sin imprimir nada y regresa get_execution_data()"""
+    from yacc import Compiler
+    compiler = Compiler()
+    with redirect_stdout(io.StringIO()):
+        result, errors = compiler.parse(code)
+    if errors:
+        raise RuntimeError(f"El programa tiene errores semánticos: {errors}")
+    if optimize:
+        import optimizer
+        optimizer.optimize(compiler.quad_gen)
+    return compiler.get_execution_data()
+
+def legacy_execution_data(data):
+    """Programa compilado en la forma que entienden las VMs de commits
+    anteriores: operadores genéricos ('+' en lugar de 'ADD_II') y tabla de
+    constantes valor -> dirección"""
+    from quadruple_generator import Quadruple
+    from opcodes import base_operator
+    legacy = dict(data)
+    legacy['quadruples'] = [Quadruple(base_operator(quad.operator), quad.left_operand,
+                                      quad.right_operand, quad.result)
+                            for quad in data['quadruples']]
+    legacy['constants_table'] = {value: address for address, value in data['constants_table'].items()}
+    return legacy
+
+def silenced(function, *args, **kwargs):
+    """Ejecuta una función descartando todo lo que imprima"""
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        return function(*args, **kwargs)
+
+def best_time(function, repeat):
+    """Mejor tiempo (segundos) de varias repeticiones de una función"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def root_commit():
+    """Primer commit del repositorio (versión original del compilador)"""
+    return subprocess.run(
+        ["git", "rev-list", "--max-parents=0", "HEAD"],
+        cwd=COMPILER_DIR, capture_output=True, text=True, check=True
+    ).stdout.split()[0]
+
+def load_module_at(ref, filename):
+    """Carga un módulo de Compilador/ tal como estaba en el commit indicado"""
+    source = subprocess.run(
+        ["git", "show", f"{ref}:Compilador/{filename}"],
+        cwd=COMPILER_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    name = f"{filename[:-3]}_{ref}"
+    module = types.ModuleType(name)
+    module.__file__ = os.path.join(COMPILER_DIR, filename)
+    exec(compile(source, f"{filename}@{ref}", "exec"), module.__dict__)
+    return module
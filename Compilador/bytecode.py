@@ -0,0 +1,316 @@
+import argparse
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Sequence
+
+from opcodes import OPCODE_NAMES, OP_UNKNOWN, get_opcode
+from quadruple_generator import Quadruple
+from semantic_analyzer import Function
+from semantic_cube import Type
+
+# Formato binario versionado para un programa compilado (la salida de
+# QuadrupleGenerator.get_execution_data()). Todo es little-endian y cada
+# sección empieza alineada a 8 bytes:
+#
+#   encabezado    magia, versión, conteos, desplazamiento de cada sección y
+#                 tamaños de los segmentos de memoria
+#   cuádruplos    registros de 16 bytes: código de operación, tipos de los
+#                 operandos (2 bits cada uno) y tres operandos int32
+#   constantes    registros de 16 bytes: dirección, tipo y valor de 8 bytes
+#   cadenas       tabla de desplazamientos uint32 seguida del texto UTF-8
+#   funciones     registros de tamaño fijo con nombre, tipo, inicio y
+#                 convención de llamada
+#   parámetros    direcciones int32 de los parámetros de todas las funciones
+#
+# El cargador mapea el archivo con mmap y lee las secciones con memoryview:
+# la VM obtiene sus tuplas (código, izq, der, resultado) directo de la tabla
+# de cuádruplos sin crear un objeto Quadruple por instrucción.
+
+MAGIC = b'BDKC'
+FORMAT_VERSION = 1
+FILE_EXTENSION = '.bdc'
+
+MEMORY_SEGMENTS = ('global_int', 'global_float', 'local_int', 'local_float', 'temp_int',
+                   'temp_float', 'temp_bool', 'const_int', 'const_float')
+# magia, versión, banderas, 6 conteos, 6 desplazamientos, tamaños de memoria
+HEADER = struct.Struct('<4sHH6I6I%di' % len(MEMORY_SEGMENTS))
+# código, tipos de operandos, relleno, izquierdo, derecho, resultado
+QUAD_RECORD = struct.Struct('<HBxiii')
+CONSTANT_INT = struct.Struct('<iB3xq')
+CONSTANT_FLOAT = struct.Struct('<iB3xd')
+CONSTANT_KIND = struct.Struct('<iB')
+# nombre, tipo de retorno, banderas, inicio, frame_sizes (5), parámetros (inicio, cuántos)
+FUNCTION_RECORD = struct.Struct('<IBBxxi5iII')
+OFFSET = struct.Struct('<I')
+ADDRESS = struct.Struct('<i')
+
+# Tipo de cada operando dentro del byte de tipos
+OPERAND_NONE = 0
+OPERAND_INT = 1
+OPERAND_STRING = 2
+
+CONSTANT_IS_INT = 0
+CONSTANT_IS_FLOAT = 1
+
+FUNCTION_PURE = 1
+FUNCTION_HAS_FRAME = 2
+NO_ADDRESS = -1
+
+class BytecodeError(Exception):
+    """Archivo que no es bytecode válido o de una versión incompatible"""
+    pass
+
+def _align(size):
+    return (size + 7) & ~7
+
+class _StringPool:
+    def __init__(self):
+        self.strings = []
+        self.index = {}
+
+    def add(self, text):
+        if text not in self.index:
+            self.index[text] = len(self.strings)
+            self.strings.append(text)
+        return self.index[text]
+
+    def encode(self):
+        data = [text.encode('utf-8') for text in self.strings]
+        offsets = [0]
+        for chunk in data:
+            offsets.append(offsets[-1] + len(chunk))
+        table = b''.join(OFFSET.pack(offset) for offset in offsets)
+        return table + b''.join(data)
+
+def _encode_operand(operand, strings):
+    """(tipo, valor int32) de un operando de cuádruplo"""
+    if operand is None:
+        return OPERAND_NONE, 0
+    if isinstance(operand, bool) or not isinstance(operand, (int, str)):
+        raise BytecodeError(f"Operando no representable en bytecode: {operand!r}")
+    if isinstance(operand, int):
+        return OPERAND_INT, operand
+    return OPERAND_STRING, strings.add(operand)
+
+def dumps(execution_data):
+    """Serializa los datos de ejecución al formato binario"""
+    strings = _StringPool()
+    quads = bytearray()
+    for quad in execution_data['quadruples']:
+        opcode = get_opcode(quad.operator)
+        if opcode == OP_UNKNOWN:
+            raise BytecodeError(f"Operador sin código de operación: {quad.operator}")
+        kinds = 0
+        values = []
+        for position, operand in enumerate((quad.left_operand, quad.right_operand, quad.result)):
+            kind, value = _encode_operand(operand, strings)
+            kinds |= kind << (2 * position)
+            values.append(value)
+        quads += QUAD_RECORD.pack(opcode, kinds, *values)
+
+    constants = bytearray()
+    for address, value in execution_data['constants_table'].items():
+        if isinstance(value, float):
+            constants += CONSTANT_FLOAT.pack(address, CONSTANT_IS_FLOAT, value)
+        else:
+            constants += CONSTANT_INT.pack(address, CONSTANT_IS_INT, value)
+
+    functions = bytearray()
+    params = bytearray()
+    param_count = 0
+    for name, func_info in execution_data['function_directory'].items():
+        flags = FUNCTION_PURE if func_info.is_pure else 0
+        frame_sizes = (0,) * 5
+        if func_info.frame_sizes is not None:
+            flags |= FUNCTION_HAS_FRAME
+            frame_sizes = tuple(func_info.frame_sizes)
+        start = NO_ADDRESS if func_info.start_address is None else func_info.start_address
+        functions += FUNCTION_RECORD.pack(strings.add(name), func_info.return_type.value, flags,
+                                          start, *frame_sizes, param_count,
+                                          len(func_info.param_addresses))
+        for address in func_info.param_addresses:
+            params += ADDRESS.pack(address)
+        param_count += len(func_info.param_addresses)
+
+    sections = [bytes(quads), bytes(constants), strings.encode(), bytes(functions), bytes(params)]
+    offsets = []
+    position = _align(HEADER.size)
+    for section in sections:
+        offsets.append(position)
+        position = _align(position + len(section))
+    offsets.append(position)
+    memory_sizes = execution_data.get('memory_sizes') or {}
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0,
+                         len(quads) // QUAD_RECORD.size, len(constants) // CONSTANT_INT.size,
+                         len(strings.strings), len(functions) // FUNCTION_RECORD.size,
+                         param_count, 0, *offsets,
+                         *(memory_sizes.get(segment, 0) for segment in MEMORY_SEGMENTS))
+    output = bytearray(position)
+    output[:HEADER.size] = header
+    for offset, section in zip(offsets, sections):
+        output[offset:offset + len(section)] = section
+    return bytes(output)
+
+def dump(execution_data, path):
+    with open(path, 'wb') as f:
+        f.write(dumps(execution_data))
+
+class QuadTable(Sequence):
+    """Vista de solo lectura sobre la tabla de cuádruplos. Indexarla crea un
+    Quadruple bajo demanda (trazas, perfiladores); decode() da las tuplas que
+    usa la VM leyendo todos los registros de una pasada."""
+    def __init__(self, view, strings):
+        self.view = view
+        self.strings = strings
+
+    def __len__(self):
+        return len(self.view) // QUAD_RECORD.size
+
+    def _operand(self, kind, value):
+        if kind == OPERAND_INT:
+            return value
+        if kind == OPERAND_STRING:
+            return self.strings[value]
+        return None
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("índice de cuádruplo fuera de rango")
+        opcode, kinds, left, right, result = QUAD_RECORD.unpack_from(self.view, index * QUAD_RECORD.size)
+        return Quadruple(OPCODE_NAMES[opcode], self._operand(kinds & 3, left),
+                         self._operand((kinds >> 2) & 3, right), self._operand(kinds >> 4, result))
+
+    def decode(self):
+        """[(código, izq, der, resultado)] de todos los cuádruplos"""
+        operand = self._operand
+        return [(opcode, operand(kinds & 3, left), operand((kinds >> 2) & 3, right),
+                 operand(kinds >> 4, result))
+                for opcode, kinds, left, right, result in QUAD_RECORD.iter_unpack(self.view)]
+
+class BytecodeProgram:
+    """Programa cargado desde bytecode. execution_data() regresa el mismo
+    diccionario que QuadrupleGenerator.get_execution_data()."""
+    def __init__(self, buffer, owner=None):
+        self.owner = owner
+        view = memoryview(buffer)
+        if len(view) < HEADER.size:
+            raise BytecodeError("Archivo demasiado corto para ser bytecode")
+        fields = HEADER.unpack_from(view, 0)
+        magic, version = fields[0], fields[1]
+        if magic != MAGIC:
+            raise BytecodeError("El archivo no es bytecode del compilador")
+        if version != FORMAT_VERSION:
+            raise BytecodeError(f"Versión de bytecode {version} no soportada (se esperaba {FORMAT_VERSION})")
+        quad_count, constant_count, string_count, function_count, param_count = fields[3:8]
+        quad_start, constant_start, string_start, function_start, param_start, end = fields[9:15]
+        if end > len(view):
+            raise BytecodeError("Archivo de bytecode truncado")
+        self.memory_sizes = dict(zip(MEMORY_SEGMENTS, fields[15:]))
+        self.strings = self._read_strings(view, string_start, string_count)
+        self.quadruples = QuadTable(view[quad_start:quad_start + quad_count * QUAD_RECORD.size],
+                                    self.strings)
+        self.constants_table = self._read_constants(view, constant_start, constant_count)
+        params = [address for (address,) in
+                  ADDRESS.iter_unpack(view[param_start:param_start + param_count * ADDRESS.size])]
+        self.function_directory = self._read_functions(view, function_start, function_count, params)
+
+    @staticmethod
+    def _read_strings(view, start, count):
+        offsets = [offset for (offset,) in
+                   OFFSET.iter_unpack(view[start:start + (count + 1) * OFFSET.size])]
+        data_start = start + (count + 1) * OFFSET.size
+        return [str(view[data_start + offsets[i]:data_start + offsets[i + 1]], 'utf-8')
+                for i in range(count)]
+
+    @staticmethod
+    def _read_constants(view, start, count):
+        constants = {}
+        for index in range(count):
+            offset = start + index * CONSTANT_INT.size
+            address, kind = CONSTANT_KIND.unpack_from(view, offset)
+            record = CONSTANT_FLOAT if kind == CONSTANT_IS_FLOAT else CONSTANT_INT
+            constants[address] = record.unpack_from(view, offset)[2]
+        return constants
+
+    def _read_functions(self, view, start, count, params):
+        functions = {}
+        records = view[start:start + count * FUNCTION_RECORD.size]
+        for record in FUNCTION_RECORD.iter_unpack(records):
+            name_index, return_type, flags, start_address = record[:4]
+            frame_sizes, (param_start, param_count) = record[4:9], record[9:]
+            func_info = Function(self.strings[name_index], Type(return_type))
+            func_info.start_address = None if start_address == NO_ADDRESS else start_address
+            func_info.frame_sizes = tuple(frame_sizes) if flags & FUNCTION_HAS_FRAME else None
+            func_info.param_addresses = tuple(params[param_start:param_start + param_count])
+            func_info.param_count = param_count
+            func_info.is_pure = bool(flags & FUNCTION_PURE)
+            functions[func_info.name] = func_info
+        return functions
+
+    def execution_data(self):
+        return {
+            'quadruples': self.quadruples,
+            'constants_table': self.constants_table,
+            'function_directory': self.function_directory,
+            'memory_sizes': self.memory_sizes,
+        }
+
+    def close(self):
+        """Libera el mmap; los cuádruplos ya no se pueden leer después"""
+        self.quadruples.view.release()
+        if self.owner is not None:
+            self.owner.close()
+            self.owner = None
+
+def loads(data):
+    return BytecodeProgram(data)
+
+def load(path):
+    """Carga un archivo de bytecode mapeándolo en memoria"""
+    with open(path, 'rb') as f:
+        # mmap no puede mapear un archivo vacío: se revisa antes de mapear
+        if os.fstat(f.fileno()).st_size < HEADER.size:
+            raise BytecodeError("Archivo demasiado corto para ser bytecode")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return BytecodeProgram(mapped, owner=mapped)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compila un programa a bytecode o ejecuta un archivo de bytecode")
+    parser.add_argument("archivo", help="código fuente (o bytecode con --run)")
+    parser.add_argument("-o", "--output", help=f"archivo de salida (por defecto <fuente>{FILE_EXTENSION})")
+    parser.add_argument("--optimize", action="store_true", help="aplica optimizer.optimize antes de guardar")
+    parser.add_argument("--run", action="store_true", help="ejecuta un archivo de bytecode")
+    parser.add_argument("--backend", default="vm", help="backend para --run: vm, closure o python")
+    args = parser.parse_args(argv)
+
+    if args.run:
+        from yacc import run_execution_data
+        from virtual_machine import VERBOSITY_OUTPUTS
+        program = load(args.archivo)
+        run_execution_data(program.execution_data(), verbosity=VERBOSITY_OUTPUTS, backend=args.backend)
+        return 0
+
+    from yacc import compile_program
+    import io
+    from contextlib import redirect_stdout
+    with open(args.archivo, 'r', encoding='utf-8') as f:
+        code = f.read()
+    with redirect_stdout(io.StringIO()):
+        execution_data, errors = compile_program(code, args.optimize, cache=False)
+    if errors:
+        for error in errors:
+            print(error, file=sys.stderr)
+        return 1
+    output = args.output or args.archivo.rsplit('.', 1)[0] + FILE_EXTENSION
+    dump(execution_data, output)
+    print(f"{output}: {len(execution_data['quadruples'])} cuádruplos")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
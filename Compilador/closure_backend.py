@@ -0,0 +1,316 @@
+from virtual_machine import VirtualMachine, typed_operation, MEMO_MISS
+from opcodes import (OP_PLUS, OP_MINUS, OP_MULTIPLY, OP_DIVIDE, OP_GREATER, OP_LESS,
+                     OP_NOT_EQUAL, OP_ASSIGN, OP_GOTO, OP_GOTOF, OP_PRINT, OP_ERA,
+                     OP_PARAM, OP_GOSUB, OP_ENDFUNC, OP_RETURN, OP_END, OP_GOTOF_GREATER,
+                     OP_GOTOF_LESS, OP_GOTOF_NOT_EQUAL, OP_NEGATE, OP_TAILCALL, BASE_OPCODES)
+
+class ClosureVirtualMachine(VirtualMachine):
+    """Máquina virtual con código enhebrado por closures.
+
+    Al cargar el programa cada cuádruplo se convierte en una función sin
+    argumentos que ya tiene resueltos el segmento y desplazamiento de sus
+    operandos y su salto; al ejecutarse regresa el índice del siguiente
+    cuádruplo. El ciclo principal solo llama closures hasta recibir -1.
+    La traza completa (VERBOSITY_TRACE) usa el intérprete de la clase base."""
+    tracks_instruction_pointer = False
+
+    def __init__(self, quadruples, constants_table, function_directory, memory_sizes=None, **options):
+        super().__init__(quadruples, constants_table, function_directory, memory_sizes, **options)
+        self.closures = self._thread_code()
+
+    def _run(self):
+        """Ciclo principal: cada closure regresa el índice del siguiente"""
+        closures = self.closures
+        self.end_pointer = len(self.code)
+        ip = self.instruction_pointer
+        while ip >= 0:
+            ip = closures[ip]()
+        self.instruction_pointer = self.end_pointer
+
+    def _thread_code(self):
+        """Convierte cada cuádruplo decodificado en su closure"""
+        closures = [self._make_closure(index, *quad) for index, quad in enumerate(self.code)]
+        # Caer al final del programa también termina la ejecución
+        closures.append(self._make_end(len(self.code)))
+        return closures
+
+    def _make_closure(self, index, opcode, left, right, result):
+        next_ip = index + 1
+        if opcode in BINARY_OPERATIONS:
+            return self._make_binary(opcode, left, right, result, next_ip)
+        if opcode in BASE_OPCODES:
+            return self._make_typed(opcode, left, right, result, next_ip)
+        if opcode == OP_ASSIGN:
+            return self._make_assignment(left, result, next_ip)
+        if opcode == OP_GOTO:
+            return lambda: result
+        if opcode == OP_GOTOF:
+            return self._make_gotof(left, result, next_ip)
+        if opcode in COMPARE_AND_BRANCH:
+            return self._make_compare_and_branch(opcode, left, right, result, next_ip)
+        if opcode == OP_NEGATE:
+            return self._make_negate(left, result, next_ip)
+        if opcode == OP_PRINT:
+            return self._make_print(left, next_ip)
+        if opcode == OP_ERA:
+            return self._make_era(left, next_ip)
+        if opcode == OP_PARAM:
+            return self._make_param(left, next_ip)
+        if opcode == OP_GOSUB:
+            return self._make_gosub(left, result, next_ip)
+        if opcode == OP_TAILCALL:
+            return self._make_tailcall(left, result, next_ip)
+        if opcode == OP_ENDFUNC:
+            return self._make_endfunc(next_ip)
+        if opcode == OP_RETURN:
+            return self._make_return(left, next_ip)
+        if opcode == OP_END:
+            return self._make_end(index)
+        return lambda: next_ip
+
+    def _make_binary(self, opcode, left, right, result, next_ip):
+        segments = self.memory.segments
+        ls, lo = self.memory.resolve(left)
+        rs, ro = self.memory.resolve(right)
+        ts, to = self.memory.resolve(result)
+        coerce = self.memory.coercers[ts]
+        if opcode == OP_PLUS:
+            def closure():
+                segments[ts][to] = coerce(segments[ls][lo] + segments[rs][ro])
+                return next_ip
+        elif opcode == OP_MINUS:
+            def closure():
+                segments[ts][to] = coerce(segments[ls][lo] - segments[rs][ro])
+                return next_ip
+        elif opcode == OP_MULTIPLY:
+            def closure():
+                segments[ts][to] = coerce(segments[ls][lo] * segments[rs][ro])
+                return next_ip
+        elif opcode == OP_DIVIDE:
+            def closure():
+                divisor = segments[rs][ro]
+                segments[ts][to] = coerce(segments[ls][lo] / divisor if divisor != 0 else 0)
+                return next_ip
+        elif opcode == OP_GREATER:
+            def closure():
+                segments[ts][to] = segments[ls][lo] > segments[rs][ro]
+                return next_ip
+        elif opcode == OP_LESS:
+            def closure():
+                segments[ts][to] = segments[ls][lo] < segments[rs][ro]
+                return next_ip
+        else:
+            def closure():
+                segments[ts][to] = segments[ls][lo] != segments[rs][ro]
+                return next_ip
+        return closure
+
+    def _make_typed(self, opcode, left, right, result, next_ip):
+        """Operación tipada: el resultado ya tiene el tipo del segmento"""
+        segments = self.memory.segments
+        ls, lo = self.memory.resolve(left)
+        rs, ro = self.memory.resolve(right)
+        ts, to = self.memory.resolve(result)
+        base = BASE_OPCODES[opcode]
+        if base == OP_PLUS:
+            def closure():
+                segments[ts][to] = segments[ls][lo] + segments[rs][ro]
+                return next_ip
+        elif base == OP_MINUS:
+            def closure():
+                segments[ts][to] = segments[ls][lo] - segments[rs][ro]
+                return next_ip
+        elif base == OP_MULTIPLY:
+            def closure():
+                segments[ts][to] = segments[ls][lo] * segments[rs][ro]
+                return next_ip
+        elif base == OP_DIVIDE:
+            divide = typed_operation(opcode)
+            def closure():
+                segments[ts][to] = divide(segments[ls][lo], segments[rs][ro])
+                return next_ip
+        else:
+            # Las comparaciones no convierten: comparten closure con las genéricas
+            return self._make_binary(base, left, right, result, next_ip)
+        return closure
+
+    def _make_assignment(self, left, result, next_ip):
+        segments = self.memory.segments
+        ls, lo = self.memory.resolve(left)
+        ts, to = self.memory.resolve(result)
+        coerce = self.memory.coercers[ts]
+        def closure():
+            segments[ts][to] = coerce(segments[ls][lo])
+            return next_ip
+        return closure
+
+    def _make_gotof(self, left, target, next_ip):
+        segments = self.memory.segments
+        ls, lo = self.memory.resolve(left)
+        def closure():
+            return next_ip if segments[ls][lo] else target
+        return closure
+
+    def _make_compare_and_branch(self, opcode, left, right, target, next_ip):
+        segments = self.memory.segments
+        ls, lo = self.memory.resolve(left)
+        rs, ro = self.memory.resolve(right)
+        if opcode == OP_GOTOF_GREATER:
+            def closure():
+                return next_ip if segments[ls][lo] > segments[rs][ro] else target
+        elif opcode == OP_GOTOF_LESS:
+            def closure():
+                return next_ip if segments[ls][lo] < segments[rs][ro] else target
+        else:
+            def closure():
+                return next_ip if segments[ls][lo] != segments[rs][ro] else target
+        return closure
+
+    def _make_negate(self, left, result, next_ip):
+        segments = self.memory.segments
+        ls, lo = self.memory.resolve(left)
+        ts, to = self.memory.resolve(result)
+        coerce = self.memory.coercers[ts]
+        def closure():
+            segments[ts][to] = coerce(-segments[ls][lo])
+            return next_ip
+        return closure
+
+    def _make_print(self, left, next_ip):
+        echo = self.echo_outputs
+        if isinstance(left, str):
+            def closure():
+                self.program_outputs.append(left)
+                if echo:
+                    print(f"OUTPUT: {left}")
+                return next_ip
+            return closure
+        segments = self.memory.segments
+        ls, lo = self.memory.resolve(left)
+        def closure():
+            value = segments[ls][lo]
+            self.program_outputs.append(str(value))
+            if echo:
+                print(f"OUTPUT: {value}")
+            return next_ip
+        return closure
+
+    def _make_era(self, func_name, next_ip):
+        layout = self.frame_layouts[func_name]
+        def closure():
+            self.pending_frames.append([layout, layout.new_frame(), 0])
+            return next_ip
+        return closure
+
+    def _make_param(self, left, next_ip):
+        segments = self.memory.segments
+        ls, lo = self.memory.resolve(left)
+        def closure():
+            pending = self.pending_frames[-1]
+            param_slots = pending[0].param_slots
+            position = pending[2]
+            pending[2] = position + 1
+            if position < len(param_slots):
+                slot, offset, coerce = param_slots[position]
+                pending[1][slot][offset] = coerce(segments[ls][lo])
+            return next_ip
+        return closure
+
+    def _make_gosub(self, func_name, return_address, next_ip):
+        if func_name not in self.function_directory:
+            def closure():
+                self.pending_frames.pop()
+                return next_ip
+            return closure
+        func_start = self.function_directory[func_name].start_address
+        memory = self.memory
+        layout = self.frame_layouts[func_name]
+        if self.memo is not None and layout.memoizable and return_address:
+            memo = self.memo
+            def closure():
+                frame = self.pending_frames.pop()[1]
+                key = layout.memo_key(frame)
+                value = memo.lookup(key)
+                if value is not MEMO_MISS:
+                    memory.set_value(return_address, value)
+                    return next_ip
+                self.call_stack.append({
+                    'return_address': next_ip,
+                    'return_value_address': return_address,
+                    'function_name': func_name,
+                    'memo_key': key
+                })
+                memory.push_frame(frame)
+                return func_start
+            return closure
+        def closure():
+            frame = self.pending_frames.pop()[1]
+            self.call_stack.append({
+                'return_address': next_ip,
+                'return_value_address': return_address,
+                'function_name': func_name
+            })
+            memory.push_frame(frame)
+            return func_start
+        return closure
+
+    def _make_tailcall(self, func_name, return_address, next_ip):
+        if func_name not in self.function_directory:
+            return self._make_gosub(func_name, return_address, next_ip)
+        func_start = self.function_directory[func_name].start_address
+        memory = self.memory
+        gosub = self._make_gosub(func_name, return_address, next_ip)
+        def closure():
+            if not self.call_stack:
+                return gosub()
+            frame = self.pending_frames.pop()[1]
+            context = self.call_stack.pop()
+            tail_context = {
+                'return_address': context['return_address'],
+                'return_value_address': context['return_value_address'],
+                'function_name': func_name
+            }
+            if 'memo_key' in context:
+                tail_context['memo_key'] = context['memo_key']
+            self.call_stack.append(tail_context)
+            memory.replace_frame(frame)
+            return func_start
+        return closure
+
+    def _make_endfunc(self, next_ip):
+        memory = self.memory
+        def closure():
+            if not self.call_stack:
+                return next_ip
+            context = self.call_stack.pop()
+            memory.pop_frame()
+            return context['return_address']
+        return closure
+
+    def _make_return(self, left, next_ip):
+        memory = self.memory
+        if left is None:
+            return self._make_endfunc(next_ip)
+        segments = memory.segments
+        ls, lo = memory.resolve(left)
+        def closure():
+            value = segments[ls][lo]
+            if not self.call_stack:
+                return next_ip
+            context = self.call_stack.pop()
+            memory.pop_frame()
+            if context['return_value_address']:
+                memory.set_value(context['return_value_address'], value)
+                if 'memo_key' in context:
+                    self.memo.store(context['memo_key'], value)
+            return context['return_address']
+        return closure
+
+    def _make_end(self, index):
+        def closure():
+            self.end_pointer = index
+            return -1
+        return closure
+
+BINARY_OPERATIONS = (OP_PLUS, OP_MINUS, OP_MULTIPLY, OP_DIVIDE, OP_GREATER, OP_LESS, OP_NOT_EQUAL)
+COMPARE_AND_BRANCH = (OP_GOTOF_GREATER, OP_GOTOF_LESS, OP_GOTOF_NOT_EQUAL)
@@ -0,0 +1,178 @@
+import hashlib
+import os
+import pickle
+import tempfile
+
+# Caché en disco de programas compilados, direccionada por contenido. La llave
+# es el hash del código fuente junto con la versión del compilador, así que un
+# cambio en cualquier módulo del front end invalida todas las entradas.
+# Cada entrada guarda lo que regresa QuadrupleGenerator.get_execution_data()
+# y el listado de cuádruplos que imprimió el compilador, para que un acierto
+# imprima lo mismo que una compilación completa.
+
+COMPILER_DIR = os.path.dirname(os.path.abspath(__file__))
+# Módulos cuyo código determina los cuádruplos generados
+FRONT_END_MODULES = ('lex.py', 'yacc.py', 'ast_nodes.py', 'semantic_cube.py',
+                     'semantic_analyzer.py', 'MemoryManager.py', 'quadruple_generator.py',
+                     'opcodes.py', 'optimizer.py')
+DEFAULT_CACHE_DIR = os.environ.get(
+    'COMPILADOR_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'compilador'))
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+ENTRY_SUFFIX = '.pickle'
+
+_compiler_version = None
+
+def compiler_version():
+    """Hash del código de los módulos del front end"""
+    global _compiler_version
+    if _compiler_version is None:
+        digest = hashlib.sha256()
+        for filename in FRONT_END_MODULES:
+            with open(os.path.join(COMPILER_DIR, filename), 'rb') as f:
+                digest.update(filename.encode('utf-8'))
+                digest.update(f.read())
+        _compiler_version = digest.hexdigest()
+    return _compiler_version
+
+class CompileCache:
+    """Directorio de programas compilados con tamaño acotado: al pasar de
+    max_bytes se borran las entradas usadas hace más tiempo (mtime, que se
+    actualiza en cada acierto). Los errores del sistema de archivos nunca
+    llegan a quien compila: un directorio que no se puede crear o escribir
+    solo hace que se compile sin caché, y uno de solo lectura se sigue leyendo."""
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def key(self, code, optimize=False):
+        digest = hashlib.sha256()
+        digest.update(compiler_version().encode('ascii'))
+        digest.update(b'O' if optimize else b'-')
+        digest.update(code.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def load(self, code, optimize=False):
+        """Datos de ejecución guardados para este código o None"""
+        entry = self.load_entry(code, optimize)
+        return entry[0] if entry is not None else None
+
+    def load_entry(self, code, optimize=False):
+        """(datos de ejecución, líneas del listado) guardados para este código o None"""
+        path = self._path(self.key(code, optimize))
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+            execution_data, listing = entry['execution_data'], entry['listing']
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except OSError:
+            # Directorio o entrada que no se puede leer: se compila sin caché
+            self.errors += 1
+            self.misses += 1
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, KeyError, TypeError):
+            # Entrada corrupta o de una versión incompatible: se descarta
+            self._remove(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            # Caché de solo lectura: la entrada sirve aunque no se marque como usada
+            pass
+        self.hits += 1
+        return execution_data, listing
+
+    def store(self, code, execution_data, optimize=False, listing=()):
+        """Guarda los datos de ejecución (y el listado de cuádruplos que se
+        imprimió al compilarlos) y regresa si se pudo. La escritura es
+        atómica (archivo temporal + rename) para que varios procesos o hilos
+        compartan el directorio sin leer entradas a medias."""
+        path = self._path(self.key(code, optimize))
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        except OSError:
+            self.errors += 1
+            return False
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                pickle.dump({'execution_data': execution_data, 'listing': list(listing)}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, path)
+        except OSError:
+            self._remove(temporary)
+            self.errors += 1
+            return False
+        except BaseException:
+            self._remove(temporary)
+            raise
+        self.evict()
+        return True
+
+    def entries(self):
+        """[(mtime, tamaño, ruta)] de las entradas del directorio"""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                status = os.stat(path)
+            except OSError:
+                continue
+            entries.append((status.st_mtime, status.st_size, path))
+        return entries
+
+    def evict(self):
+        """Borra las entradas más viejas hasta quedar dentro de max_bytes"""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                self.evictions += 1
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            self._remove(path)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError:
+            self.errors += 1
+            return False
+
+    def stats(self):
+        entries = self.entries()
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'errors': self.errors,
+                'entries': len(entries), 'bytes': sum(size for _, size, _ in entries),
+                'max_bytes': self.max_bytes}
+
+_default_cache = None
+
+def default_cache():
+    """Caché compartida por parse_program y execute_program"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = CompileCache()
+    return _default_cache
@@ -1,3 +1,6 @@
+import re
+import sys
+import threading
 import ply.lex as lex
 
 # Definimos los tokens que tenemos reservados en nuestro lenguaje
@@ -105,13 +108,142 @@ def t_error(t):
     print(f"Illegal character '{t.value[0]}' at line {t.lexer.lineno}")
     t.lexer.skip(1)
 
-# Construimos el lexer
-lexer = lex.lex()
+# El lexer de PLY se construye la primera vez que se usa (get_lexer() o
+# lex.lexer), no al importar el módulo
+_lexer_lock = threading.Lock()
+
+def get_lexer():
+    """Lexer de PLY compartido; las compilaciones usan clones de él"""
+    global lexer
+    with _lexer_lock:
+        if 'lexer' not in globals():
+            lexer = lex.lex(module=sys.modules[__name__])
+    return lexer
+
+def __getattr__(name):
+    if name == 'lexer':
+        return get_lexer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Función para resetear el lexer se usa en pruebas
 def reset_lexer():
     global lexer
-    lexer = lex.lex()
+    lexer = lex.lex(module=sys.modules[__name__])
+
+# Tokenizador rápido: produce la misma secuencia de tokens que el lexer de PLY
+# (tipo, valor, línea y posición) con una sola expresión regular de grupos
+# con nombre. Las reglas con función se copian de los docstrings de arriba en
+# el mismo orden que las prueba PLY; los operadores y delimitadores van en un
+# solo grupo y su tipo sale de una tabla.
+OPERATOR_TYPES = {pattern.replace('\\', ''): name[2:]
+                  for name, pattern in list(globals().items())
+                  if name.startswith('t_TOKEN_') and isinstance(pattern, str)}
+_FAST_RULES = [
+    ('FLOAT', t_TOKEN_CTE_FLOAT.__doc__),
+    ('INT', t_TOKEN_CTE_INT.__doc__),
+    ('ID', t_TOKEN_ID.__doc__),
+    ('STRING', t_TOKEN_CTE_STRING.__doc__),
+    ('UNCLOSED', t_UNCLOSED_STRING.__doc__),
+    ('COMMENT', t_COMMENT.__doc__),
+    ('NEWLINE', t_newline.__doc__),
+    ('OPERATOR', '|'.join(re.escape(operator)
+                          for operator in sorted(OPERATOR_TYPES, key=len, reverse=True))),
+    ('TRAILING', r'\Z'),
+    ('ILLEGAL', '.'),
+]
+# Los caracteres de t_ignore se consumen antes de cada token dentro de la misma
+# coincidencia. PLY compila sus reglas con re.VERBOSE; se usa igual para que $
+# y los escapes signifiquen lo mismo.
+FAST_PATTERN = re.compile('[%s]*(?:%s)' % (re.escape(t_ignore), '|'.join(
+    f'(?P<{name}>{pattern})' for name, pattern in _FAST_RULES)), re.VERBOSE)
+
+class FastToken:
+    """Token con la misma interfaz que ply.lex.LexToken"""
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer')
+    
+    def __init__(self, type, value, lineno, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+    
+    def __str__(self):
+        return 'LexToken(%s,%r,%d,%d)' % (self.type, self.value, self.lineno, self.lexpos)
+    
+    __repr__ = __str__
+
+class FastLexer:
+    """Lexer con la interfaz que usa el parser de PLY (input, token, lineno,
+    clone) sobre FAST_PATTERN. tokenize() tokeniza un texto completo a lista."""
+    def __init__(self):
+        self.lineno = 1
+        self.lexdata = ''
+        self.lexpos = 0
+        self._tokens = iter(())
+    
+    def clone(self):
+        copy = FastLexer()
+        copy.lineno = self.lineno
+        return copy
+    
+    def input(self, data):
+        self.lexdata = data
+        self.lexpos = 0
+        self._tokens = self._scan(data)
+    
+    def token(self):
+        return next(self._tokens, None)
+    
+    def __iter__(self):
+        return self._tokens
+    
+    def tokenize(self, data):
+        """Todos los tokens de data en una lista"""
+        self.input(data)
+        return list(self._tokens)
+    
+    def _scan(self, data):
+        operator_types = OPERATOR_TYPES
+        reserved_types = reserved
+        position = 0
+        while True:
+            restart = None
+            for match in FAST_PATTERN.finditer(data, position):
+                kind = match.lastgroup
+                if kind == 'OPERATOR':
+                    value = match.group(kind)
+                    yield FastToken(operator_types[value], value, self.lineno, match.start(kind))
+                elif kind == 'ID':
+                    value = match.group(kind)
+                    yield FastToken(reserved_types.get(value, 'TOKEN_ID'), value, self.lineno, match.start(kind))
+                elif kind == 'NEWLINE':
+                    self.lineno += match.end() - match.start(kind)
+                elif kind == 'INT':
+                    yield FastToken('TOKEN_CTE_INT', int(match.group(kind)), self.lineno, match.start(kind))
+                elif kind == 'FLOAT':
+                    yield FastToken('TOKEN_CTE_FLOAT', float(match.group(kind)), self.lineno, match.start(kind))
+                elif kind == 'STRING':
+                    yield FastToken('TOKEN_CTE_STRING', match.group(kind)[1:-1], self.lineno, match.start(kind))
+                elif kind == 'COMMENT' or kind == 'TRAILING':
+                    # Comentario o espacios al final del texto
+                    continue
+                elif kind == 'UNCLOSED':
+                    # Como t_UNCLOSED_STRING: PLY ya consumió la coincidencia y skip(1) avanza uno más
+                    print(f"Illegal character: Unclosed string at line {self.lineno}")
+                    restart = match.end() + 1
+                    break
+                else:
+                    print(f"Illegal character '{match.group(kind)}' at line {self.lineno}")
+            if restart is None:
+                break
+            position = restart
+        self.lexpos = len(data)
+
+fast_lexer = FastLexer()
+
+def tokenize(data):
+    """Tokeniza un texto completo con el tokenizador rápido"""
+    return FastLexer().tokenize(data)
 
 # Probamos el lexer
 if __name__ == "__main__":
@@ -138,6 +270,7 @@ if __name__ == "__main__":
     end
     '''
     
+    lexer = get_lexer()
     lexer.input(data)
     
     # Tokenizamos
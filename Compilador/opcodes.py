@@ -0,0 +1,121 @@
+# Códigos de operación enteros para los cuádruplos.
+# La máquina virtual traduce el operador de cada cuádruplo a uno de estos
+# códigos al cargar el programa y los usa como índice en su tabla de handlers.
+
+OP_PLUS = 0
+OP_MINUS = 1
+OP_MULTIPLY = 2
+OP_DIVIDE = 3
+OP_GREATER = 4
+OP_LESS = 5
+OP_NOT_EQUAL = 6
+OP_ASSIGN = 7
+OP_GOTO = 8
+OP_GOTOF = 9
+OP_PRINT = 10
+OP_ERA = 11
+OP_PARAM = 12
+OP_GOSUB = 13
+OP_ENDFUNC = 14
+OP_RETURN = 15
+OP_END = 16
+# Superinstrucciones creadas por optimizer.fuse_superinstructions
+OP_GOTOF_GREATER = 17
+OP_GOTOF_LESS = 18
+OP_GOTOF_NOT_EQUAL = 19
+OP_NEGATE = 20
+# Operaciones tipadas según el cubo semántico: sufijo con el tipo de cada
+# operando (I = int, F = float). Guardan el resultado sin conversión.
+OP_ADD_II = 21
+OP_ADD_IF = 22
+OP_ADD_FI = 23
+OP_ADD_FF = 24
+OP_SUB_II = 25
+OP_SUB_IF = 26
+OP_SUB_FI = 27
+OP_SUB_FF = 28
+OP_MUL_II = 29
+OP_MUL_IF = 30
+OP_MUL_FI = 31
+OP_MUL_FF = 32
+OP_DIV_II = 33
+OP_DIV_IF = 34
+OP_DIV_FI = 35
+OP_DIV_FF = 36
+OP_GT_II = 37
+OP_GT_IF = 38
+OP_GT_FI = 39
+OP_GT_FF = 40
+OP_LT_II = 41
+OP_LT_IF = 42
+OP_LT_FI = 43
+OP_LT_FF = 44
+OP_NE_II = 45
+OP_NE_IF = 46
+OP_NE_FI = 47
+OP_NE_FF = 48
+# Llamada en posición de cola: reutiliza el registro de activación actual
+OP_TAILCALL = 49
+OP_UNKNOWN = 50
+
+# Operador del cuádruplo -> código de operación
+OPCODES = {
+    '+': OP_PLUS,
+    '-': OP_MINUS,
+    '*': OP_MULTIPLY,
+    '/': OP_DIVIDE,
+    '>': OP_GREATER,
+    '<': OP_LESS,
+    '!=': OP_NOT_EQUAL,
+    '=': OP_ASSIGN,
+    'goto': OP_GOTO,
+    'gotof': OP_GOTOF,
+    'print': OP_PRINT,
+    'ERA': OP_ERA,
+    'parámetro': OP_PARAM,
+    'GOSUB': OP_GOSUB,
+    'ENDFUNC': OP_ENDFUNC,
+    'RETURN': OP_RETURN,
+    'END': OP_END,
+    'gotof>': OP_GOTOF_GREATER,
+    'gotof<': OP_GOTOF_LESS,
+    'gotof!=': OP_GOTOF_NOT_EQUAL,
+    'neg': OP_NEGATE,
+    'TAILCALL': OP_TAILCALL,
+}
+
+# Operador genérico -> prefijo de sus versiones tipadas
+TYPED_PREFIXES = {'+': 'ADD', '-': 'SUB', '*': 'MUL', '/': 'DIV', '>': 'GT', '<': 'LT', '!=': 'NE'}
+# Operador tipado ('ADD_IF') -> operador genérico ('+')
+BASE_OPERATORS = {}
+for _symbol, _prefix in TYPED_PREFIXES.items():
+    for _suffix in ('II', 'IF', 'FI', 'FF'):
+        BASE_OPERATORS[f"{_prefix}_{_suffix}"] = _symbol
+        OPCODES[f"{_prefix}_{_suffix}"] = globals()[f"OP_{_prefix}_{_suffix}"]
+
+OPCODE_COUNT = OP_UNKNOWN + 1
+
+# Código de operación -> operador del cuádruplo
+OPCODE_NAMES = {code: name for name, code in OPCODES.items()}
+OPCODE_NAMES[OP_UNKNOWN] = '?'
+
+# Código tipado -> código genérico (OP_ADD_IF -> OP_PLUS)
+BASE_OPCODES = {OPCODES[typed]: OPCODES[symbol] for typed, symbol in BASE_OPERATORS.items()}
+# Códigos tipados cuyos dos operandos son enteros
+INTEGER_OPCODES = frozenset(OPCODES[typed] for typed in BASE_OPERATORS if typed.endswith('_II'))
+
+def get_opcode(operator):
+    """Traduce un operador de cuádruplo a su código entero"""
+    return OPCODES.get(operator, OP_UNKNOWN)
+
+def typed_operator(operator, left_kind, right_kind):
+    """Versión tipada de un operador aritmético o de comparación para
+    operandos 'I' o 'F'; None si no tiene versión tipada"""
+    prefix = TYPED_PREFIXES.get(operator)
+    if prefix is None or left_kind not in ('I', 'F') or right_kind not in ('I', 'F'):
+        return None
+    return f"{prefix}_{left_kind}{right_kind}"
+
+def base_operator(operator):
+    """Operador genérico de un operador tipado ('ADD_II' -> '+')"""
+    return BASE_OPERATORS.get(operator, operator)
@@ -0,0 +1,299 @@
+import math
+import operator as py_operator
+from collections import Counter
+
+from quadruple_generator import Quadruple, QuadrupleArrays
+from opcodes import base_operator
+from semantic_cube import Type, Operation, get_result_type
+
+# Pasadas de optimización sobre los cuádruplos ya generados. Trabajan sobre el
+# QuadrupleGenerator: reescriben quad_gen.Quads y actualizan start_address de
+# las funciones del directorio cuando cambian los índices.
+
+ARITHMETIC_OPERATORS = ('+', '-', '*', '/')
+COMPARE_AND_BRANCH = {'>': 'gotof>', '<': 'gotof<', '!=': 'gotof!='}
+JUMP_OPERATORS = ('goto', 'gotof') + tuple(COMPARE_AND_BRANCH.values())
+# Después de estos cuádruplos empieza otro bloque básico
+BLOCK_END_OPERATORS = JUMP_OPERATORS + ('RETURN', 'ENDFUNC', 'END', 'TAILCALL')
+
+def read_operands(quad):
+    """Direcciones que lee un cuádruplo"""
+    op = base_operator(quad.operator)
+    if op in ARITHMETIC_OPERATORS or op in COMPARE_AND_BRANCH or op in COMPARE_AND_BRANCH.values():
+        return (quad.left_operand, quad.right_operand)
+    if op in ('=', 'gotof', 'parámetro', 'RETURN', 'neg'):
+        return (quad.left_operand,)
+    if op == 'print' and isinstance(quad.left_operand, int):
+        return (quad.left_operand,)
+    return ()
+
+def jump_targets(quads):
+    """Índices a los que salta algún cuádruplo"""
+    return {quad.result for quad in quads if quad.operator in JUMP_OPERATORS}
+
+def function_regions(quads, function_directory):
+    """Número de función (por orden de inicio) al que pertenece cada cuádruplo.
+    Los temporales se reinician en cada función, así que sus direcciones solo
+    son únicas dentro de una región."""
+    starts = sorted(info.start_address for info in function_directory.values()
+                    if info.start_address is not None)
+    regions = []
+    region = 0
+    for index in range(len(quads)):
+        while region < len(starts) and starts[region] <= index:
+            region += 1
+        regions.append(region)
+    return regions
+
+def count_reads(quads, regions):
+    """Lecturas de cada dirección dentro de cada región"""
+    reads = Counter()
+    for index, quad in enumerate(quads):
+        for address in read_operands(quad):
+            reads[(regions[index], address)] += 1
+    return reads
+
+def address_kind(memory_manager, address):
+    """'int', 'float' o 'bool' según el segmento de la dirección"""
+    mm = memory_manager
+    if not isinstance(address, int):
+        return None
+    if mm.GLOBAL_INT_START <= address < mm.GLOBAL_FLOAT_START:
+        return 'int'
+    if mm.GLOBAL_FLOAT_START <= address < mm.LOCAL_INT_START:
+        return 'float'
+    if mm.LOCAL_INT_START <= address < mm.LOCAL_FLOAT_START:
+        return 'int'
+    if mm.LOCAL_FLOAT_START <= address < mm.TEMP_INT_START:
+        return 'float'
+    if mm.TEMP_INT_START <= address < mm.TEMP_FLOAT_START:
+        return 'int'
+    if mm.TEMP_FLOAT_START <= address < mm.TEMP_BOOL_START:
+        return 'float'
+    if mm.TEMP_BOOL_START <= address < mm.CONST_INT_START:
+        return 'bool'
+    if mm.CONST_INT_START <= address < mm.CONST_FLOAT_START:
+        return 'int'
+    if address >= mm.CONST_FLOAT_START:
+        return 'float'
+    return None
+
+def is_temp(memory_manager, address):
+    mm = memory_manager
+    return isinstance(address, int) and mm.TEMP_INT_START <= address < mm.CONST_INT_START
+
+def is_global(memory_manager, address):
+    mm = memory_manager
+    return isinstance(address, int) and mm.GLOBAL_INT_START <= address < mm.LOCAL_INT_START
+
+def block_leaders(quads, function_directory):
+    """Índices donde empieza un bloque básico: el primero, los destinos de
+    salto, el inicio de cada función y lo que sigue a un salto o a un fin de
+    función"""
+    leaders = {0} | jump_targets(quads)
+    leaders.update(info.start_address for info in function_directory.values()
+                   if info.start_address is not None)
+    for index, quad in enumerate(quads):
+        if quad.operator in BLOCK_END_OPERATORS:
+            leaders.add(index + 1)
+    return leaders
+
+def compact(quad_gen, new_quads, index_map):
+    """Reemplaza los cuádruplos y corrige saltos y direcciones de inicio.
+    index_map[i] es el nuevo índice del cuádruplo original i (o del siguiente
+    que sobrevivió si i se eliminó); index_map[len] es el final del programa.
+    new_quads es una lista de Quadruple; se guarda de vuelta por columnas."""
+    for quad in new_quads:
+        if quad.operator in JUMP_OPERATORS and quad.result is not None:
+            quad.result = index_map[quad.result]
+    for func_info in quad_gen.semantic.function_directory.values():
+        if func_info.start_address is not None:
+            func_info.start_address = index_map[func_info.start_address]
+    quad_gen.Quads = QuadrupleArrays(new_quads)
+    quad_gen.quad_counter = len(new_quads)
+
+# Tipo de cada clase de dirección y operación del cubo de cada operador
+KIND_TYPES = {'int': Type.INT, 'float': Type.FLOAT, 'bool': Type.BOOL}
+CUBE_OPERATIONS = {'+': Operation.PLUS, '-': Operation.MINUS, '*': Operation.MULTIPLY,
+                   '/': Operation.DIVIDE, '>': Operation.GREATER, '<': Operation.LESS,
+                   '!=': Operation.NOT_EQUAL}
+PYTHON_OPERATORS = {'+': py_operator.add, '-': py_operator.sub, '*': py_operator.mul,
+                    '>': py_operator.gt, '<': py_operator.lt, '!=': py_operator.ne}
+# Tipo de Python que guarda cada tipo del cubo
+PYTHON_TYPES = {Type.INT: int, Type.FLOAT: float, Type.BOOL: bool}
+
+def _evaluate(operator, left, right, result_type):
+    """left <operator> right con la misma aritmética que las operaciones
+    tipadas de la VM (la división entera trunca y dividir entre cero da 0)"""
+    if operator == '/':
+        if right == 0:
+            return 0 if result_type == Type.INT else 0.0
+        value = left / right
+        return int(value) if result_type == Type.INT else value
+    return PYTHON_OPERATORS[operator](left, right)
+
+def _storable(memory_manager, address, value):
+    """value ya tiene el tipo de Python del segmento de address"""
+    kind = KIND_TYPES.get(address_kind(memory_manager, address))
+    return kind is not None and type(value) is PYTHON_TYPES[kind]
+
+def fold_constants(quad_gen):
+    """Plegado y propagación de constantes dentro de cada bloque básico.
+    Una operación tipada cuyos dos operandos se conocen se calcula aquí con
+    el tipo que da el cubo semántico y se vuelve una asignación de la
+    constante (registrada con MemoryManager.get_constant_address); los
+    valores conocidos de variables y temporales reemplazan sus lecturas, y un
+    gotof con condición conocida se elimina o se vuelve goto. Al final se
+    quitan los cuádruplos plegados cuyo temporal ya nadie lee.
+    Regresa el número de cuádruplos eliminados."""
+    quads = quad_gen.Quads
+    memory_manager = quad_gen.semantic.memory_manager
+    constant_values = quad_gen.constants_table
+    leaders = block_leaders(quads, quad_gen.semantic.function_directory)
+
+    known = {}          # dirección -> valor conocido en este punto del bloque
+
+    def value_of(address):
+        if address in constant_values:
+            return constant_values[address]
+        return known.get(address)
+
+    def propagated(address):
+        """Constante que puede leerse en lugar de address, si se conoce su valor"""
+        value = known.get(address)
+        if value is None or not _storable(memory_manager, address, value) or type(value) is bool:
+            return address
+        return quad_gen.constant_address(value)
+
+    new_quads = []
+    removable = set()   # cuádruplos plegados que se quitan si su temporal no se lee
+    for index, quad in enumerate(quads):
+        if index in leaders:
+            known.clear()
+        operator = base_operator(quad.operator)
+        left, right, result = quad.left_operand, quad.right_operand, quad.result
+        if operator in CUBE_OPERATIONS:
+            left, right = propagated(left), propagated(right)
+            left_value, right_value = value_of(left), value_of(right)
+            folded = None
+            if quad.operator != operator and left_value is not None and right_value is not None:
+                # Solo los operadores tipados: el cubo ya fijó el tipo del resultado
+                result_type = get_result_type(KIND_TYPES[address_kind(memory_manager, left)],
+                                              KIND_TYPES[address_kind(memory_manager, right)],
+                                              CUBE_OPERATIONS[operator])
+                folded = _evaluate(operator, left_value, right_value, result_type)
+                if not _storable(memory_manager, result, folded):
+                    folded = None
+                elif isinstance(folded, float) and (folded != folded or
+                                                    (folded == 0 and math.copysign(1, folded) < 0)):
+                    # NaN y -0.0 no se pueden distinguir en la tabla de constantes
+                    folded = None
+            if folded is None:
+                known.pop(result, None)
+                quad = Quadruple(quad.operator, left, right, result)
+            else:
+                known[result] = folded
+                removable.add(index)
+                if type(folded) is not bool:
+                    quad = Quadruple('=', quad_gen.constant_address(folded), None, result)
+                else:
+                    quad = Quadruple(quad.operator, left, right, result)
+        elif operator == '=':
+            left = propagated(left)
+            value = value_of(left)
+            kind = KIND_TYPES.get(address_kind(memory_manager, result))
+            if value is not None and kind in (Type.INT, Type.FLOAT) and type(value) is not bool:
+                # La asignación convierte al tipo del destino, como set_value en la VM
+                known[result] = PYTHON_TYPES[kind](value)
+            else:
+                known.pop(result, None)
+            quad = Quadruple('=', left, None, result)
+        elif operator in ('parámetro', 'RETURN') or (operator == 'print' and isinstance(left, int)):
+            quad = Quadruple(quad.operator, propagated(left), right, result)
+        elif operator == 'gotof':
+            condition = value_of(left)
+            if condition is not None:
+                # Condición verdadera: el gotof no hace nada; falsa: siempre salta
+                quad = None if condition else Quadruple('goto', None, None, result)
+        elif operator in ('GOSUB', 'TAILCALL'):
+            # La función llamada puede cambiar cualquier global
+            for address in [address for address in known if is_global(memory_manager, address)]:
+                del known[address]
+            known.pop(result, None)
+        else:
+            quad = Quadruple(quad.operator, left, right, result)
+        new_quads.append(quad)
+
+    regions = function_regions(new_quads, quad_gen.semantic.function_directory)
+    reads = count_reads([quad for quad in new_quads if quad is not None],
+                        [region for quad, region in zip(new_quads, regions) if quad is not None])
+    kept = []
+    index_map = []
+    for index, quad in enumerate(new_quads):
+        index_map.append(len(kept))
+        if quad is None:
+            continue
+        if (index in removable and is_temp(memory_manager, quad.result)
+                and reads[(regions[index], quad.result)] == 0):
+            continue
+        kept.append(quad)
+    index_map.append(len(kept))
+    removed = len(quads) - len(kept)
+    compact(quad_gen, kept, index_map)
+    return removed
+
+def _negation(quad, constant_values):
+    """-1 * x (como lo genera el menos unario) se vuelve neg x"""
+    if base_operator(quad.operator) == '*' and constant_values.get(quad.left_operand) == -1:
+        return Quadruple('neg', quad.right_operand, None, quad.result)
+    return quad
+
+def fuse_superinstructions(quad_gen):
+    """Fusiona las secuencias más frecuentes en una sola instrucción:
+    comparación + gotof -> gotof< / gotof> / gotof!=, operación en temporal +
+    asignación -> operación directa a la variable, y -1 * x -> neg x.
+    Regresa el número de cuádruplos eliminados."""
+    quads = quad_gen.Quads
+    memory_manager = quad_gen.semantic.memory_manager
+    constant_values = quad_gen.constants_table
+    targets = jump_targets(quads)
+    regions = function_regions(quads, quad_gen.semantic.function_directory)
+    reads = count_reads(quads, regions)
+
+    new_quads = []
+    index_map = []
+    index = 0
+    while index < len(quads):
+        quad = _negation(quads[index], constant_values)
+        operator = base_operator(quad.operator)
+        index_map.append(len(new_quads))
+        following = quads[index + 1] if index + 1 < len(quads) else None
+        single_use_temp = (following is not None and index + 1 not in targets
+                           and is_temp(memory_manager, quad.result)
+                           and reads[(regions[index], quad.result)] == 1
+                           and following.left_operand == quad.result)
+        if single_use_temp and operator in COMPARE_AND_BRANCH and following.operator == 'gotof':
+            new_quads.append(Quadruple(COMPARE_AND_BRANCH[operator], quad.left_operand,
+                                       quad.right_operand, following.result))
+            index_map.append(len(new_quads) - 1)
+            index += 2
+        elif (single_use_temp and (operator in ARITHMETIC_OPERATORS or operator == 'neg')
+              and following.operator == '='
+              and address_kind(memory_manager, quad.result) == address_kind(memory_manager, following.result)):
+            new_quads.append(Quadruple(quad.operator, quad.left_operand, quad.right_operand,
+                                       following.result))
+            index_map.append(len(new_quads) - 1)
+            index += 2
+        else:
+            new_quads.append(quad)
+            index += 1
+    index_map.append(len(new_quads))
+    removed = len(quads) - len(new_quads)
+    compact(quad_gen, new_quads, index_map)
+    return removed
+
+def optimize(quad_gen):
+    """Corre todas las pasadas de optimización en orden y regresa el número
+    de cuádruplos eliminados"""
+    removed = fold_constants(quad_gen)
+    return removed + fuse_superinstructions(quad_gen)
@@ -1,132 +0,0 @@
-
-# parsetab.py
-# This file is automatically generated. Do not edit.
-# pylint: disable=W,C,R
-_tabversion = '3.10'
-
-_lr_method = 'LALR'
-
-_lr_signature = 'TOKEN_ASSIGN TOKEN_COLON TOKEN_COMMA TOKEN_CTE_FLOAT TOKEN_CTE_INT TOKEN_CTE_STRING TOKEN_DIV TOKEN_DO TOKEN_ELSE TOKEN_END TOKEN_FLOAT TOKEN_FOR TOKEN_GT TOKEN_ID TOKEN_IF TOKEN_INT TOKEN_LBRACE TOKEN_LCOL TOKEN_LPAREN TOKEN_LT TOKEN_MAIN TOKEN_MINUS TOKEN_MULT TOKEN_NE TOKEN_PLUS TOKEN_PRINT TOKEN_PROGRAM TOKEN_RBRACE TOKEN_RCOL TOKEN_RETURN TOKEN_RPAREN TOKEN_SEMICOLON TOKEN_VAR TOKEN_VOID TOKEN_WHILEprograma : TOKEN_PROGRAM TOKEN_ID TOKEN_SEMICOLON saveGo dec_var dec_funcs TOKEN_MAIN fillMain body TOKEN_ENDsaveGo : emptyfillMain : emptydec_var : vars\n    | emptydec_funcs : funcs dec_funcs\n    | emptyvars : TOKEN_VAR variable rep_varrep_var  : variable rep_var\n    |  emptyvariable : TOKEN_ID mas_ids TOKEN_COLON type TOKEN_SEMICOLONmas_ids : TOKEN_COMMA TOKEN_ID mas_ids\n    |  emptytype_fun : TOKEN_INT\n    | TOKEN_FLOAT\n    | TOKEN_VOIDtype : TOKEN_INT\n    | TOKEN_FLOATbody : TOKEN_LBRACE dec_statements TOKEN_RBRACEdec_statements : statement dec_statements\n    | emptystatement : assign\n        | condition\n        | cycle\n        | f_call\n        | print\n        | for_cycle\n        | return_stmtreturn_stmt : TOKEN_RETURN expresion TOKEN_SEMICOLONprint : TOKEN_PRINT TOKEN_LPAREN expresiones TOKEN_RPAREN TOKEN_SEMICOLONexpresiones : TOKEN_CTE_STRING comas\n    | expresion comascomas : TOKEN_COMMA expresion comas\n    | TOKEN_COMMA TOKEN_CTE_STRING comas\n    | emptysaveQuad : emptyGotoF : emptycycle : TOKEN_WHILE TOKEN_LPAREN saveQuad expresion GotoF TOKEN_RPAREN TOKEN_DO body TOKEN_SEMICOLONsaveQuadIF : emptyGotoFIF : emptycondition : TOKEN_IF TOKEN_LPAREN expresion saveQuadIF TOKEN_RPAREN body GotoFIF else TOKEN_SEMICOLONelse : TOKEN_ELSE body\n    | emptycte : TOKEN_CTE_INT\n    | TOKEN_CTE_FLOATexpresion : exp compararcomparar  : signo exp\n    | emptysigno : TOKEN_GT\n    | TOKEN_LT\n    | TOKEN_NEexp : termino suma_restaoperacion_sum_res : TOKEN_PLUS\n    | TOKEN_MINUSsuma_resta  : operacion_sum_res termino suma_resta\n                    | emptytermino : factor multi_divmulti_div : operacion_mul_div factor multi_div\n                    | emptyoperacion_mul_div : TOKEN_DIV\n    | TOKEN_MULTfactor : definicion\n    | operacionesdefinicion : TOKEN_LPAREN expresion TOKEN_RPARENoperaciones : opciones_mas_menos id_cteopciones_mas_menos : TOKEN_PLUS\n    | TOKEN_MINUS\n    | emptyid_cte : TOKEN_ID\n    | cte\n    | function_call_exprfuncs : type_fun TOKEN_ID save_func_start TOKEN_LPAREN tipo TOKEN_RPAREN TOKEN_LCOL var body TOKEN_RCOL end_func TOKEN_SEMICOLONsave_func_start : emptyend_func : emptytipo : def_tipo\n    | emptydef_tipo : TOKEN_ID TOKEN_COLON type comacoma : TOKEN_COMMA TOKEN_ID TOKEN_COLON type coma\n    | emptyvar : vars \n    | emptyf_call : TOKEN_ID era_quad TOKEN_LPAREN def_exp TOKEN_RPAREN gosub_quad TOKEN_SEMICOLONfunction_call_expr : TOKEN_ID era_quad TOKEN_LPAREN def_exp TOKEN_RPAREN gosub_quadera_quad : emptygosub_quad : emptydef_exp : expresion param_quad coma2\n    | emptyparam_quad : emptycoma2 : TOKEN_COMMA expresion param_quad_coma coma2\n    | emptyparam_quad_coma : emptyassign : TOKEN_ID TOKEN_ASSIGN expresion TOKEN_SEMICOLONfor_cycle : TOKEN_FOR TOKEN_LPAREN for_init TOKEN_SEMICOLON saveQuadFor expresion GotoFFor TOKEN_SEMICOLON for_increment TOKEN_RPAREN TOKEN_DO body TOKEN_SEMICOLONfor_init : assign_for\n                | emptyassign_for : TOKEN_ID TOKEN_ASSIGN expresionfor_increment : assign_for_increment\n                     | emptyassign_for_increment : TOKEN_ID TOKEN_ASSIGN expresionsaveQuadFor : emptyGotoFFor : emptyempty :'
-    
-_lr_action_items = {'TOKEN_PROGRAM':([0,],[2,]),'$end':([1,43,],[0,-1,]),'TOKEN_ID':([2,10,14,15,16,17,18,23,27,37,38,45,47,48,49,50,51,52,53,59,64,67,70,71,72,73,80,81,82,83,84,88,90,91,99,101,103,104,105,107,109,110,112,114,115,125,128,134,137,138,145,156,159,160,164,170,180,197,202,204,210,214,],[3,19,22,-14,-15,-16,19,19,35,54,60,54,-22,-23,-24,-25,-26,-27,-28,-102,-11,-102,-102,-102,-102,98,-102,118,-66,-67,-68,-102,-102,-36,-29,-102,-49,-50,-51,-102,-53,-54,-102,-60,-61,-92,-68,-102,-102,-102,165,-30,-102,-100,-102,-102,-82,208,-41,-38,-102,-93,]),'TOKEN_SEMICOLON':([3,39,40,41,65,73,74,75,76,77,78,79,87,95,96,97,100,102,106,108,111,113,117,118,119,120,121,122,132,139,140,141,142,150,161,162,163,167,168,172,176,179,182,183,185,186,187,189,190,193,195,196,198,203,213,],[4,64,-17,-18,-19,-102,99,-102,-102,-102,-62,-63,125,137,-94,-95,-46,-48,-52,-56,-57,-59,-65,-69,-70,-71,-44,-45,156,-47,-102,-102,-64,-102,-96,-55,-58,180,-85,-102,-102,-102,-102,-40,197,-101,-102,200,-74,202,-43,204,-83,-42,214,]),'TOKEN_VAR':([4,5,6,124,],[-102,10,-2,10,]),'TOKEN_INT':([4,5,6,7,8,9,12,18,23,24,25,33,34,64,85,178,200,],[-102,-102,-2,15,-4,-5,15,-102,-102,-8,-10,-9,40,-11,40,40,-72,]),'TOKEN_FLOAT':([4,5,6,7,8,9,12,18,23,24,25,33,34,64,85,178,200,],[-102,-102,-2,16,-4,-5,16,-102,-102,-8,-10,-9,41,-11,41,41,-72,]),'TOKEN_VOID':([4,5,6,7,8,9,12,18,23,24,25,33,64,200,],[-102,-102,-2,17,-4,-5,17,-102,-102,-8,-10,-9,-11,-72,]),'TOKEN_MAIN':([4,5,6,7,8,9,11,12,13,18,21,23,24,25,33,64,200,],[-102,-102,-2,-102,-4,-5,20,-102,-7,-102,-6,-102,-8,-10,-9,-11,-72,]),'TOKEN_LBRACE':([18,20,23,24,25,29,30,33,64,124,147,148,149,153,184,194,211,],[-102,-102,-102,-8,-10,37,-3,-9,-11,-102,37,-80,-81,37,37,37,37,]),'TOKEN_COMMA':([19,35,40,41,75,76,77,78,79,93,94,100,102,106,108,111,113,117,118,119,120,121,122,123,127,139,140,141,142,151,152,157,158,162,163,168,181,187,188,191,192,198,],[27,27,-17,-18,-102,-102,-102,-62,-63,134,134,-46,-48,-52,-56,-57,-59,-65,-69,-70,-71,-44,-45,145,-102,-47,-102,-102,-64,170,-88,134,134,-55,-58,-85,-102,-102,145,170,-91,-83,]),'TOKEN_COLON':([19,26,28,35,42,60,165,],[-102,34,-13,-102,-12,85,178,]),'TOKEN_LPAREN':([22,31,32,54,55,56,57,58,59,67,68,69,70,71,72,80,88,90,91,101,103,104,105,107,109,110,112,114,115,118,134,137,138,143,159,160,164,170,210,],[-102,38,-73,-102,70,71,72,73,80,80,88,-84,80,-102,80,80,80,80,-36,80,-49,-50,-51,80,-53,-54,80,-60,-61,-102,80,-102,80,164,80,-100,80,80,80,]),'TOKEN_END':([36,65,],[43,-19,]),'TOKEN_RBRACE':([37,44,45,46,47,48,49,50,51,52,53,66,99,125,156,180,202,204,214,],[-102,65,-102,-21,-22,-23,-24,-25,-26,-27,-28,-20,-29,-92,-30,-82,-41,-38,-93,]),'TOKEN_IF':([37,45,47,48,49,50,51,52,53,99,125,156,180,202,204,214,],[55,55,-22,-23,-24,-25,-26,-27,-28,-29,-92,-30,-82,-41,-38,-93,]),'TOKEN_WHILE':([37,45,47,48,49,50,51,52,53,99,125,156,180,202,204,214,],[56,56,-22,-23,-24,-25,-26,-27,-28,-29,-92,-30,-82,-41,-38,-93,]),'TOKEN_PRINT':([37,45,47,48,49,50,51,52,53,99,125,156,180,202,204,214,],[57,57,-22,-23,-24,-25,-26,-27,-28,-29,-92,-30,-82,-41,-38,-93,]),'TOKEN_FOR':([37,45,47,48,49,50,51,52,53,99,125,156,180,202,204,214,],[58,58,-22,-23,-24,-25,-26,-27,-28,-29,-92,-30,-82,-41,-38,-93,]),'TOKEN_RETURN':([37,45,47,48,49,50,51,52,53,99,125,156,180,202,204,214,],[59,59,-22,-23,-24,-25,-26,-27,-28,-29,-92,-30,-82,-41,-38,-93,]),'TOKEN_RPAREN':([38,40,41,61,62,63,75,76,77,78,79,88,89,92,93,94,100,102,106,108,111,113,116,117,118,119,120,121,122,123,126,127,128,129,130,131,133,135,136,139,140,141,142,144,146,151,152,154,155,157,158,162,163,164,168,169,171,174,175,177,181,187,188,191,192,197,198,199,201,205,206,207,212,],[-102,-17,-18,86,-75,-76,-102,-102,-102,-62,-63,-102,-102,132,-102,-102,-46,-48,-52,-56,-57,-59,142,-65,-69,-70,-71,-44,-45,-102,150,-102,-87,153,-39,-102,-31,-35,-32,-47,-102,-102,-64,-77,-79,-102,-88,173,-37,-102,-102,-55,-58,-102,-85,-86,-90,-33,-34,187,-102,-102,-102,-102,-91,-102,-83,-78,-89,209,-97,-98,-99,]),'TOKEN_ASSIGN':([54,98,208,],[67,138,210,]),'TOKEN_PLUS':([59,67,70,71,72,76,77,78,79,80,88,90,91,101,103,104,105,107,109,110,111,112,113,114,115,117,118,119,120,121,122,134,137,138,140,141,142,159,160,163,164,168,170,187,198,210,],[82,82,82,-102,82,109,-102,-62,-63,82,82,82,-36,82,-49,-50,-51,82,-53,-54,-57,82,-59,-60,-61,-65,-69,-70,-71,-44,-45,82,-102,82,109,-102,-64,82,-100,-58,82,-85,82,-102,-83,82,]),'TOKEN_MINUS':([59,67,70,71,72,76,77,78,79,80,88,90,91,101,103,104,105,107,109,110,111,112,113,114,115,117,118,119,120,121,122,134,137,138,140,141,142,159,160,163,164,168,170,187,198,210,],[83,83,83,-102,83,110,-102,-62,-63,83,83,83,-36,83,-49,-50,-51,83,-53,-54,-57,83,-59,-60,-61,-65,-69,-70,-71,-44,-45,83,-102,83,110,-102,-64,83,-100,-58,83,-85,83,-102,-83,83,]),'TOKEN_CTE_INT':([59,67,70,71,72,80,81,82,83,84,88,90,91,101,103,104,105,107,109,110,112,114,115,128,134,137,138,159,160,164,170,210,],[-102,-102,-102,-102,-102,-102,121,-66,-67,-68,-102,-102,-36,-102,-49,-50,-51,-102,-53,-54,-102,-60,-61,-68,-102,-102,-102,-102,-100,-102,-102,-102,]),'TOKEN_CTE_FLOAT':([59,67,70,71,72,80,81,82,83,84,88,90,91,101,103,104,105,107,109,110,112,114,115,128,134,137,138,159,160,164,170,210,],[-102,-102,-102,-102,-102,-102,122,-66,-67,-68,-102,-102,-36,-102,-49,-50,-51,-102,-53,-54,-102,-60,-61,-68,-102,-102,-102,-102,-100,-102,-102,-102,]),'TOKEN_RCOL':([65,166,],[-19,179,]),'TOKEN_ELSE':([65,172,182,183,],[-19,-102,194,-40,]),'TOKEN_CTE_STRING':([72,134,],[93,158,]),'TOKEN_GT':([75,76,77,78,79,106,108,111,113,117,118,119,120,121,122,140,141,142,162,163,168,187,198,],[103,-102,-102,-62,-63,-52,-56,-57,-59,-65,-69,-70,-71,-44,-45,-102,-102,-64,-55,-58,-85,-102,-83,]),'TOKEN_LT':([75,76,77,78,79,106,108,111,113,117,118,119,120,121,122,140,141,142,162,163,168,187,198,],[104,-102,-102,-62,-63,-52,-56,-57,-59,-65,-69,-70,-71,-44,-45,-102,-102,-64,-55,-58,-85,-102,-83,]),'TOKEN_NE':([75,76,77,78,79,106,108,111,113,117,118,119,120,121,122,140,141,142,162,163,168,187,198,],[105,-102,-102,-62,-63,-52,-56,-57,-59,-65,-69,-70,-71,-44,-45,-102,-102,-64,-55,-58,-85,-102,-83,]),'TOKEN_DIV':([77,78,79,117,118,119,120,121,122,141,142,168,187,198,],[114,-62,-63,-65,-69,-70,-71,-44,-45,114,-64,-85,-102,-83,]),'TOKEN_MULT':([77,78,79,117,118,119,120,121,122,141,142,168,187,198,],[115,-62,-63,-65,-69,-70,-71,-44,-45,115,-64,-85,-102,-83,]),'TOKEN_LCOL':([86,],[124,]),'TOKEN_DO':([173,209,],[184,211,]),}
-
-_lr_action = {}
-for _k, _v in _lr_action_items.items():
-   for _x,_y in zip(_v[0],_v[1]):
-      if not _x in _lr_action:  _lr_action[_x] = {}
-      _lr_action[_x][_k] = _y
-del _lr_action_items
-
-_lr_goto_items = {'programa':([0,],[1,]),'saveGo':([4,],[5,]),'empty':([4,5,7,12,18,19,20,22,23,35,37,38,45,54,59,67,70,71,72,73,75,76,77,80,88,89,90,93,94,101,107,112,118,123,124,127,131,134,137,138,140,141,150,151,157,158,159,164,170,172,176,179,181,182,187,188,191,197,210,],[6,9,13,13,25,28,30,32,25,28,46,63,46,69,84,84,84,91,84,97,102,108,113,84,128,130,84,135,135,84,84,84,69,146,149,152,155,84,160,84,108,113,168,171,135,135,84,128,84,183,186,190,192,195,168,146,171,207,84,]),'dec_var':([5,],[7,]),'vars':([5,124,],[8,148,]),'dec_funcs':([7,12,],[11,21,]),'funcs':([7,12,],[12,12,]),'type_fun':([7,12,],[14,14,]),'variable':([10,18,23,],[18,23,23,]),'rep_var':([18,23,],[24,33,]),'mas_ids':([19,35,],[26,42,]),'fillMain':([20,],[29,]),'save_func_start':([22,],[31,]),'body':([29,147,153,184,194,211,],[36,166,172,196,203,213,]),'type':([34,85,178,],[39,123,188,]),'dec_statements':([37,45,],[44,66,]),'statement':([37,45,],[45,45,]),'assign':([37,45,],[47,47,]),'condition':([37,45,],[48,48,]),'cycle':([37,45,],[49,49,]),'f_call':([37,45,],[50,50,]),'print':([37,45,],[51,51,]),'for_cycle':([37,45,],[52,52,]),'return_stmt':([37,45,],[53,53,]),'tipo':([38,],[61,]),'def_tipo':([38,],[62,]),'era_quad':([54,118,],[68,143,]),'expresion':([59,67,70,72,80,88,90,134,138,159,164,170,210,],[74,87,89,94,116,127,131,157,161,176,127,181,212,]),'exp':([59,67,70,72,80,88,90,101,134,138,159,164,170,210,],[75,75,75,75,75,75,75,139,75,75,75,75,75,75,]),'termino':([59,67,70,72,80,88,90,101,107,134,138,159,164,170,210,],[76,76,76,76,76,76,76,76,140,76,76,76,76,76,76,]),'factor':([59,67,70,72,80,88,90,101,107,112,134,138,159,164,170,210,],[77,77,77,77,77,77,77,77,77,141,77,77,77,77,77,77,]),'definicion':([59,67,70,72,80,88,90,101,107,112,134,138,159,164,170,210,],[78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,78,]),'operaciones':([59,67,70,72,80,88,90,101,107,112,134,138,159,164,170,210,],[79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,79,]),'opciones_mas_menos':([59,67,70,72,80,88,90,101,107,112,134,138,159,164,170,210,],[81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,]),'saveQuad':([71,],[90,]),'expresiones':([72,],[92,]),'for_init':([73,],[95,]),'assign_for':([73,],[96,]),'comparar':([75,],[100,]),'signo':([75,],[101,]),'suma_resta':([76,140,],[106,162,]),'operacion_sum_res':([76,140,],[107,107,]),'multi_div':([77,141,],[111,163,]),'operacion_mul_div':([77,141,],[112,112,]),'id_cte':([81,],[117,]),'cte':([81,],[119,]),'function_call_expr':([81,],[120,]),'def_exp':([88,164,],[126,177,]),'saveQuadIF':([89,],[129,]),'comas':([93,94,157,158,],[133,136,174,175,]),'coma':([123,188,],[144,199,]),'var':([124,],[147,]),'param_quad':([127,],[151,]),'GotoF':([131,],[154,]),'saveQuadFor':([137,],[159,]),'gosub_quad':([150,187,],[167,198,]),'coma2':([151,191,],[169,201,]),'GotoFIF':([172,],[182,]),'GotoFFor':([176,],[185,]),'end_func':([179,],[189,]),'param_quad_coma':([181,],[191,]),'else':([182,],[193,]),'for_increment':([197,],[205,]),'assign_for_increment':([197,],[206,]),}
-
-_lr_goto = {}
-for _k, _v in _lr_goto_items.items():
-   for _x, _y in zip(_v[0], _v[1]):
-       if not _x in _lr_goto: _lr_goto[_x] = {}
-       _lr_goto[_x][_k] = _y
-del _lr_goto_items
-_lr_productions = [
-  ("S' -> programa","S'",1,None,None,None),
-  ('programa -> TOKEN_PROGRAM TOKEN_ID TOKEN_SEMICOLON saveGo dec_var dec_funcs TOKEN_MAIN fillMain body TOKEN_END','programa',10,'p_programa','yacc.py',37),
-  ('saveGo -> empty','saveGo',1,'p_saveGo','yacc.py',45),
-  ('fillMain -> empty','fillMain',1,'p_fillMain','yacc.py',51),
-  ('dec_var -> vars','dec_var',1,'p_dec_var','yacc.py',62),
-  ('dec_var -> empty','dec_var',1,'p_dec_var','yacc.py',63),
-  ('dec_funcs -> funcs dec_funcs','dec_funcs',2,'p_dec_funcs','yacc.py',67),
-  ('dec_funcs -> empty','dec_funcs',1,'p_dec_funcs','yacc.py',68),
-  ('vars -> TOKEN_VAR variable rep_var','vars',3,'p_vars','yacc.py',78),
-  ('rep_var -> variable rep_var','rep_var',2,'p_rep_var','yacc.py',86),
-  ('rep_var -> empty','rep_var',1,'p_rep_var','yacc.py',87),
-  ('variable -> TOKEN_ID mas_ids TOKEN_COLON type TOKEN_SEMICOLON','variable',5,'p_variable','yacc.py',97),
-  ('mas_ids -> TOKEN_COMMA TOKEN_ID mas_ids','mas_ids',3,'p_mas_ids','yacc.py',107),
-  ('mas_ids -> empty','mas_ids',1,'p_mas_ids','yacc.py',108),
-  ('type_fun -> TOKEN_INT','type_fun',1,'p_type_fun','yacc.py',118),
-  ('type_fun -> TOKEN_FLOAT','type_fun',1,'p_type_fun','yacc.py',119),
-  ('type_fun -> TOKEN_VOID','type_fun',1,'p_type_fun','yacc.py',120),
-  ('type -> TOKEN_INT','type',1,'p_type','yacc.py',129),
-  ('type -> TOKEN_FLOAT','type',1,'p_type','yacc.py',130),
-  ('body -> TOKEN_LBRACE dec_statements TOKEN_RBRACE','body',3,'p_body','yacc.py',139),
-  ('dec_statements -> statement dec_statements','dec_statements',2,'p_dec_statements','yacc.py',143),
-  ('dec_statements -> empty','dec_statements',1,'p_dec_statements','yacc.py',144),
-  ('statement -> assign','statement',1,'p_statement','yacc.py',154),
-  ('statement -> condition','statement',1,'p_statement','yacc.py',155),
-  ('statement -> cycle','statement',1,'p_statement','yacc.py',156),
-  ('statement -> f_call','statement',1,'p_statement','yacc.py',157),
-  ('statement -> print','statement',1,'p_statement','yacc.py',158),
-  ('statement -> for_cycle','statement',1,'p_statement','yacc.py',159),
-  ('statement -> return_stmt','statement',1,'p_statement','yacc.py',160),
-  ('return_stmt -> TOKEN_RETURN expresion TOKEN_SEMICOLON','return_stmt',3,'p_return_stmt','yacc.py',164),
-  ('print -> TOKEN_PRINT TOKEN_LPAREN expresiones TOKEN_RPAREN TOKEN_SEMICOLON','print',5,'p_print','yacc.py',173),
-  ('expresiones -> TOKEN_CTE_STRING comas','expresiones',2,'p_expresiones','yacc.py',184),
-  ('expresiones -> expresion comas','expresiones',2,'p_expresiones','yacc.py',185),
-  ('comas -> TOKEN_COMMA expresion comas','comas',3,'p_comas','yacc.py',192),
-  ('comas -> TOKEN_COMMA TOKEN_CTE_STRING comas','comas',3,'p_comas','yacc.py',193),
-  ('comas -> empty','comas',1,'p_comas','yacc.py',194),
-  ('saveQuad -> empty','saveQuad',1,'p_saveQuad','yacc.py',204),
-  ('GotoF -> empty','GotoF',1,'p_GotoF','yacc.py',208),
-  ('cycle -> TOKEN_WHILE TOKEN_LPAREN saveQuad expresion GotoF TOKEN_RPAREN TOKEN_DO body TOKEN_SEMICOLON','cycle',9,'p_cycle','yacc.py',214),
-  ('saveQuadIF -> empty','saveQuadIF',1,'p_saveQuadIF','yacc.py',224),
-  ('GotoFIF -> empty','GotoFIF',1,'p_GotoFIF','yacc.py',230),
-  ('condition -> TOKEN_IF TOKEN_LPAREN expresion saveQuadIF TOKEN_RPAREN body GotoFIF else TOKEN_SEMICOLON','condition',9,'p_condition','yacc.py',237),
-  ('else -> TOKEN_ELSE body','else',2,'p_else','yacc.py',246),
-  ('else -> empty','else',1,'p_else','yacc.py',247),
-  ('cte -> TOKEN_CTE_INT','cte',1,'p_cte','yacc.py',254),
-  ('cte -> TOKEN_CTE_FLOAT','cte',1,'p_cte','yacc.py',255),
-  ('expresion -> exp comparar','expresion',2,'p_expresion','yacc.py',262),
-  ('comparar -> signo exp','comparar',2,'p_comparar','yacc.py',280),
-  ('comparar -> empty','comparar',1,'p_comparar','yacc.py',281),
-  ('signo -> TOKEN_GT','signo',1,'p_signo','yacc.py',288),
-  ('signo -> TOKEN_LT','signo',1,'p_signo','yacc.py',289),
-  ('signo -> TOKEN_NE','signo',1,'p_signo','yacc.py',290),
-  ('exp -> termino suma_resta','exp',2,'p_exp','yacc.py',294),
-  ('operacion_sum_res -> TOKEN_PLUS','operacion_sum_res',1,'p_operacion_sum_res','yacc.py',317),
-  ('operacion_sum_res -> TOKEN_MINUS','operacion_sum_res',1,'p_operacion_sum_res','yacc.py',318),
-  ('suma_resta -> operacion_sum_res termino suma_resta','suma_resta',3,'p_suma_resta','yacc.py',322),
-  ('suma_resta -> empty','suma_resta',1,'p_suma_resta','yacc.py',323),
-  ('termino -> factor multi_div','termino',2,'p_termino','yacc.py',333),
-  ('multi_div -> operacion_mul_div factor multi_div','multi_div',3,'p_multi_div','yacc.py',356),
-  ('multi_div -> empty','multi_div',1,'p_multi_div','yacc.py',357),
-  ('operacion_mul_div -> TOKEN_DIV','operacion_mul_div',1,'p_operacion_mul_div','yacc.py',367),
-  ('operacion_mul_div -> TOKEN_MULT','operacion_mul_div',1,'p_operacion_mul_div','yacc.py',368),
-  ('factor -> definicion','factor',1,'p_factor','yacc.py',372),
-  ('factor -> operaciones','factor',1,'p_factor','yacc.py',373),
-  ('definicion -> TOKEN_LPAREN expresion TOKEN_RPAREN','definicion',3,'p_definicion','yacc.py',377),
-  ('operaciones -> opciones_mas_menos id_cte','operaciones',2,'p_operaciones','yacc.py',383),
-  ('opciones_mas_menos -> TOKEN_PLUS','opciones_mas_menos',1,'p_opciones_mas_menos','yacc.py',400),
-  ('opciones_mas_menos -> TOKEN_MINUS','opciones_mas_menos',1,'p_opciones_mas_menos','yacc.py',401),
-  ('opciones_mas_menos -> empty','opciones_mas_menos',1,'p_opciones_mas_menos','yacc.py',402),
-  ('id_cte -> TOKEN_ID','id_cte',1,'p_id_cte','yacc.py',406),
-  ('id_cte -> cte','id_cte',1,'p_id_cte','yacc.py',407),
-  ('id_cte -> function_call_expr','id_cte',1,'p_id_cte','yacc.py',408),
-  ('funcs -> type_fun TOKEN_ID save_func_start TOKEN_LPAREN tipo TOKEN_RPAREN TOKEN_LCOL var body TOKEN_RCOL end_func TOKEN_SEMICOLON','funcs',12,'p_funcs','yacc.py',423),
-  ('save_func_start -> empty','save_func_start',1,'p_save_func_start','yacc.py',429),
-  ('end_func -> empty','end_func',1,'p_end_func','yacc.py',443),
-  ('tipo -> def_tipo','tipo',1,'p_tipo','yacc.py',449),
-  ('tipo -> empty','tipo',1,'p_tipo','yacc.py',450),
-  ('def_tipo -> TOKEN_ID TOKEN_COLON type coma','def_tipo',4,'p_def_tipo','yacc.py',463),
-  ('coma -> TOKEN_COMMA TOKEN_ID TOKEN_COLON type coma','coma',5,'p_coma','yacc.py',470),
-  ('coma -> empty','coma',1,'p_coma','yacc.py',471),
-  ('var -> vars','var',1,'p_var','yacc.py',482),
-  ('var -> empty','var',1,'p_var','yacc.py',483),
-  ('f_call -> TOKEN_ID era_quad TOKEN_LPAREN def_exp TOKEN_RPAREN gosub_quad TOKEN_SEMICOLON','f_call',7,'p_f_call','yacc.py',487),
-  ('function_call_expr -> TOKEN_ID era_quad TOKEN_LPAREN def_exp TOKEN_RPAREN gosub_quad','function_call_expr',6,'p_function_call_expr','yacc.py',504),
-  ('era_quad -> empty','era_quad',1,'p_era_quad','yacc.py',522),
-  ('gosub_quad -> empty','gosub_quad',1,'p_gosub_quad','yacc.py',529),
-  ('def_exp -> expresion param_quad coma2','def_exp',3,'p_def_exp','yacc.py',535),
-  ('def_exp -> empty','def_exp',1,'p_def_exp','yacc.py',536),
-  ('param_quad -> empty','param_quad',1,'p_param_quad','yacc.py',546),
-  ('coma2 -> TOKEN_COMMA expresion param_quad_coma coma2','coma2',4,'p_coma2','yacc.py',555),
-  ('coma2 -> empty','coma2',1,'p_coma2','yacc.py',556),
-  ('param_quad_coma -> empty','param_quad_coma',1,'p_param_quad_coma','yacc.py',563),
-  ('assign -> TOKEN_ID TOKEN_ASSIGN expresion TOKEN_SEMICOLON','assign',4,'p_assign','yacc.py',572),
-  ('for_cycle -> TOKEN_FOR TOKEN_LPAREN for_init TOKEN_SEMICOLON saveQuadFor expresion GotoFFor TOKEN_SEMICOLON for_increment TOKEN_RPAREN TOKEN_DO body TOKEN_SEMICOLON','for_cycle',13,'p_for_cycle','yacc.py',581),
-  ('for_init -> assign_for','for_init',1,'p_for_init','yacc.py',603),
-  ('for_init -> empty','for_init',1,'p_for_init','yacc.py',604),
-  ('assign_for -> TOKEN_ID TOKEN_ASSIGN expresion','assign_for',3,'p_assign_for','yacc.py',608),
-  ('for_increment -> assign_for_increment','for_increment',1,'p_for_increment','yacc.py',618),
-  ('for_increment -> empty','for_increment',1,'p_for_increment','yacc.py',619),
-  ('assign_for_increment -> TOKEN_ID TOKEN_ASSIGN expresion','assign_for_increment',3,'p_assign_for_increment','yacc.py',623),
-  ('saveQuadFor -> empty','saveQuadFor',1,'p_saveQuadFor','yacc.py',636),
-  ('GotoFFor -> empty','GotoFFor',1,'p_GotoFFor','yacc.py',641),
-  ('empty -> <empty>','empty',0,'p_empty','yacc.py',649),
-]
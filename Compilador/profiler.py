@@ -0,0 +1,382 @@
+import json
+import threading
+import time
+from collections import Counter
+
+from opcodes import OPCODE_NAMES, OP_GOTO
+
+# Perfiladores de la máquina virtual. Se conectan con vm.profiler antes de
+# llamar execute(); sin perfilador la VM usa su ciclo normal y no paga nada.
+# La VM llama profiler.start(vm) y profiler.stop() alrededor de la ejecución
+# y usa su ciclo con medición por cuádruplo solo si profiler.counts_quads.
+
+GLOBAL_SCOPE = 'global'
+
+def quad_functions(quadruples, function_directory):
+    """Nombre de la función a la que pertenece cada cuádruplo.
+    Cada función va de su start_address al inicio de la siguiente; lo que
+    está antes de la primera (el goto a main) se reporta como 'global'."""
+    starts = sorted((info.start_address, name) for name, info in function_directory.items()
+                    if info.start_address is not None)
+    names = [GLOBAL_SCOPE] * len(quadruples)
+    for position, (start, name) in enumerate(starts):
+        end = starts[position + 1][0] if position + 1 < len(starts) else len(quadruples)
+        for index in range(start, min(end, len(quadruples))):
+            names[index] = name
+    return names
+
+class QuadProfiler:
+    """Cuenta ejecuciones y acumula tiempo por índice de cuádruplo.
+
+    Uso:
+        vm.profiler = QuadProfiler()
+        vm.execute()
+        print(vm.profiler.report())
+        vm.profiler.write_json('perfil.json')"""
+    counts_quads = True
+
+    def __init__(self):
+        self.vm = None
+        self.counts = []
+        self.times = []
+        self.total_time = 0.0
+
+    def start(self, vm):
+        """Prepara los contadores para una ejecución de la VM"""
+        self.vm = vm
+        self.counts = [0] * len(vm.code)
+        self.times = [0.0] * len(vm.code)
+        self.functions = quad_functions(vm.quadruples, vm.function_directory)
+        self.started_at = time.perf_counter()
+
+    def stop(self):
+        self.total_time = time.perf_counter() - self.started_at
+
+    def quad_rows(self):
+        """Un diccionario por cuádruplo ejecutado, del más caro al más barato"""
+        rows = []
+        for index, count in enumerate(self.counts):
+            if count:
+                rows.append({
+                    'index': index,
+                    'quad': str(self.vm.quadruples[index]),
+                    'opcode': OPCODE_NAMES[self.vm.code[index][0]],
+                    'function': self.functions[index],
+                    'count': count,
+                    'time': self.times[index],
+                })
+        rows.sort(key=lambda row: row['time'], reverse=True)
+        return rows
+
+    def _aggregate(self, key):
+        totals = {}
+        for row in self.quad_rows():
+            entry = totals.setdefault(row[key], {'count': 0, 'time': 0.0})
+            entry['count'] += row['count']
+            entry['time'] += row['time']
+        return dict(sorted(totals.items(), key=lambda item: item[1]['time'], reverse=True))
+
+    def by_opcode(self):
+        return self._aggregate('opcode')
+
+    def by_function(self):
+        return self._aggregate('function')
+
+    def loops(self):
+        """Ciclos del programa (un goto hacia atrás cierra el cuerpo que
+        empieza en su destino), ordenados por el tiempo de su cuerpo"""
+        loops = []
+        for index, (opcode, _, _, target) in enumerate(self.vm.code):
+            if opcode == OP_GOTO and target is not None and target <= index:
+                body = range(target, index + 1)
+                loops.append({
+                    'start': target,
+                    'end': index,
+                    'function': self.functions[index],
+                    'iterations': self.counts[index],
+                    'time': sum(self.times[i] for i in body),
+                })
+        loops.sort(key=lambda loop: loop['time'], reverse=True)
+        return loops
+
+    def to_dict(self):
+        return {
+            'total_time': self.total_time,
+            'instructions': sum(self.counts),
+            'quads': self.quad_rows(),
+            'opcodes': self.by_opcode(),
+            'functions': self.by_function(),
+            'loops': self.loops(),
+        }
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def report(self, limit=15):
+        """Reporte de texto con los puntos calientes"""
+        measured = sum(self.times) or 1.0
+        lines = ["=== PERFIL POR CUÁDRUPLO ===",
+                 f"Instrucciones: {sum(self.counts)}  Tiempo total: {self.total_time:.4f} s",
+                 "",
+                 f"{'índice':>6} {'veces':>9} {'tiempo s':>10} {'%':>6}  {'función':14} cuádruplo"]
+        for row in self.quad_rows()[:limit]:
+            lines.append(f"{row['index']:>6} {row['count']:>9} {row['time']:>10.4f} "
+                         f"{row['time'] / measured:>6.1%}  {row['function']:14} {row['quad']}")
+        lines += ["", f"{'operación':>10} {'veces':>9} {'tiempo s':>10} {'%':>6}"]
+        for name, entry in self.by_opcode().items():
+            lines.append(f"{name:>10} {entry['count']:>9} {entry['time']:>10.4f} "
+                         f"{entry['time'] / measured:>6.1%}")
+        lines += ["", f"{'función':>14} {'veces':>9} {'tiempo s':>10} {'%':>6}"]
+        for name, entry in self.by_function().items():
+            lines.append(f"{name:>14} {entry['count']:>9} {entry['time']:>10.4f} "
+                         f"{entry['time'] / measured:>6.1%}")
+        loops = self.loops()
+        if loops:
+            lines += ["", "Ciclos más calientes:"]
+            for loop in loops[:limit]:
+                lines.append(f"  {loop['function']}: cuádruplos {loop['start']}-{loop['end']}, "
+                             f"{loop['iterations']} vueltas, {loop['time']:.4f} s "
+                             f"({loop['time'] / measured:.1%})")
+        return "\n".join(lines)
+
+# Intervalo por defecto entre muestras. Para tomar cada muestra el hilo
+# auxiliar le quita el GIL a la VM, así que muestrear más seguido le cuesta
+# tiempo: con 1 ms se llegó a medir +14% en 13_fiboRecursivo; con 10 ms
+# bench_sampling mide alrededor de 1% (y falla si pasa de 5%).
+DEFAULT_SAMPLE_INTERVAL = 0.01
+
+class SamplingProfiler:
+    """Perfilador por muestreo para ejecuciones largas.
+
+    Un hilo auxiliar despierta cada `interval` segundos y anota la pila de
+    funciones (main + call_stack) y el cuádruplo actual. La VM corre con su
+    ciclo normal; el costo es solo el de las muestras. La salida es el
+    formato de pilas colapsadas que leen flamegraph.pl y speedscope:
+        main;fibonacci;fibonacci;q4 gotof< 12"""
+    counts_quads = False
+
+    def __init__(self, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples = Counter()
+        self.sample_count = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self, vm):
+        self.vm = vm
+        self.samples = Counter()
+        self.sample_count = 0
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._sample_loop, name="vm-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _sample_loop(self):
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        """Toma una muestra de la VM (se llama desde el hilo auxiliar)"""
+        vm = self.vm
+        ip = vm.instruction_pointer
+        stack = ['main']
+        stack.extend(context['function_name'] for context in list(vm.call_stack))
+        # Los backends que no actualizan instruction_pointer solo dan la pila
+        if vm.tracks_instruction_pointer and 0 <= ip < len(vm.quadruples):
+            stack.append(f"q{ip} {vm.quadruples[ip].operator}")
+        self.samples[";".join(stack)] += 1
+        self.sample_count += 1
+
+    def collapsed(self):
+        """Líneas 'pila;de;funciones muestras' ordenadas por muestras"""
+        return [f"{stack} {count}" for stack, count in self.samples.most_common()]
+
+    def write_collapsed(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(self.collapsed()) + "\n")
+
+    def report(self, limit=15):
+        total = self.sample_count or 1
+        lines = ["=== PERFIL POR MUESTREO ===",
+                 f"Muestras: {self.sample_count} (cada {self.interval * 1000:.1f} ms)", ""]
+        for stack, count in self.samples.most_common(limit):
+            lines.append(f"{count:>7} {count / total:>6.1%}  {stack}")
+        return "\n".join(lines)
+
+class _ObservedCallStack(list):
+    """call_stack de la VM que avisa al CallProfiler en cada GOSUB (append)
+    y en cada ENDFUNC/RETURN (pop)"""
+    def __init__(self, profiler):
+        super().__init__()
+        self.profiler = profiler
+
+    def append(self, context):
+        super().append(context)
+        self.profiler.enter(context['function_name'])
+
+    def pop(self, *args):
+        context = super().pop(*args)
+        self.profiler.leave()
+        return context
+
+class CallProfiler:
+    """Perfil por función: llamadas, tiempo inclusivo y exclusivo,
+    profundidad máxima de recursión y aristas llamador -> llamado.
+
+    Se mide en las fronteras de llamada (GOSUB, ENDFUNC y RETURN) a través de
+    vm.call_stack, así que la VM corre con su ciclo normal. Funciona con la VM
+    base y con el backend de closures; el backend de Python no usa call_stack."""
+    counts_quads = False
+
+    def __init__(self):
+        self.functions = {}
+        self.edges = {}
+        self.total_time = 0.0
+
+    def start(self, vm):
+        self.functions = {}
+        self.edges = {}
+        self.active = Counter()
+        # Activaciones abiertas: [función, inicio, tiempo de sus llamados]
+        self.frames = []
+        self.clock = time.perf_counter
+        vm.call_stack = _ObservedCallStack(self)
+        self.started_at = self.clock()
+        self.enter('main')
+
+    def stop(self):
+        while self.frames:
+            self.leave()
+        self.total_time = self.clock() - self.started_at
+
+    def _stats(self, name):
+        stats = self.functions.get(name)
+        if stats is None:
+            stats = {'calls': 0, 'inclusive': 0.0, 'exclusive': 0.0, 'max_depth': 0}
+            self.functions[name] = stats
+        return stats
+
+    def enter(self, name):
+        stats = self._stats(name)
+        stats['calls'] += 1
+        self.active[name] += 1
+        if self.active[name] > stats['max_depth']:
+            stats['max_depth'] = self.active[name]
+        if self.frames:
+            edge = self.edges.setdefault((self.frames[-1][0], name), {'calls': 0, 'time': 0.0})
+            edge['calls'] += 1
+        self.frames.append([name, self.clock(), 0.0])
+
+    def leave(self):
+        name, started, children = self.frames.pop()
+        elapsed = self.clock() - started
+        stats = self.functions[name]
+        stats['exclusive'] += elapsed - children
+        self.active[name] -= 1
+        # En recursión solo la activación más externa suma tiempo inclusivo
+        # (también en la arista, para no contar varias veces el mismo tiempo)
+        outermost = self.active[name] == 0
+        if outermost:
+            stats['inclusive'] += elapsed
+        if self.frames:
+            caller = self.frames[-1]
+            caller[2] += elapsed
+            if outermost:
+                self.edges[(caller[0], name)]['time'] += elapsed
+
+    def to_dict(self):
+        functions = dict(sorted(self.functions.items(), key=lambda item: item[1]['inclusive'],
+                                reverse=True))
+        edges = [{'caller': caller, 'callee': callee, 'calls': edge['calls'], 'time': edge['time']}
+                 for (caller, callee), edge in self.edges.items()]
+        return {'total_time': self.total_time, 'functions': functions, 'edges': edges}
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def write_callgrind(self, path):
+        """Archivo para KCachegrind/QCachegrind (costo en microsegundos)"""
+        lines = ["# callgrind format", "version: 1", "creator: CompiladoresElda profiler",
+                 "positions: line", "events: Microseconds", ""]
+        for name, stats in self.functions.items():
+            lines.append(f"fn={name}")
+            lines.append(f"0 {round(stats['exclusive'] * 1e6)}")
+            for (caller, callee), edge in self.edges.items():
+                if caller == name:
+                    lines.append(f"cfn={callee}")
+                    lines.append(f"calls={edge['calls']} 0")
+                    lines.append(f"0 {round(edge['time'] * 1e6)}")
+            lines.append("")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines))
+
+    def report(self, limit=15):
+        total = self.total_time or 1.0
+        width = max([len('función')] + [len(name) for name in self.functions])
+        lines = ["=== PERFIL POR FUNCIÓN ===", f"Tiempo total: {self.total_time:.4f} s", "",
+                 f"{'función':>{width}} {'llamadas':>9} {'inclusivo s':>12} {'%':>6} "
+                 f"{'exclusivo s':>12} {'%':>6} {'prof.':>6}"]
+        for name, stats in list(self.to_dict()['functions'].items())[:limit]:
+            lines.append(f"{name:>{width}} {stats['calls']:>9} {stats['inclusive']:>12.4f} "
+                         f"{stats['inclusive'] / total:>6.1%} {stats['exclusive']:>12.4f} "
+                         f"{stats['exclusive'] / total:>6.1%} {stats['max_depth']:>6}")
+        lines += ["", "Llamadas (llamador -> llamado):"]
+        edges = sorted(self.edges.items(), key=lambda item: item[1]['calls'], reverse=True)
+        for (caller, callee), edge in edges[:limit]:
+            lines.append(f"  {caller} -> {callee}: {edge['calls']} llamadas, {edge['time']:.4f} s")
+        return "\n".join(lines)
+
+def main():
+    import argparse
+    import io
+    from contextlib import redirect_stdout
+    from yacc import execute_program
+    from virtual_machine import VERBOSITY_SILENT
+    parser = argparse.ArgumentParser(description="Perfila un programa en la máquina virtual")
+    parser.add_argument("programa", help="archivo con el código fuente")
+    parser.add_argument("--json", help="guardar el perfil en este archivo JSON")
+    parser.add_argument("--limit", type=int, default=15, help="renglones por tabla")
+    parser.add_argument("--optimize", action="store_true")
+    parser.add_argument("--sample", type=float, metavar="MS",
+                        help="perfilar por muestreo cada MS milisegundos en lugar de por cuádruplo")
+    parser.add_argument("--collapsed", help="guardar las pilas colapsadas (con --sample)")
+    parser.add_argument("--calls", action="store_true",
+                        help="perfilar por función (llamadas, tiempo inclusivo/exclusivo)")
+    parser.add_argument("--callgrind", help="guardar el perfil por función para KCachegrind (con --calls)")
+    args = parser.parse_args()
+    if args.calls:
+        profiler = CallProfiler()
+    elif args.sample:
+        profiler = SamplingProfiler(args.sample / 1000)
+    else:
+        profiler = QuadProfiler()
+    with open(args.programa, 'r', encoding='utf-8') as f:
+        code = f.read()
+    # El compilador todavía imprime su bitácora: solo se muestra si hay errores
+    compiler_output = io.StringIO()
+    with redirect_stdout(compiler_output):
+        vm = execute_program(code, verbosity=VERBOSITY_SILENT, optimize=args.optimize,
+                             profiler=profiler)
+    if vm is None:
+        print(compiler_output.getvalue())
+        return
+    print(vm.profiler.report(args.limit))
+    if args.collapsed and args.sample:
+        vm.profiler.write_collapsed(args.collapsed)
+        print(f"\nPilas colapsadas guardadas en {args.collapsed}")
+    if args.callgrind and args.calls:
+        vm.profiler.write_callgrind(args.callgrind)
+        print(f"\nPerfil callgrind guardado en {args.callgrind}")
+    if args.json and hasattr(vm.profiler, 'write_json'):
+        vm.profiler.write_json(args.json)
+        print(f"\nPerfil guardado en {args.json}")
+
+if __name__ == "__main__":
+    main()
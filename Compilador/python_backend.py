@@ -0,0 +1,432 @@
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+from virtual_machine import VirtualMachine, ExecutionMemory, SEGMENTS, MEMO_MISS
+from opcodes import (OP_PLUS, OP_MINUS, OP_MULTIPLY, OP_DIVIDE, OP_GREATER, OP_LESS,
+                     OP_NOT_EQUAL, OP_ASSIGN, OP_GOTO, OP_GOTOF, OP_PRINT, OP_ERA,
+                     OP_PARAM, OP_GOSUB, OP_ENDFUNC, OP_RETURN, OP_END, OP_GOTOF_GREATER,
+                     OP_GOTOF_LESS, OP_GOTOF_NOT_EQUAL, OP_NEGATE, OP_TAILCALL, BASE_OPCODES,
+                     get_opcode)
+
+# Backend que traduce el programa de cuádruplos a código fuente de Python.
+# Cada función del programa se vuelve una función de Python, sus locales y
+# temporales son variables locales de Python, los globales son variables del
+# módulo generado y las constantes se escriben como literales. Los saltos se
+# resuelven con una máquina de estados por bloques básicos.
+
+GLOBAL_SEGMENTS = (0, 1)
+CONSTANT_SEGMENTS = (7, 8)
+
+SYMBOLS = {
+    OP_PLUS: '+', OP_MINUS: '-', OP_MULTIPLY: '*', OP_DIVIDE: '/',
+    OP_GREATER: '>', OP_LESS: '<', OP_NOT_EQUAL: '!=',
+}
+COMPARISONS = (OP_GREATER, OP_LESS, OP_NOT_EQUAL)
+# Superinstrucciones de comparación + gotof -> operador de la comparación
+COMPARE_AND_BRANCH = {OP_GOTOF_GREATER: '>', OP_GOTOF_LESS: '<', OP_GOTOF_NOT_EQUAL: '!='}
+JUMPS = (OP_GOTO, OP_GOTOF) + tuple(COMPARE_AND_BRANCH)
+# Cuádruplos después de los cuales no se sigue al siguiente
+TERMINATORS = (OP_RETURN, OP_ENDFUNC, OP_END, OP_TAILCALL)
+
+# Las funciones del programa son funciones de Python, así que la recursión
+# del programa es recursión de Python. El código generado corre en un hilo con
+# esta pila y este límite de recursión; las funciones memorizadas gastan pila
+# de C en cada nivel y el límite deja margen para que no se desborde. Si el
+# programa pasa del límite se ejecuta con el intérprete de cuádruplos, que
+# guarda los registros en el heap como el backend de closures.
+RECURSION_LIMIT = 1_000_000
+THREAD_STACK_SIZE = 512 * 1024 * 1024
+
+# El límite de recursión y el tamaño de pila de los hilos nuevos son de todo
+# el proceso: la primera ejecución que empieza los sube y la última que
+# termina regresa los valores originales
+_deep_stack_lock = threading.Lock()
+_deep_stack_runs = 0
+_saved_recursion_limit = None
+_saved_stack_size = None
+
+# Código objeto ya compilado por hash del código fuente generado, con política
+# LRU para que un proceso largo no acumule todos los programas que ejecutó
+CODE_CACHE_SIZE = 64
+_code_cache = OrderedDict()
+_code_cache_lock = threading.Lock()
+
+def _kind(segment):
+    """Tipo de Python que guarda un segmento: int, float o bool"""
+    return type(SEGMENTS[segment][1])
+
+def _coerce(expression, source_kind, target_kind):
+    """Envuelve una expresión con la conversión que haría set_value"""
+    if source_kind is target_kind or target_kind is bool:
+        return expression
+    if target_kind is int:
+        return f"int({expression})"
+    return f"float({expression})"
+
+class _FunctionTranslator:
+    """Traduce el rango de cuádruplos de una función a una función de Python"""
+    def __init__(self, program, name, start, end):
+        self.program = program
+        self.name = name
+        self.start = start
+        self.end = end
+        self.arg_counter = 0
+        self.pending_calls = []
+
+    def operand(self, address):
+        """(expresión de Python, tipo) de una dirección virtual"""
+        segment, _ = self.program.memory.resolve(address)
+        kind = _kind(segment)
+        if segment in CONSTANT_SEGMENTS:
+            return repr(kind(self.program.constant_values.get(address, 0))), kind
+        if segment in GLOBAL_SEGMENTS:
+            self.program.used_globals.add(address)
+            return f"g{address}", kind
+        self.frame_addresses.add(address)
+        return f"m{address}", kind
+
+    def target(self, address):
+        """(nombre de variable, tipo) donde se guarda un resultado"""
+        return self.operand(address)
+
+    def translate(self):
+        code = self.program.code
+        func_info = self.program.function_directory[self.name]
+        self.frame_addresses = set()
+        self.return_kind = {'INT': int, 'FLOAT': float}.get(func_info.return_type.name)
+        params = [f"m{address}" for address in func_info.param_addresses]
+        self.frame_addresses.update(func_info.param_addresses)
+
+        leaders = {self.start}
+        for index in range(self.start, self.end):
+            opcode, _, _, result = code[index]
+            if opcode in JUMPS:
+                leaders.add(result)
+                leaders.add(index + 1)
+            elif opcode in TERMINATORS:
+                leaders.add(index + 1)
+        leaders = sorted(leader for leader in leaders if self.start <= leader < self.end)
+        # Una llamada de cola a sí misma se vuelve un ciclo: se reasignan los
+        # parámetros y se reinicia el cuerpo con un registro limpio
+        self.self_tail_call = any(code[index][0] == OP_TAILCALL and code[index][1] == self.name
+                                  for index in range(self.start, self.end))
+        self.params = params
+
+        body = []
+        if len(leaders) == 1 and not self.self_tail_call:
+            for index in range(self.start, self.end):
+                body.extend(self.quad(index, "    "))
+            if code[self.end - 1][0] not in TERMINATORS:
+                body.extend(self.fall_off("    "))
+        else:
+            body.append(f"    _b = {self.start}")
+            body.append("    while True:")
+            for position, leader in enumerate(leaders):
+                block_end = leaders[position + 1] if position + 1 < len(leaders) else self.end
+                keyword = "if" if position == 0 else "elif"
+                body.append(f"        {keyword} _b == {leader}:")
+                for index in range(leader, block_end):
+                    body.extend(self.quad(index, "            "))
+                last_opcode = code[block_end - 1][0]
+                if last_opcode != OP_GOTO and last_opcode not in TERMINATORS:
+                    if block_end < self.end:
+                        body.append(f"            _b = {block_end}")
+                        body.append("            continue")
+                    else:
+                        body.extend(self.fall_off("            "))
+            body.append("        else:")
+            body.extend(self.fall_off("            "))
+
+        setup = []
+        for address in sorted(self.frame_addresses - set(func_info.param_addresses)):
+            segment, _ = self.program.memory.resolve(address)
+            setup.append(f"    m{address} = {SEGMENTS[segment][1]!r}")
+        lines = [f"def f_{self.name}({', '.join(params)}):"]
+        if self.self_tail_call:
+            lines.append("    while True:")
+            lines.extend("    " + line for line in setup + body)
+        else:
+            lines.extend(setup + body)
+        return lines
+
+    def fall_off(self, indent):
+        """Salir de la función sin RETURN explícito. En funciones con valor el
+        compilador rechaza los caminos que llegan aquí (check_missing_return),
+        así que solo se usa en funciones void y en código inalcanzable"""
+        if self.return_kind is None:
+            return [f"{indent}return None"]
+        return [f"{indent}return {self.return_kind(0)!r}"]
+
+    def jump(self, target, indent):
+        if self.start <= target < self.end:
+            return [f"{indent}_b = {target}", f"{indent}continue"]
+        return self.fall_off(indent)
+
+    def quad(self, index, indent):
+        opcode, left, right, result = self.program.code[index]
+        # Las operaciones tipadas generan el mismo código: _coerce no agrega
+        # conversiones cuando los tipos ya coinciden
+        opcode = BASE_OPCODES.get(opcode, opcode)
+        if opcode in SYMBOLS:
+            left_expr, left_kind = self.operand(left)
+            right_expr, right_kind = self.operand(right)
+            target, target_kind = self.target(result)
+            symbol = SYMBOLS[opcode]
+            if opcode in COMPARISONS:
+                return [f"{indent}{target} = {left_expr} {symbol} {right_expr}"]
+            if opcode == OP_DIVIDE:
+                zero = repr(target_kind(0))
+                quotient = _coerce(f"{left_expr} / {right_expr}", float, target_kind)
+                return [f"{indent}{target} = {quotient} if {right_expr} != 0 else {zero}"]
+            kind = int if left_kind is int and right_kind is int else float
+            expression = _coerce(f"{left_expr} {symbol} {right_expr}", kind, target_kind)
+            return [f"{indent}{target} = {expression}"]
+        if opcode == OP_ASSIGN:
+            source, source_kind = self.operand(left)
+            target, target_kind = self.target(result)
+            return [f"{indent}{target} = {_coerce(source, source_kind, target_kind)}"]
+        if opcode == OP_GOTO:
+            return self.jump(result, indent)
+        if opcode == OP_GOTOF:
+            condition, _ = self.operand(left)
+            return [f"{indent}if not {condition}:"] + self.jump(result, indent + "    ")
+        if opcode in COMPARE_AND_BRANCH:
+            left_expr, _ = self.operand(left)
+            right_expr, _ = self.operand(right)
+            condition = f"{left_expr} {COMPARE_AND_BRANCH[opcode]} {right_expr}"
+            return [f"{indent}if not ({condition}):"] + self.jump(result, indent + "    ")
+        if opcode == OP_NEGATE:
+            source, source_kind = self.operand(left)
+            target, target_kind = self.target(result)
+            return [f"{indent}{target} = {_coerce(f'-{source}', source_kind, target_kind)}"]
+        if opcode == OP_PRINT:
+            if isinstance(left, str):
+                return [f"{indent}_out({left!r})"]
+            value, _ = self.operand(left)
+            return [f"{indent}_out(str({value}))"]
+        if opcode == OP_ERA:
+            self.pending_calls.append((left, []))
+            return []
+        if opcode == OP_PARAM:
+            callee, args = self.pending_calls[-1]
+            param_addresses = self.program.function_directory[callee].param_addresses
+            value, kind = self.operand(left)
+            if len(args) < len(param_addresses):
+                segment, _ = self.program.memory.resolve(param_addresses[len(args)])
+                value = _coerce(value, kind, _kind(segment))
+            name = f"_a{self.arg_counter}"
+            self.arg_counter += 1
+            args.append(name)
+            return [f"{indent}{name} = {value}"]
+        if opcode == OP_GOSUB:
+            callee, args = self.pending_calls.pop()
+            callee_info = self.program.function_directory[callee]
+            args = args[:len(callee_info.param_addresses)]
+            call = f"f_{callee}({', '.join(args)})"
+            if result:
+                target, _ = self.target(result)
+                return [f"{indent}{target} = {call}"]
+            return [f"{indent}{call}"]
+        if opcode == OP_TAILCALL:
+            # Python no reutiliza marcos, pero el resultado es el mismo que GOSUB + RETURN
+            callee, args = self.pending_calls.pop()
+            callee_info = self.program.function_directory[callee]
+            args = args[:len(callee_info.param_addresses)]
+            if callee == self.name:
+                # Los argumentos ya están en _aN: reasignar y reiniciar el cuerpo
+                lines = [f"{indent}{param} = {arg}" for param, arg in zip(self.params, args)]
+                return lines + [f"{indent}break"]
+            call = f"f_{callee}({', '.join(args)})"
+            if result:
+                return [f"{indent}return {call}"]
+            return [f"{indent}{call}"] + self.fall_off(indent)
+        if opcode == OP_RETURN:
+            if left is None:
+                return self.fall_off(indent)
+            value, kind = self.operand(left)
+            if self.return_kind is not None:
+                value = _coerce(value, kind, self.return_kind)
+            return [f"{indent}return {value}"]
+        if opcode in (OP_ENDFUNC, OP_END):
+            return self.fall_off(indent)
+        return []
+
+class _ProgramTranslator:
+    """Traduce un programa completo a partir de get_execution_data()"""
+    def __init__(self, execution_data):
+        self.code = [(get_opcode(quad.operator), quad.left_operand, quad.right_operand, quad.result)
+                     for quad in execution_data['quadruples']]
+        self.function_directory = execution_data['function_directory']
+        self.memory = ExecutionMemory({})
+        self.constant_values = execution_data['constants_table']
+        self.used_globals = set()
+
+    def function_ranges(self):
+        starts = sorted((info.start_address, name) for name, info in self.function_directory.items()
+                        if info.start_address is not None)
+        for index, (start, name) in enumerate(starts):
+            end = starts[index + 1][0] if index + 1 < len(starts) else len(self.code)
+            yield name, start, end
+
+    def translate(self):
+        ranges = list(self.function_ranges())
+        functions = [_FunctionTranslator(self, name, start, end).translate()
+                     for name, start, end in ranges]
+        # Los globales se conocen hasta traducir todas las funciones
+        global_names = [f"g{address}" for address in sorted(self.used_globals)]
+        declaration = f"    global {', '.join(global_names)}"
+
+        lines = ["# Código generado por python_backend a partir de los cuádruplos", ""]
+        for function in functions:
+            lines.append(function[0])
+            if global_names:
+                lines.append(declaration)
+            lines.extend(function[1:])
+            lines.append("")
+        # Funciones puras con valor: _memo las envuelve con la memorización de la VM
+        for name, _, _ in ranges:
+            func_info = self.function_directory[name]
+            if func_info.is_pure and func_info.return_type.name in ('INT', 'FLOAT'):
+                lines.append(f"f_{name} = _memo(f_{name}, {name!r})")
+        lines.append("")
+        lines.append("def run():")
+        if global_names:
+            lines.append(declaration)
+            for address in sorted(self.used_globals):
+                segment, _ = self.memory.resolve(address)
+                lines.append(f"    g{address} = {SEGMENTS[segment][1]!r}")
+        if 'main' in self.function_directory:
+            lines.append("    f_main()")
+        else:
+            lines.append("    pass")
+        lines.append("")
+        return "\n".join(lines)
+
+def translate(execution_data):
+    """Genera el código fuente de Python equivalente a un programa compilado"""
+    return _ProgramTranslator(execution_data).translate()
+
+def compile_source(source):
+    """Compila (una sola vez por código fuente) el módulo generado"""
+    key = hashlib.sha256(source.encode('utf-8')).hexdigest()
+    with _code_cache_lock:
+        code_object = _code_cache.get(key)
+        if code_object is not None:
+            _code_cache.move_to_end(key)
+            return code_object
+    code_object = compile(source, f"<python_backend {key[:12]}>", "exec")
+    with _code_cache_lock:
+        _code_cache[key] = code_object
+        _code_cache.move_to_end(key)
+        if len(_code_cache) > CODE_CACHE_SIZE:
+            _code_cache.popitem(last=False)
+    return code_object
+
+def _enter_deep_stack():
+    """Sube el límite de recursión y la pila de los hilos nuevos si es la
+    primera ejecución activa"""
+    global _deep_stack_runs, _saved_recursion_limit, _saved_stack_size
+    with _deep_stack_lock:
+        if _deep_stack_runs == 0:
+            _saved_recursion_limit = sys.getrecursionlimit()
+            _saved_stack_size = threading.stack_size(THREAD_STACK_SIZE)
+            sys.setrecursionlimit(max(_saved_recursion_limit, RECURSION_LIMIT))
+        _deep_stack_runs += 1
+
+def _leave_deep_stack():
+    """Regresa los valores originales cuando termina la última ejecución activa"""
+    global _deep_stack_runs
+    with _deep_stack_lock:
+        _deep_stack_runs -= 1
+        if _deep_stack_runs == 0:
+            threading.stack_size(_saved_stack_size)
+            sys.setrecursionlimit(_saved_recursion_limit)
+
+def call_with_deep_stack(function):
+    """Llama a function en un hilo con pila grande y límite de recursión alto.
+    Regresa su resultado o vuelve a lanzar su excepción en el hilo que llama."""
+    outcome = {}
+    def target():
+        try:
+            outcome['value'] = function()
+        except BaseException as error:
+            outcome['error'] = error
+    _enter_deep_stack()
+    try:
+        worker = threading.Thread(target=target, name="python-backend")
+        worker.start()
+        worker.join()
+    finally:
+        _leave_deep_stack()
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome.get('value')
+
+class PythonVirtualMachine(VirtualMachine):
+    """Ejecuta el programa traducido a Python en lugar de interpretar cuádruplos.
+    La traza completa (VERBOSITY_TRACE) usa el intérprete de la clase base."""
+    tracks_instruction_pointer = False
+
+    def __init__(self, quadruples, constants_table, function_directory, memory_sizes=None, **options):
+        super().__init__(quadruples, constants_table, function_directory, memory_sizes, **options)
+        self.source = translate({
+            'quadruples': quadruples,
+            'constants_table': constants_table,
+            'function_directory': function_directory,
+            'memory_sizes': memory_sizes,
+        })
+        self.code_object = compile_source(self.source)
+
+    def _memoizer(self, function, name):
+        """Envuelve una función pura generada con la MemoCache de la VM"""
+        memo = self.memo
+        if memo is None:
+            return function
+        def memoized(*args):
+            key = (name,) + args
+            value = memo.lookup(key)
+            if value is MEMO_MISS:
+                value = function(*args)
+                memo.store(key, value)
+            return value
+        return memoized
+
+    def _run(self):
+        """Ejecuta el código generado y copia los globales a la memoria"""
+        outputs = self.program_outputs
+        if self.echo_outputs:
+            def emit(value):
+                outputs.append(value)
+                print(f"OUTPUT: {value}")
+        else:
+            emit = outputs.append
+        namespace = {'_out': emit, '_memo': self._memoizer}
+        exec(self.code_object, namespace)
+        try:
+            call_with_deep_stack(namespace['run'])
+        except RecursionError:
+            self._run_interpreted(len(outputs))
+            return
+        for name, value in namespace.items():
+            if name.startswith('g') and name[1:].isdigit():
+                self.memory.set_value(int(name[1:]), value)
+        self.instruction_pointer = len(self.code)
+
+    def _run_interpreted(self, already_printed):
+        """Vuelve a ejecutar el programa desde el principio con el intérprete
+        de la clase base. El código generado no escribió en la memoria de la
+        VM; las salidas que ya imprimió no se repiten."""
+        echo = self.echo_outputs
+        self.echo_outputs = False
+        self.program_outputs = []
+        if self.memo is not None:
+            self.memo.clear()
+        try:
+            VirtualMachine._run(self)
+        finally:
+            self.echo_outputs = echo
+        if echo:
+            for value in self.program_outputs[already_printed:]:
+                print(f"OUTPUT: {value}")
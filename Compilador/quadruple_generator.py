@@ -1,4 +1,10 @@
+from array import array
+
 from semantic_cube import Type, Operation, get_result_type
+from opcodes import typed_operator, base_operator, get_opcode, OPCODE_NAMES, OP_UNKNOWN
+
+# Letra de cada tipo numérico en el nombre de los operadores tipados
+TYPE_KINDS = {Type.INT: 'I', Type.FLOAT: 'F'}
 
 class Quadruple:
     def __init__(self, operator, left_operand, right_operand, result):
@@ -10,6 +16,136 @@ class Quadruple:
     def __str__(self):
         return f"({self.operator}, {self.left_operand}, {self.right_operand}, {self.result})"
 
+# Codificación de operandos en las columnas int32 de QuadrupleArrays: los
+# enteros (direcciones, índices de salto) se guardan tal cual, None es el
+# mínimo int32 y las cadenas (nombres de función, 'par1', textos de print)
+# son índices a la tabla de cadenas contados hacia abajo desde STRING_BASE.
+NONE_OPERAND = -2 ** 31
+STRING_BASE = -2 ** 30
+
+class QuadrupleArrays:
+    """Lista de cuádruplos guardada por columnas: código de operación,
+    operando izquierdo, derecho y resultado en arreglos array('i') paralelos,
+    con las cadenas en una tabla aparte. Se usa como una lista de Quadruple:
+    append() recibe un Quadruple e indexar regresa un QuadrupleRef cuyos
+    cambios se escriben en las columnas."""
+    def __init__(self, quadruples=()):
+        self.opcodes = array('i')
+        self.lefts = array('i')
+        self.rights = array('i')
+        self.results = array('i')
+        self.strings = []
+        self.string_index = {}
+        for quad in quadruples:
+            self.append(quad)
+    
+    def encode_operand(self, operand):
+        if operand is None:
+            return NONE_OPERAND
+        if isinstance(operand, str):
+            index = self.string_index.get(operand)
+            if index is None:
+                index = self.string_index[operand] = len(self.strings)
+                self.strings.append(operand)
+            return STRING_BASE - index
+        if not isinstance(operand, int) or operand <= STRING_BASE:
+            raise ValueError(f"Operando no representable en un cuádruplo: {operand!r}")
+        return operand
+    
+    def decode_operand(self, value):
+        if value > STRING_BASE:
+            return value
+        if value == NONE_OPERAND:
+            return None
+        return self.strings[STRING_BASE - value]
+    
+    @staticmethod
+    def encode_operator(operator):
+        opcode = get_opcode(operator)
+        if opcode == OP_UNKNOWN:
+            raise ValueError(f"Operador sin código de operación: {operator}")
+        return opcode
+    
+    def append(self, quad):
+        self.opcodes.append(self.encode_operator(quad.operator))
+        self.lefts.append(self.encode_operand(quad.left_operand))
+        self.rights.append(self.encode_operand(quad.right_operand))
+        self.results.append(self.encode_operand(quad.result))
+    
+    def __len__(self):
+        return len(self.opcodes)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [QuadrupleRef(self, position) for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("índice de cuádruplo fuera de rango")
+        return QuadrupleRef(self, index)
+    
+    def __iter__(self):
+        for index in range(len(self)):
+            yield QuadrupleRef(self, index)
+    
+    def set_result(self, index, result):
+        self.results[index] = self.encode_operand(result)
+    
+    def decode(self):
+        """[(código, izq, der, resultado)] para la máquina virtual"""
+        decode = self.decode_operand
+        return [(opcode, decode(left), decode(right), decode(result))
+                for opcode, left, right, result
+                in zip(self.opcodes, self.lefts, self.rights, self.results)]
+    
+    def nbytes(self):
+        """Bytes que ocupan las columnas"""
+        return sum(column.itemsize * len(column)
+                   for column in (self.opcodes, self.lefts, self.rights, self.results))
+
+class QuadrupleRef:
+    """Un cuádruplo dentro de QuadrupleArrays con la interfaz de Quadruple"""
+    __slots__ = ('table', 'index')
+    
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+    
+    @property
+    def operator(self):
+        return OPCODE_NAMES[self.table.opcodes[self.index]]
+    
+    @operator.setter
+    def operator(self, operator):
+        self.table.opcodes[self.index] = self.table.encode_operator(operator)
+    
+    @property
+    def left_operand(self):
+        return self.table.decode_operand(self.table.lefts[self.index])
+    
+    @left_operand.setter
+    def left_operand(self, operand):
+        self.table.lefts[self.index] = self.table.encode_operand(operand)
+    
+    @property
+    def right_operand(self):
+        return self.table.decode_operand(self.table.rights[self.index])
+    
+    @right_operand.setter
+    def right_operand(self, operand):
+        self.table.rights[self.index] = self.table.encode_operand(operand)
+    
+    @property
+    def result(self):
+        return self.table.decode_operand(self.table.results[self.index])
+    
+    @result.setter
+    def result(self, result):
+        self.table.results[self.index] = self.table.encode_operand(result)
+    
+    def __str__(self):
+        return f"({self.operator}, {self.left_operand}, {self.right_operand}, {self.result})"
+
 class QuadrupleGenerator:
     def __init__(self, semantic_analyzer):
         self.semantic = semantic_analyzer
@@ -17,13 +153,14 @@ class QuadrupleGenerator:
         self.POper = []  
         self.PTypes = []  
         self.PJumps = []  
-        self.Quads = []  
+        self.Quads = QuadrupleArrays()
         self.temp_counter = 0
         self.quad_counter = 0
         self.false_bottom = '('  
-        self.constants_table = {}  
+        self.constants_table = {}   # dirección -> valor de cada constante
         self.param_counter = 0
         self.main_goto_index = None 
+        self.listing = None         # líneas que imprimió print_quads
         
     def new_temp(self, temp_type):
         "Generar una variable temporal"
@@ -57,7 +194,9 @@ class QuadrupleGenerator:
                 result = self.new_temp(result_type)
                 left_address = self.get_operand_address(left_operand)
                 right_address = self.get_operand_address(right_operand)          
-                quad = Quadruple(operator, left_address, right_address, result)
+                # El cubo ya conoce los tipos: la VM no tiene que convertir el resultado
+                typed = typed_operator(operator, TYPE_KINDS.get(left_type), TYPE_KINDS.get(right_type))
+                quad = Quadruple(typed or operator, left_address, right_address, result)
                 self.Quads.append(quad)
                 self.quad_counter += 1
                 self.PilaO.append(result)
@@ -68,25 +207,19 @@ class QuadrupleGenerator:
                 return False
             
     def get_operand_address(self, operand):
-        "Genera la dirección de memoria de un operando"
+        "Dirección de memoria de un operando: dirección ya resuelta o nombre de variable (-1 si no existe)"
         if isinstance(operand, int):
             return operand
-        if self.semantic.current_scope != "global" and operand in self.semantic.function_directory[self.semantic.current_scope].local_vars:
-            return self.semantic.function_directory[self.semantic.current_scope].local_vars[operand].address
-        if operand in self.semantic.global_vars:
-            return self.semantic.global_vars[operand].address
-        try:
-            if '.' in str(operand):
-                value = float(operand)
-            else:
-                value = int(operand)
-            if value not in self.constants_table:
-                address = self.semantic.memory_manager.get_constant_address(value)
-                self.constants_table[value] = address
-            return self.constants_table[value]
-        except ValueError:
-            pass
+        variable = self.semantic.lookup_variable(operand)
+        if variable is not None:
+            return variable.address
         return -1
+    
+    def constant_address(self, value):
+        "Dirección de una constante numérica; la registra en la tabla de constantes la primera vez"
+        address = self.semantic.memory_manager.get_constant_address(value)
+        self.constants_table[address] = value
+        return address
        
     def process_operator(self, operator):
         self.POper.append(operator)
@@ -142,7 +275,7 @@ class QuadrupleGenerator:
         
     def fill_quad(self, quad_index, jump_target):
         if 0 <= quad_index < len(self.Quads):
-            self.Quads[quad_index].result = jump_target
+            self.Quads.set_result(quad_index, jump_target)
             return True
         return False
             
@@ -160,16 +293,15 @@ class QuadrupleGenerator:
             for var_name, var in self.semantic.function_directory[self.semantic.current_scope].local_vars.items():
                 if var.address == address:
                     return f"{var_name} (local en {self.semantic.current_scope})"
-        for value, addr in self.constants_table.items():
-            if addr == address:
-                return f"constante({value})"
+        if address in self.constants_table:
+            return f"constante({self.constants_table[address]})"
         if isinstance(address, str) and address.startswith('t'):
             return f"temp {address}"
         
         return f"dir:{address}"
     
     def _get_quad_explanation(self, quad):
-        op = quad.operator
+        op = base_operator(quad.operator)
         left = quad.left_operand
         right = quad.right_operand
         result = quad.result
@@ -205,41 +337,49 @@ class QuadrupleGenerator:
                 return f"realizar operación {op} con operandos {left_name}, {right_name}, resultado en {result_name}"
                 
     def print_quads(self):
-        print("\n===== CUÁDRUPLOS CON DIRECCIONES DE MEMORIA =====")
-        print("ÍNDICE: (OPERADOR, OPERANDO_IZQ, OPERANDO_DER, RESULTADO)")
-        print("        EXPLICACIÓN")
-        print("-" * 70)
-        self._print_function_info()
+        self.listing = self.quad_listing()
+        print("\n".join(self.listing))
+
+    def quad_listing(self):
+        """Líneas del listado que imprime print_quads: el directorio de
+        funciones y los cuádruplos separados por función"""
+        lines = ["\n===== CUÁDRUPLOS CON DIRECCIONES DE MEMORIA =====",
+                 "ÍNDICE: (OPERADOR, OPERANDO_IZQ, OPERANDO_DER, RESULTADO)",
+                 "        EXPLICACIÓN",
+                 "-" * 70]
+        lines.extend(self._function_info_lines())
+        # Función que empieza en cada índice (la primera del directorio si se repite)
+        function_starts = {}
+        for func_name, func_info in self.semantic.function_directory.items():
+            start_address = getattr(func_info, 'start_address', None)
+            if start_address is not None:
+                function_starts.setdefault(start_address, func_name)
         current_function = None
         for i, quad in enumerate(self.Quads):
-            function_name = self._get_function_at_quad(i)
+            function_name = function_starts.get(i)
             if function_name and function_name != current_function:
                 current_function = function_name
-                print(f"\n{'='*20} FUNCIÓN: {function_name} {'='*20}")
-                print(f"Inicia en el cuádruplo {i}")
-                print("-" * 70)
-            print(f"{i}: {quad}")
+                lines.append(f"\n{'='*20} FUNCIÓN: {function_name} {'='*20}")
+                lines.append(f"Inicia en el cuádruplo {i}")
+                lines.append("-" * 70)
+            lines.append(f"{i}: {quad}")
             # explanation = self._get_quad_explanation(quad)
             # print(f"        {explanation}")
             if quad.operator == 'ENDFUNC':
-                print(f"{'='*20} FIN DE {current_function} {'='*20}")
+                lines.append(f"{'='*20} FIN DE {current_function} {'='*20}")
                 current_function = None 
-            print("-" * 70)
+            lines.append("-" * 70)
+        return lines
         
-    def _print_function_info(self):
-        """Imprime información sobre las funciones y sus direcciones de inicio"""
-        print("\n===== DIRECTORIO DE FUNCIONES =====")
+    def _function_info_lines(self):
+        """Información sobre las funciones y sus direcciones de inicio"""
+        lines = ["\n===== DIRECTORIO DE FUNCIONES ====="]
         for func_name, func_info in self.semantic.function_directory.items():
             start_addr = getattr(func_info, 'start_address', 'No establecida')
-            print(f"Función: {func_name} - Dirección de Inicio: {start_addr}")
-        print("-" * 70)
+            lines.append(f"Función: {func_name} - Dirección de Inicio: {start_addr}")
+        lines.append("-" * 70)
+        return lines
     
-    def _get_function_at_quad(self, quad_index):
-        """Determina qué función está ejecutándose en el cuádruplo dado"""
-        for func_name, func_info in self.semantic.function_directory.items():
-            if hasattr(func_info, 'start_address') and func_info.start_address == quad_index:
-                return func_name
-        return None
        
     def generate_era_quad(self, func_name):
         """Genera cuádruplo ERA para reservar espacio de función"""
@@ -272,6 +412,8 @@ class QuadrupleGenerator:
 
     def generate_endfunc_quad(self):
         """Genera cuádruplo ENDFUNC para terminar función"""
+        self.check_missing_return()
+        self.mark_void_tail_calls()
         quad = Quadruple('ENDFUNC', None, None, None)
         self.Quads.append(quad)
         self.quad_counter += 1
@@ -293,6 +435,72 @@ class QuadrupleGenerator:
         self.quad_counter += 1
         return True
 
+    def _tail_call_function(self):
+        """Función que se está compilando si puede tener llamadas de cola"""
+        scope = self.semantic.current_scope
+        if scope == "main":
+            return None
+        return self.semantic.function_directory.get(scope)
+
+    def generate_tail_call(self, return_value):
+        """Convierte el GOSUB recién generado en TAILCALL si su resultado es lo
+        que regresa la función (return f(...)). Regresa True si lo hizo."""
+        func_info = self._tail_call_function()
+        if not self.Quads or func_info is None:
+            return False
+        quad = self.Quads[-1]
+        if quad.operator != 'GOSUB' or quad.result != return_value:
+            return False
+        callee_info = self.semantic.function_directory.get(quad.left_operand)
+        # El tipo debe coincidir para no saltarse una conversión del valor
+        if callee_info is None or callee_info.return_type != func_info.return_type:
+            return False
+        quad.operator = 'TAILCALL'
+        return True
+
+    def mark_void_tail_calls(self):
+        """Al cerrar una función: las llamadas void seguidas del ENDFUNC (directo
+        o con un goto hacia él, como al final de un if) están en posición de cola"""
+        func_info = self._tail_call_function()
+        if func_info is None or func_info.start_address is None:
+            return
+        end = len(self.Quads)
+        for index in range(func_info.start_address, end):
+            quad = self.Quads[index]
+            if quad.operator != 'GOSUB' or quad.result is not None:
+                continue
+            if quad.left_operand not in self.semantic.function_directory:
+                continue
+            following = self.Quads[index + 1] if index + 1 < end else None
+            if following is None or (following.operator == 'goto' and following.result == end):
+                quad.operator = 'TAILCALL'
+
+    def check_missing_return(self):
+        """Al cerrar una función con valor: si se puede llegar a su ENDFUNC sin
+        pasar por un RETURN el valor de regreso quedaría indefinido (cada
+        backend regresaría otra cosa), así que es un error de compilación"""
+        func_info = self._tail_call_function()
+        if func_info is None or func_info.start_address is None or func_info.return_type == Type.VOID:
+            return
+        end = len(self.Quads)
+        pending = [func_info.start_address]
+        visited = set()
+        while pending:
+            index = pending.pop()
+            if index in visited:
+                continue
+            visited.add(index)
+            if index >= end:
+                self.semantic.add_error(f"La función '{self.semantic.current_scope}' puede terminar sin return")
+                return
+            quad = self.Quads[index]
+            if quad.operator == 'goto':
+                pending.append(quad.result)
+            elif quad.operator == 'gotof':
+                pending.extend((quad.result, index + 1))
+            elif quad.operator not in ('RETURN', 'TAILCALL'):
+                pending.append(index + 1)
+
     def generate_return_quad(self, return_value=None):
         """Genera cuádruplo RETURN - ya existe pero asegurar que esté correcto"""
         if return_value:
@@ -303,6 +511,55 @@ class QuadrupleGenerator:
         self.quad_counter += 1
         return self.quad_counter - 1
 
+    def function_ranges(self):
+        """(nombre, inicio, fin) de los cuádruplos de cada función; cada una
+        termina donde empieza la siguiente y main termina al final"""
+        starts = sorted((info.start_address, name)
+                        for name, info in self.semantic.function_directory.items()
+                        if info.start_address is not None)
+        for position, (start, name) in enumerate(starts):
+            end = starts[position + 1][0] if position + 1 < len(starts) else len(self.Quads)
+            yield name, start, end
+
+    def classify_pure_functions(self):
+        """Marca is_pure en el directorio: una función es pura si no lee ni
+        escribe globales, no imprime y solo llama funciones puras"""
+        memory_manager = self.semantic.memory_manager
+        def is_global(address):
+            return (isinstance(address, int) and
+                    memory_manager.GLOBAL_INT_START <= address < memory_manager.LOCAL_INT_START)
+        callees = {}
+        for name, start, end in self.function_ranges():
+            if name == "main":
+                continue
+            calls = set()
+            for quad in self.Quads[start:end]:
+                if quad.operator == 'print':
+                    break
+                if quad.operator in ('ERA', 'GOSUB', 'TAILCALL'):
+                    calls.add(quad.left_operand)
+                    continue
+                # En los saltos el resultado es un índice de cuádruplo, no una dirección
+                operands = (quad.left_operand, quad.right_operand)
+                if quad.operator not in ('goto', 'gotof'):
+                    operands += (quad.result,)
+                if any(is_global(address) for address in operands):
+                    break
+            else:
+                callees[name] = calls
+        # Las llamadas a funciones impuras contagian: repetir hasta que no cambie
+        pure = set(callees)
+        changed = True
+        while changed:
+            changed = False
+            for name in list(pure):
+                if not callees[name] <= pure:
+                    pure.discard(name)
+                    changed = True
+        for name, func_info in self.semantic.function_directory.items():
+            func_info.is_pure = name in pure
+        return pure
+
     def save_function_start(self, func_name):
         """Guarda la dirección de inicio de una función"""
         if func_name in self.semantic.function_directory:
@@ -323,5 +580,6 @@ class QuadrupleGenerator:
         return {
             'quadruples': self.Quads,
             'constants_table': self.constants_table,
-            'function_directory': self.semantic.function_directory
+            'function_directory': self.semantic.function_directory,
+            'memory_sizes': self.semantic.memory_manager.get_segment_sizes()
         }
\ No newline at end of file
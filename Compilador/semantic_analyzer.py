@@ -1,5 +1,13 @@
+import logging
 from semantic_cube import Type,Operation,get_result_type
 from MemoryManager import MemoryManager
+
+# Diagnósticos del análisis semántico. Sin configuración no se emite nada y los
+# mensajes con %-formato solo se arman si algún handler los va a mostrar:
+#   logging.basicConfig(level=logging.DEBUG)  # ver cada acción del análisis
+logger=logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
 class Variable:
     def __init__(self,name,var_type,scope="global"):
         self.name=name
@@ -22,6 +30,14 @@ class Function:
         self.temp_count=0
         self.start_address=None
         self.processing_locals=False
+        # Convención de llamada, se llena al terminar de compilar la función:
+        # direcciones de los parámetros en orden y tamaño del registro de activación
+        # (local_int, local_float, temp_int, temp_float, temp_bool)
+        self.param_addresses=()
+        self.frame_sizes=None
+        # Pura: solo depende de sus parámetros (no toca globales, no imprime y
+        # solo llama funciones puras). La VM puede memorizar sus resultados.
+        self.is_pure=False
 
     def add_parameter(self,param_var):
         self.parameters.append(param_var)
@@ -54,14 +70,14 @@ class SemanticAnalyzer:
         
     def add_error(self,message):
         self.error_list.append(f"Error semántico: {message}")
-        print(f"ERROR SEMÁNTICO: {message}")
+        logger.error("ERROR SEMÁNTICO: %s", message)
         return False
     
     def program_start(self,program_id):
         self.program_name=program_id
         self.current_scope="global"
         self.scope_stack=["global"]
-        print(f"Programa {program_id} iniciado, ámbito reiniciado a global")
+        logger.debug("Programa %s iniciado, ámbito reiniciado a global", program_id)
         return True
     
     def declare_main(self):
@@ -69,8 +85,9 @@ class SemanticAnalyzer:
             return self.add_error("Función 'main' ya declarada")
         main_function=Function("main",Type.VOID)
         self.function_directory["main"]=main_function
+        self.memory_manager.reset_local_counters()
         self.push_scope("main")
-        print("Función main declarada, ámbito cambiado a main")
+        logger.debug("Función main declarada, ámbito cambiado a main")
         if not "main" in self.function_directory:
             return self.add_error("Función 'main' no fue declarada previamente")
         return True
@@ -78,23 +95,24 @@ class SemanticAnalyzer:
     def end_main(self):
         if "main" not in self.function_directory:
             return self.add_error("No se puede terminar la función main que no ha sido declarada")
+        self.close_frame("main")
         if self.current_scope == "main":
             self.pop_scope()
-            print("Cuerpo de función main terminado, regresado al ámbito global")
+            logger.debug("Cuerpo de función main terminado, regresado al ámbito global")
         return True
     
     def program_end(self):
         if "main" not in self.function_directory:return self.add_error("El programa debe tener una función 'main'")
-        print(f"Programa {self.program_name} completado")
+        logger.debug("Programa %s completado", self.program_name)
         return True
     
     def start_var_declaration(self):
         self.temp_vars=[]
-        print(f"Iniciando declaración de variables en ámbito '{self.current_scope}'")
+        logger.debug("Iniciando declaración de variables en ámbito '%s'", self.current_scope)
         return True
     
     def add_id_to_temp_list(self,var_id):
-        print(f"Agregando ID '{var_id}' a lista temporal en ámbito: {self.current_scope}")
+        logger.debug("Agregando ID '%s' a lista temporal en ámbito: %s", var_id, self.current_scope)
         if var_id in self.temp_vars:return self.add_error(f"Variable '{var_id}' declarada múltiples veces en la misma declaración")
         if self.current_scope!="global":
             if var_id in self.function_directory[self.current_scope].local_vars:
@@ -102,7 +120,7 @@ class SemanticAnalyzer:
         else:
             if var_id in self.global_vars:return self.add_error(f"Variable '{var_id}' ya declarada en ámbito global")
         self.temp_vars.append(var_id)
-        print(f"'{var_id}' agregado a lista temporal de variables en ámbito: {self.current_scope}")
+        logger.debug("'%s' agregado a lista temporal de variables en ámbito: %s", var_id, self.current_scope)
         return True
     
     def set_current_type(self, var_type):
@@ -112,13 +130,13 @@ class SemanticAnalyzer:
             self.current_type = Type.FLOAT
         else:
             return self.add_error(f"Tipo no soportado: {var_type}. Solo 'int' y 'float' están permitidos para declaraciones de variables.")
-        print(f"Tipo actual establecido a {self.current_type}")
+        logger.debug("Tipo actual establecido a %s", self.current_type)
         return True
     
     def start_scope(self,scope_name):
         self.push_scope(scope_name)
         if scope_name in self.function_directory:self.function_directory[scope_name].processing_locals=True
-        print(f"Ámbito iniciado: {scope_name}")
+        logger.debug("Ámbito iniciado: %s", scope_name)
         return True
     
     def end_scope(self):
@@ -126,13 +144,13 @@ class SemanticAnalyzer:
             self.function_directory[self.current_scope].processing_locals=False
         old_scope=self.current_scope
         self.pop_scope()
-        print(f"Ámbito terminado: {old_scope}, regresado a: {self.current_scope}")
+        logger.debug("Ámbito terminado: %s, regresado a: %s", old_scope, self.current_scope)
         return True
     
     def add_vars_to_table(self):
         if not self.temp_vars:
             return True
-        print(f"Agregando variables a tabla en ámbito: {self.current_scope}")
+        logger.debug("Agregando variables a tabla en ámbito: %s", self.current_scope)
         for var_id in self.temp_vars:
             if self.current_scope == "global":
                 if var_id in self.global_vars:
@@ -140,7 +158,7 @@ class SemanticAnalyzer:
                 new_var = Variable(var_id, self.current_type, "global")
                 new_var.address = self.memory_manager.get_address(self.current_type, "global")
                 self.global_vars[var_id] = new_var
-                print(f"Variable global '{var_id}' agregada de tipo {self.current_type} en dirección {new_var.address}")
+                logger.debug("Variable global '%s' agregada de tipo %s en dirección %s", var_id, self.current_type, new_var.address)
             else:
                 if self.current_scope not in self.function_directory:
                     return self.add_error(f"Error interno: Función '{self.current_scope}' no encontrada en directorio")
@@ -151,7 +169,8 @@ class SemanticAnalyzer:
                 self.function_directory[self.current_scope].local_vars[var_id] = new_var
                 self.function_directory[self.current_scope].variables.append(new_var)
                 self.function_directory[self.current_scope].var_count += 1
-                print(f"Variable local '{var_id}' agregada de tipo {self.current_type} en dirección {new_var.address} a función '{self.current_scope}'")
+                logger.debug("Variable local '%s' agregada de tipo %s en dirección %s a función '%s'",
+                             var_id, self.current_type, new_var.address, self.current_scope)
         self.temp_vars = []
         return True
     
@@ -160,8 +179,12 @@ class SemanticAnalyzer:
             return self.add_error(f"Función '{func_id}' ya declarada")
         new_function = Function(func_id, return_type)  
         self.function_directory[func_id] = new_function
+        # Cada función tiene su propio registro de activación: sus locales y
+        # temporales empiezan desde el inicio de su segmento
+        self.memory_manager.reset_local_counters()
         self.push_scope(func_id)
-        print(f"Función '{func_id}' declarada con tipo de retorno {return_type}, ámbito cambiado a: {self.current_scope}")
+        logger.debug("Función '%s' declarada con tipo de retorno %s, ámbito cambiado a: %s",
+                     func_id, return_type, self.current_scope)
         return True
     
     def add_parameter(self, param_id, param_type):
@@ -172,7 +195,7 @@ class SemanticAnalyzer:
         elif param_type == "float":
             type_enum = Type.FLOAT
         else:
-            print(f"Error: Tipo de parámetro inválido '{param_type}' en función '{self.current_scope}'")
+            logger.error("Tipo de parámetro inválido '%s' en función '%s'", param_type, self.current_scope)
             type_enum = Type.ERROR
             self.add_error(f"Tipo de parámetro no soportado: '{param_type}' en función '{self.current_scope}'. Solo 'int' y 'float' están permitidos.")
         if param_id in self.function_directory[self.current_scope].local_vars:
@@ -180,21 +203,37 @@ class SemanticAnalyzer:
         param_var = Variable(param_id, type_enum, self.current_scope)
         param_var.address = self.memory_manager.get_address(type_enum, self.current_scope)
         self.function_directory[self.current_scope].add_parameter(param_var)
-        print(f"Parámetro '{param_id}' agregado de tipo {type_enum} en dirección {param_var.address} a función '{self.current_scope}'")
+        logger.debug("Parámetro '%s' agregado de tipo %s en dirección %s a función '%s'",
+                     param_id, type_enum, param_var.address, self.current_scope)
         return True
 
     def end_function_declaration(self):
         if self.current_scope=="global":return self.add_error("No está dentro de una declaración de función")
         func_name=self.current_scope
+        self.close_frame(func_name)
         self.pop_scope()
-        print(f"Declaración de función '{func_name}' terminada, regresado al ámbito: {self.current_scope}")
+        logger.debug("Declaración de función '%s' terminada, regresado al ámbito: %s", func_name, self.current_scope)
         return True
     
+    def close_frame(self, func_name):
+        """Guarda en la función su convención de llamada ya que se conocen todos sus locales y temporales"""
+        function = self.function_directory[func_name]
+        function.param_addresses = tuple(param.address for param in function.parameters)
+        function.frame_sizes = self.memory_manager.get_frame_sizes()
+        return True
+    
+    def lookup_variable(self, var_id):
+        """Variable visible con ese nombre (primero la local, luego la global) o None, sin reportar errores"""
+        if self.current_scope != "global":
+            variable = self.function_directory[self.current_scope].local_vars.get(var_id)
+            if variable is not None:
+                return variable
+        return self.global_vars.get(var_id)
+    
     def check_variable(self,var_id):
-        if self.current_scope!="global" and var_id in self.function_directory[self.current_scope].local_vars:
-            return self.function_directory[self.current_scope].local_vars[var_id].type
-        if var_id in self.global_vars:
-            return self.global_vars[var_id].type
+        variable = self.lookup_variable(var_id)
+        if variable is not None:
+            return variable.type
         self.add_error(f"Variable '{var_id}' no declarada")
         return Type.ERROR
     
@@ -226,6 +265,7 @@ class SemanticAnalyzer:
         print("\n===== DIRECTORIO DE FUNCIONES =====")
         for func_name,func in self.function_directory.items():
             print(f"{func}")
+            print(f"  Registro de activación: {func.frame_sizes}, parámetros en: {func.param_addresses}")
             print("  Parámetros:")
             for param in func.parameters:print(f"    {param}")
             print("  Variables Locales:")
@@ -240,14 +280,14 @@ class SemanticAnalyzer:
     def push_scope(self,new_scope):
         self.scope_stack.append(new_scope)
         self.current_scope=new_scope
-        print(f"Ámbito agregado: {new_scope}, pila de ámbitos actual: {self.scope_stack}")
+        logger.debug("Ámbito agregado: %s, pila de ámbitos actual: %s", new_scope, self.scope_stack)
         return True
     
     def pop_scope(self):
         if len(self.scope_stack)>1:
             old_scope=self.scope_stack.pop()
             self.current_scope=self.scope_stack[-1]
-            print(f"Ámbito removido: {old_scope}, ámbito actual es ahora: {self.current_scope}")
+            logger.debug("Ámbito removido: %s, ámbito actual es ahora: %s", old_scope, self.current_scope)
             return True
         else:
             self.add_error("No se puede remover el ámbito global")
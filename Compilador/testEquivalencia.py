@@ -0,0 +1,515 @@
+import io
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+from yacc import compile_program, run_execution_data
+from virtual_machine import VERBOSITY_SILENT
+
+# Pruebas de equivalencia: cada programa se ejecuta con varios backends y
+# opciones de compilación y todas las ejecuciones deben imprimir lo mismo que
+# la VM base sin optimizar (y lo esperado, si se indica).
+#
+# Uso:
+#   python testEquivalencia.py
+
+BACKENDS = ('vm', 'closure', 'python')
+
+def compile_code(code, optimize=False):
+    """Datos de ejecución del programa, sin pasar por la caché en disco"""
+    with redirect_stdout(io.StringIO()):
+        execution_data, errors = compile_program(code, optimize, cache=False)
+    if errors:
+        raise AssertionError(f"El programa tiene errores: {errors}")
+    return execution_data
+
+def run_outputs(code, backend='vm', optimize=False, memo_capacity=None):
+    """Salidas del programa ejecutado en silencio"""
+    execution_data = compile_code(code, optimize)
+    vm = run_execution_data(execution_data, VERBOSITY_SILENT, backend, memo_capacity=memo_capacity)
+    return vm.program_outputs
+
+def assert_equivalent(code, expected=None, backends=BACKENDS, optimize=(False, True)):
+    """Todas las combinaciones de backend y optimize imprimen lo mismo"""
+    reference = run_outputs(code)
+    if expected is not None and reference != expected:
+        raise AssertionError(f"vm imprime {reference}, se esperaba {expected}")
+    for backend in backends:
+        for optimized in optimize:
+            outputs = run_outputs(code, backend, optimized)
+            if outputs != reference:
+                raise AssertionError(f"{backend} (optimize={optimized}) imprime {outputs}, "
+                                     f"vm imprime {reference}")
+    return reference
+
+def compile_errors(code):
+    """Errores de compilación del programa"""
+    with redirect_stdout(io.StringIO()):
+        execution_data, errors = compile_program(code, cache=False)
+    return errors
+
+DEEP_RECURSION = """
+program profunda;
+var r : int;
+int suma(n : int)
+[
+    {
+        if (n < 1) {
+            return 0;
+        } else {
+            return n + suma(n - 1);
+        };
+    }
+];
+main {
+    r = suma(3000);
+    print(r);
+}
+end
+"""
+
+def test_recursion_profunda():
+    """Recursión (no de cola) más profunda que el límite de Python por defecto"""
+    assert_equivalent(DEEP_RECURSION, ["4501500"])
+    # Sin memorización: ni el envoltorio de la caché ni sus atajos
+    outputs = run_outputs(DEEP_RECURSION, 'python', memo_capacity=0)
+    assert outputs == ["4501500"], outputs
+
+def test_recursion_profunda_sin_limite_suficiente():
+    """Si la recursión pasa del límite el backend de Python usa el intérprete"""
+    import python_backend
+    execution_data = compile_code(DEEP_RECURSION)
+    limit = python_backend.RECURSION_LIMIT
+    previous_limit = sys.getrecursionlimit()
+    python_backend.RECURSION_LIMIT = 100
+    sys.setrecursionlimit(500)
+    try:
+        vm = run_execution_data(execution_data, VERBOSITY_SILENT, 'python')
+    finally:
+        python_backend.RECURSION_LIMIT = limit
+        sys.setrecursionlimit(previous_limit)
+    assert vm.program_outputs == ["4501500"], vm.program_outputs
+
+def test_backend_python_en_varios_hilos():
+    """Ejecuciones simultáneas del backend de Python dejan el límite de
+    recursión y la pila de los hilos como estaban"""
+    from concurrent.futures import ThreadPoolExecutor
+    import threading
+    execution_data = compile_code(DEEP_RECURSION)
+    limit = sys.getrecursionlimit()
+    stack_size = threading.stack_size()
+    def run(_):
+        return run_execution_data(execution_data, VERBOSITY_SILENT, 'python').program_outputs
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(run, range(32)))
+    assert all(outputs == ["4501500"] for outputs in results), results
+    assert sys.getrecursionlimit() == limit, sys.getrecursionlimit()
+    assert threading.stack_size() == stack_size, threading.stack_size()
+
+def test_cache_de_codigo_acotada():
+    import python_backend
+    for index in range(python_backend.CODE_CACHE_SIZE + 5):
+        python_backend.compile_source(f"valor = {index}\n")
+    assert len(python_backend._code_cache) == python_backend.CODE_CACHE_SIZE
+
+MISSING_RETURN = """
+program sinreturn;
+var r : int;
+int f(n : int)
+[
+    {
+        if (n > 0) {
+            return 1;
+        };
+    }
+];
+main {
+    r = f(0);
+    print(r);
+}
+end
+"""
+
+ALL_PATHS_RETURN = """
+program conreturn;
+var r : int;
+int signo(n : int)
+[
+    {
+        while (n > 100) do {
+            return 2;
+        };
+        if (n > 0) {
+            return 1;
+        } else {
+            return 0;
+        };
+    }
+];
+main {
+    r = signo(5) + signo(0) + signo(500);
+    print(r);
+}
+end
+"""
+
+def test_funcion_sin_return_es_error():
+    """Una función con valor que puede terminar sin return no compila: cada
+    backend regresaría un valor distinto"""
+    errors = compile_errors(MISSING_RETURN)
+    assert any("puede terminar sin return" in error for error in errors), errors
+
+def test_funcion_con_return_en_todos_los_caminos():
+    assert compile_errors(ALL_PATHS_RETURN) == []
+    assert_equivalent(ALL_PATHS_RETURN, ["3"])
+
+SIMPLE = """
+program simple;
+var x : int;
+main {
+    x = 2 + 3;
+    print(x);
+}
+end
+"""
+
+def test_cache_en_directorio_inutilizable():
+    """Un directorio de caché que no se puede crear no impide compilar"""
+    from compile_cache import CompileCache
+    cache = CompileCache(os.path.join('/proc', 'compilador-sin-cache'))
+    with redirect_stdout(io.StringIO()):
+        execution_data, errors = compile_program(SIMPLE, cache=cache)
+    assert errors == [] and execution_data is not None, errors
+    assert cache.store(SIMPLE, execution_data) is False
+    assert cache.stats()['errors'] >= 2, cache.stats()
+
+def test_cache_de_solo_lectura():
+    """Si no se puede actualizar el mtime la entrada se usa y no se borra"""
+    import compile_cache
+    with tempfile.TemporaryDirectory() as directory:
+        cache = compile_cache.CompileCache(directory)
+        execution_data = compile_code(SIMPLE)
+        assert cache.store(SIMPLE, execution_data)
+        def read_only(path, *args, **kwargs):
+            raise PermissionError(path)
+        utime = compile_cache.os.utime
+        compile_cache.os.utime = read_only
+        try:
+            loaded = cache.load(SIMPLE)
+        finally:
+            compile_cache.os.utime = utime
+        assert loaded is not None and cache.hits == 1
+        assert len(cache.entries()) == 1
+
+def test_traza_igual_con_y_sin_cache():
+    """execute_program imprime lo mismo (listado de cuádruplos incluido) al
+    compilar y al leer el programa de la caché"""
+    from compile_cache import CompileCache
+    from yacc import execute_program
+    with tempfile.TemporaryDirectory() as directory:
+        cache = CompileCache(directory)
+        for optimize in (False, True):
+            traces = []
+            for _ in range(2):
+                with redirect_stdout(io.StringIO()) as trace:
+                    execute_program(ALL_PATHS_RETURN, optimize=optimize, cache=cache)
+                traces.append(trace.getvalue())
+            assert traces[0] == traces[1], f"optimize={optimize}: la traza cambia con la caché"
+        assert cache.hits == 2, cache.stats()
+
+def test_perfilador_con_verbosidad_por_defecto():
+    """execute_program usa traza por defecto y el perfilador igual mide"""
+    from profiler import QuadProfiler, CallProfiler
+    from yacc import execute_program
+    quad_profiler = QuadProfiler()
+    with redirect_stdout(io.StringIO()):
+        vm = execute_program(DEEP_RECURSION, profiler=quad_profiler, cache=False)
+    assert vm.program_outputs == ["4501500"], vm.program_outputs
+    assert sum(quad_profiler.counts) == vm.instructions_executed > 0, quad_profiler.counts
+    call_profiler = CallProfiler()
+    with redirect_stdout(io.StringIO()):
+        execute_program(DEEP_RECURSION, profiler=call_profiler, cache=False)
+    assert call_profiler.functions['suma']['calls'] == 3001, call_profiler.functions
+
+def test_bytecode_vacio_o_truncado():
+    """Un .bdc más corto que el encabezado es BytecodeError, no ValueError de mmap"""
+    import bytecode
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'programa' + bytecode.FILE_EXTENSION)
+        for content in (b'', b'\0' * (bytecode.HEADER.size - 1)):
+            with open(path, 'wb') as f:
+                f.write(content)
+            try:
+                bytecode.load(path)
+            except bytecode.BytecodeError:
+                pass
+            else:
+                raise AssertionError(f"load aceptó un archivo de {len(content)} bytes")
+
+def test_bytecode_equivalente():
+    """Un programa guardado y cargado como bytecode imprime lo mismo"""
+    import bytecode
+    execution_data = compile_code(ALL_PATHS_RETURN, optimize=True)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'programa' + bytecode.FILE_EXTENSION)
+        bytecode.dump(execution_data, path)
+        program = bytecode.load(path)
+        try:
+            for backend in BACKENDS:
+                vm = run_execution_data(program.execution_data(), VERBOSITY_SILENT, backend)
+                assert vm.program_outputs == ["3"], (backend, vm.program_outputs)
+        finally:
+            program.close()
+
+TAIL_CALLS = """
+program cola;
+var r : int;
+int cuenta(n : int, total : int)
+[
+    {
+        if (n < 1) {
+            return total;
+        } else {
+            return cuenta(n - 1, total + n);
+        };
+    }
+];
+void baja(n : int)
+[
+    {
+        if (n > 0) {
+            baja(n - 1);
+        };
+    }
+];
+void imprime(n : int)
+[
+    {
+        print(n);
+    }
+];
+void termina(n : int)
+[
+    {
+        baja(n);
+        imprime(n);
+    }
+];
+main {
+    r = cuenta(20000, 0);
+    print(r);
+    baja(20000);
+    termina(7);
+    print("fin");
+}
+end
+"""
+
+def test_llamadas_de_cola_profundas():
+    """Recursión en posición de cola (con valor y void) mucho más profunda
+    que la pila de Python: no crece ni la pila de la VM ni la de Python"""
+    execution_data = compile_code(TAIL_CALLS)
+    tail_calls = {quad.left_operand for quad in execution_data['quadruples']
+                  if quad.operator == 'TAILCALL'}
+    # baja() dentro de termina() no está en posición de cola; imprime() sí
+    assert tail_calls == {'cuenta', 'baja', 'imprime'}, tail_calls
+    assert_equivalent(TAIL_CALLS, ["200010000", "7", "fin"])
+
+    from profiler import CallProfiler
+    profiler = CallProfiler()
+    vm = run_execution_data(execution_data, VERBOSITY_SILENT, profiler=profiler)
+    assert vm.program_outputs == ["200010000", "7", "fin"], vm.program_outputs
+    for name in ('cuenta', 'baja'):
+        assert profiler.functions[name]['max_depth'] == 1, profiler.functions[name]
+
+    # En el backend de Python la llamada de cola a sí misma es un ciclo: corre
+    # con un límite de recursión pequeño sin recurrir al intérprete
+    import python_backend
+    def no_fallback(self, already_printed):
+        raise AssertionError("el backend de Python recurrió al intérprete")
+    limit = python_backend.RECURSION_LIMIT
+    fallback = python_backend.PythonVirtualMachine._run_interpreted
+    python_backend.RECURSION_LIMIT = 100
+    python_backend.PythonVirtualMachine._run_interpreted = no_fallback
+    try:
+        vm = run_execution_data(execution_data, VERBOSITY_SILENT, 'python')
+    finally:
+        python_backend.RECURSION_LIMIT = limit
+        python_backend.PythonVirtualMachine._run_interpreted = fallback
+    assert vm.program_outputs == ["200010000", "7", "fin"], vm.program_outputs
+
+MEMOIZATION = """
+program memo;
+var contador, r : int;
+int fib(n : int)
+[
+    {
+        if (n < 2) {
+            return n;
+        } else {
+            return fib(n - 1) + fib(n - 2);
+        };
+    }
+];
+int cuenta(n : int)
+[
+    {
+        contador = contador + 1;
+        return n * 2;
+    }
+];
+int muestra(n : int)
+[
+    {
+        print(n);
+        return n + 1;
+    }
+];
+int usa(n : int)
+[
+    {
+        r = cuenta(n);
+        return r + 1;
+    }
+];
+main {
+    contador = 0;
+    r = fib(20);
+    print(r);
+    r = cuenta(5) + cuenta(5);
+    print(r, contador);
+    r = muestra(3) + muestra(3);
+    print(r);
+    r = usa(4) + usa(4);
+    print(r, contador);
+}
+end
+"""
+
+MEMOIZATION_OUTPUTS = ["6765", "20", "2", "3", "3", "8", "18", "4"]
+
+def test_memorizacion_solo_de_funciones_puras():
+    """fib se memoriza; las funciones que escriben globales, imprimen o
+    llaman a funciones impuras se ejecutan en cada llamada"""
+    execution_data = compile_code(MEMOIZATION)
+    directory = execution_data['function_directory']
+    pure = {name for name, info in directory.items() if name != 'main' and info.is_pure}
+    assert pure == {'fib'}, pure
+    for backend in BACKENDS:
+        vm = run_execution_data(execution_data, VERBOSITY_SILENT, backend)
+        assert vm.program_outputs == MEMOIZATION_OUTPUTS, (backend, vm.program_outputs)
+        assert vm.memo.hits > 0, (backend, vm.memo.stats())
+        memoized = {key[0] for key in vm.memo.entries}
+        assert memoized == {'fib'}, (backend, memoized)
+
+def test_memorizacion_no_cambia_la_salida():
+    """La salida es la misma con y sin memorización en todos los backends,
+    y con memorización la VM ejecuta muchos menos cuádruplos"""
+    assert_equivalent(MEMOIZATION, MEMOIZATION_OUTPUTS)
+    execution_data = compile_code(MEMOIZATION)
+    executed = {}
+    for memo_capacity in (None, 0):
+        for backend in BACKENDS:
+            vm = run_execution_data(execution_data, VERBOSITY_SILENT, backend,
+                                    memo_capacity=memo_capacity)
+            assert vm.program_outputs == MEMOIZATION_OUTPUTS, (backend, memo_capacity,
+                                                               vm.program_outputs)
+            if backend == 'vm':
+                executed[memo_capacity] = vm.instructions_executed
+    assert executed[None] * 10 < executed[0], executed
+
+CONSTANT_FOLDING = """
+program plegado;
+var x, y, i : int;
+    f : float;
+void rama(a : int)
+[
+    {
+        x = 1;
+        if (a > 0) {
+            x = 2;
+        };
+        print(x);
+    }
+];
+main {
+    x = 2 + 3 * 4;
+    print(x);
+    y = -x + 20;
+    f = -2.5 * 2;
+    print(y, f);
+    x = 5;
+    print(x);
+    x = y * 3;
+    print(x);
+    i = 0;
+    x = 1;
+    while (i < 3) do {
+        x = x * 2;
+        i = i + 1;
+    };
+    print(x);
+    rama(1);
+    rama(0);
+}
+end
+"""
+
+CONSTANT_FOLDING_OUTPUTS = ["14", "6", "-5.0", "5", "18", "8", "2", "1"]
+
+def folded_program(code):
+    """(cuádruplos después de fold_constants, tabla de constantes, globales)"""
+    from yacc import Compiler
+    import optimizer
+    compiler = Compiler()
+    with redirect_stdout(io.StringIO()):
+        result, errors = compiler.parse(code)
+    assert errors == [], errors
+    optimizer.fold_constants(compiler.quad_gen)
+    return compiler.quad_gen.Quads, compiler.quad_gen.constants_table, compiler.semantic.global_vars
+
+def printed_operands(quads):
+    return [quad.left_operand for quad in quads if quad.operator == 'print']
+
+def test_plegado_de_constantes():
+    """Aritmética y negación con operandos conocidos se imprimen como constantes"""
+    assert_equivalent(CONSTANT_FOLDING, CONSTANT_FOLDING_OUTPUTS)
+    quads, constants, _ = folded_program(CONSTANT_FOLDING)
+    printed = printed_operands(quads)
+    # main imprime después de rama: x, y, f, x, x (antes del ciclo)
+    main_printed = printed[1:6]
+    assert all(operand in constants for operand in main_printed), main_printed
+    assert [constants[operand] for operand in main_printed] == [14, 6, -5.0, 5, 18]
+    # Ninguna operación aritmética sobrevive fuera del ciclo
+    arithmetic = [quad for quad in quads if quad.operator in ('ADD_II', 'MUL_II', 'MUL_FF', 'SUB_II')]
+    assert [quad.operator for quad in arithmetic] == ['MUL_II', 'ADD_II'], arithmetic
+
+def test_plegado_no_cruza_reasignaciones_ni_destinos_de_salto():
+    """El valor de x no se propaga al ciclo ni después de él, ni después del
+    destino del gotof de un if"""
+    quads, constants, global_vars = folded_program(CONSTANT_FOLDING)
+    x = global_vars['x'].address
+    printed = printed_operands(quads)
+    # print(x) de rama (después del if) y el print(x) después del ciclo
+    assert printed[0] == x and printed[-1] == x, printed
+    loop_multiplication = next(quad for quad in quads if quad.operator == 'MUL_II')
+    assert loop_multiplication.left_operand == x, loop_multiplication
+
+def main():
+    tests = [(name, test) for name, test in globals().items()
+             if name.startswith('test_') and callable(test)]
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+        except Exception as error:
+            failed += 1
+            print(f"❌ {name}: {type(error).__name__}: {error}")
+        else:
+            print(f"✅ {name}")
+    print(f"\n{len(tests) - failed} de {len(tests)} pruebas pasaron")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
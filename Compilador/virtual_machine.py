@@ -1,324 +1,726 @@
+import operator
+import time
+from collections import OrderedDict
+
 from semantic_cube import Type
 from MemoryManager import MemoryManager
+from opcodes import (OP_PLUS, OP_MINUS, OP_MULTIPLY, OP_DIVIDE, OP_GREATER, OP_LESS,
+                     OP_NOT_EQUAL, OP_ASSIGN, OP_GOTO, OP_GOTOF, OP_PRINT, OP_ERA,
+                     OP_PARAM, OP_GOSUB, OP_ENDFUNC, OP_RETURN, OP_END, OP_GOTOF_GREATER,
+                     OP_GOTOF_LESS, OP_GOTOF_NOT_EQUAL, OP_NEGATE, OP_TAILCALL, OP_UNKNOWN,
+                     OPCODE_COUNT, OPCODE_NAMES, BASE_OPCODES, INTEGER_OPCODES, get_opcode)
+
+def _to_int(value):
+    """Convierte a entero respetando los booleanos"""
+    return int(value) if not isinstance(value, bool) else value
+
+# Segmentos en el orden de sus direcciones: (nombre, valor inicial, conversión)
+SEGMENTS = (
+    ('global_int', 0, _to_int),
+    ('global_float', 0.0, float),
+    ('local_int', 0, _to_int),
+    ('local_float', 0.0, float),
+    ('temp_int', 0, _to_int),
+    ('temp_float', 0.0, float),
+    ('temp_bool', False, bool),
+    ('const_int', 0, _to_int),
+    ('const_float', 0.0, float),
+)
+LOCAL_INT_SEGMENT = 2
+LOCAL_FLOAT_SEGMENT = 3
+TEMP_INT_SEGMENT = 4
+TEMP_FLOAT_SEGMENT = 5
+TEMP_BOOL_SEGMENT = 6
+# Segmentos que forman el registro de activación de una función
+FRAME_FIRST_SEGMENT = LOCAL_INT_SEGMENT
+FRAME_LAST_SEGMENT = TEMP_BOOL_SEGMENT
+EMPTY_FRAME = (0,) * (FRAME_LAST_SEGMENT - FRAME_FIRST_SEGMENT + 1)
+CONST_FLOAT_SEGMENT = 8
+
+# Todas las direcciones de inicio de segmento son múltiplos de este bloque,
+# así que address // SEGMENT_BLOCK indica el segmento en O(1)
+SEGMENT_BLOCK = 500
+DEFAULT_CONST_FLOAT_CAPACITY = 500
 
 class ExecutionMemory:
-    """Mapa de memoria para la ejecución con segmentación por tipos"""
-    def __init__(self):
-        self.global_int_memory = {}     
-        self.global_float_memory = {}    
-        self.local_int_memory = {}       
-        self.local_float_memory = {}    
-        self.temp_int_memory = {}       
-        self.temp_float_memory = {}    
-        self.temp_bool_memory = {}       
-        self.const_int_memory = {}      
-        self.const_float_memory = {}   
-        self.call_stack = []
-        self.current_context = None
+    """Mapa de memoria para la ejecución con segmentación por tipos.
+
+    Cada segmento es una lista preasignada; una dirección virtual se traduce
+    a (segmento, desplazamiento) con aritmética, sin recorrer rangos."""
+    def __init__(self, segment_sizes=None):
+        layout = MemoryManager()
+        self.bases = [
+            layout.GLOBAL_INT_START, layout.GLOBAL_FLOAT_START,
+            layout.LOCAL_INT_START, layout.LOCAL_FLOAT_START,
+            layout.TEMP_INT_START, layout.TEMP_FLOAT_START, layout.TEMP_BOOL_START,
+            layout.CONST_INT_START, layout.CONST_FLOAT_START,
+        ]
+        self.lowest_address = self.bases[0]
+        self.defaults = [default for _, default, _ in SEGMENTS]
+        self.coercers = [coerce for _, _, coerce in SEGMENTS]
+        # Segmento de cada bloque de direcciones; -1 para direcciones inválidas
+        self.block_segment = [-1] * (self.bases[0] // SEGMENT_BLOCK)
+        for segment in range(CONST_FLOAT_SEGMENT):
+            blocks = (self.bases[segment + 1] - self.bases[segment]) // SEGMENT_BLOCK
+            self.block_segment.extend([segment] * blocks)
+        self.block_segment.append(CONST_FLOAT_SEGMENT)
+        self.block_count = len(self.block_segment)
+        self.capacities = [self.bases[i + 1] - self.bases[i] for i in range(CONST_FLOAT_SEGMENT)]
+        self.capacities.append(DEFAULT_CONST_FLOAT_CAPACITY)
+        sizes = []
+        for segment, (name, _, _) in enumerate(SEGMENTS):
+            if segment_sizes is None:
+                sizes.append(self.capacities[segment])
+            else:
+                sizes.append(segment_sizes.get(name, 0))
+        self.segments = [[self.defaults[i]] * size for i, size in enumerate(sizes)]
+        # Registros de activación guardados de las funciones que llamaron a la actual
+        self.frame_stack = []
+    
+    def resolve(self, address):
+        """Traduce una dirección virtual a (segmento, desplazamiento)"""
+        if address < self.lowest_address:
+            raise ValueError(f"Invalid memory address: {address}")
+        block = address // SEGMENT_BLOCK
+        segment = self.block_segment[block] if block < self.block_count else CONST_FLOAT_SEGMENT
+        return segment, address - self.bases[segment]
         
     def get_value(self, address):
         """Obtiene el valor almacenado en una dirección virtual"""
-        # Globales enteros
-        if 5000 <= address < 8000:
-            return self.global_int_memory.get(address, 0)
-        # Globales flotantes
-        elif 8000 <= address < 11000:
-            return self.global_float_memory.get(address, 0.0)
-        # Locales enteros
-        elif 11000 <= address < 13000:
-            return self.local_int_memory.get(address, 0)
-        # Locales flotantes
-        elif 13000 <= address < 15000:
-            return self.local_float_memory.get(address, 0.0)
-        # Temporales enteros
-        elif 15000 <= address < 17000:
-            return self.temp_int_memory.get(address, 0)
-        # Temporales flotantes
-        elif 17000 <= address < 19000:
-            return self.temp_float_memory.get(address, 0.0)
-        # Temporales booleanos
-        elif 19000 <= address < 20000:
-            return self.temp_bool_memory.get(address, False)
-        # Constantes enteras
-        elif 20000 <= address < 20500:
-            return self.const_int_memory.get(address, 0)
-        # Constantes flotantes
-        elif address >= 20500:
-            return self.const_float_memory.get(address, 0.0)
-        else:
+        if address < self.lowest_address:
             raise ValueError(f"Invalid memory address: {address}")
+        block = address // SEGMENT_BLOCK
+        segment = self.block_segment[block] if block < self.block_count else CONST_FLOAT_SEGMENT
+        try:
+            return self.segments[segment][address - self.bases[segment]]
+        except IndexError:
+            return self.defaults[segment]
     
     def set_value(self, address, value):
         """Almacena un valor en una dirección virtual"""
-        # Globales enteros
-        if 5000 <= address < 8000:
-            self.global_int_memory[address] = int(value) if not isinstance(value, bool) else value
-        # Globales flotantes
-        elif 8000 <= address < 11000:
-            self.global_float_memory[address] = float(value)
-        # Locales enteros
-        elif 11000 <= address < 13000:
-            self.local_int_memory[address] = int(value) if not isinstance(value, bool) else value
-        # Locales flotantes
-        elif 13000 <= address < 15000:
-            self.local_float_memory[address] = float(value)
-        # Temporales enteros
-        elif 15000 <= address < 17000:
-            self.temp_int_memory[address] = int(value) if not isinstance(value, bool) else value
-        # Temporales flotantes
-        elif 17000 <= address < 19000:
-            self.temp_float_memory[address] = float(value)
-        # Temporales booleanos
-        elif 19000 <= address < 20000:
-            self.temp_bool_memory[address] = bool(value)
-        # Constantes enteras
-        elif 20000 <= address < 20500:
-            self.const_int_memory[address] = int(value) if not isinstance(value, bool) else value
-        # Constantes flotantes
-        elif address >= 20500:
-            self.const_float_memory[address] = float(value)
-        else:
+        if address < self.lowest_address:
             raise ValueError(f"Invalid memory address: {address}")
+        block = address // SEGMENT_BLOCK
+        segment = self.block_segment[block] if block < self.block_count else CONST_FLOAT_SEGMENT
+        offset = address - self.bases[segment]
+        value = self.coercers[segment](value)
+        try:
+            self.segments[segment][offset] = value
+        except IndexError:
+            # Dirección fuera del tamaño calculado por el compilador: crecer el segmento
+            cells = self.segments[segment]
+            cells.extend([self.defaults[segment]] * (offset + 1 - len(cells)))
+            cells[offset] = value
     
-    def clear_local_memory(self):
-        """Limpia la memoria local al terminar una función"""
-        self.local_int_memory.clear()
-        self.local_float_memory.clear()
+    def store(self, address, value):
+        """Almacena un valor que ya tiene el tipo del segmento (sin conversión)"""
+        if address < self.lowest_address:
+            raise ValueError(f"Invalid memory address: {address}")
+        block = address // SEGMENT_BLOCK
+        segment = self.block_segment[block] if block < self.block_count else CONST_FLOAT_SEGMENT
+        offset = address - self.bases[segment]
+        try:
+            self.segments[segment][offset] = value
+        except IndexError:
+            cells = self.segments[segment]
+            cells.extend([self.defaults[segment]] * (offset + 1 - len(cells)))
+            cells[offset] = value
     
-    def clear_temp_memory(self):
-        """Limpia la memoria temporal"""
-        self.temp_int_memory.clear()
-        self.temp_float_memory.clear()
-        self.temp_bool_memory.clear()
+    def segment_items(self, segment):
+        """Pares (dirección, valor) de un segmento"""
+        base = self.bases[segment]
+        return [(base + offset, value) for offset, value in enumerate(self.segments[segment])]
+    
+    def new_frame(self, sizes):
+        """Crea un registro de activación: una lista por segmento local/temporal.
 
-    def save_local_context(self):
-        """Guarda el contexto local actual"""
-        return {
-            'local_int': self.local_int_memory.copy(),
-            'local_float': self.local_float_memory.copy()
-        }
-    
-    def restore_local_context(self, context):
-        """Restaura un contexto local"""
-        self.local_int_memory = context['local_int']
-        self.local_float_memory = context['local_float']
+        sizes es una tupla con el tamaño de (local_int, local_float, temp_int,
+        temp_float, temp_bool)."""
+        defaults = self.defaults
+        return [[defaults[LOCAL_INT_SEGMENT + i]] * size for i, size in enumerate(sizes)]
+    
+    def install_frame(self, frame):
+        """Activa el registro de activación inicial (main) descartando la pila"""
+        self.frame_stack = []
+        self.segments[FRAME_FIRST_SEGMENT:FRAME_LAST_SEGMENT + 1] = frame
+    
+    def push_frame(self, frame):
+        """Activa un registro de activación guardando el actual"""
+        self.frame_stack.append(self.segments[FRAME_FIRST_SEGMENT:FRAME_LAST_SEGMENT + 1])
+        self.segments[FRAME_FIRST_SEGMENT:FRAME_LAST_SEGMENT + 1] = frame
+    
+    def replace_frame(self, frame):
+        """Reemplaza el registro de activación actual sin guardarlo (llamada de cola)"""
+        self.segments[FRAME_FIRST_SEGMENT:FRAME_LAST_SEGMENT + 1] = frame
+    
+    def pop_frame(self):
+        """Descarta el registro de activación actual y reactiva el anterior"""
+        self.segments[FRAME_FIRST_SEGMENT:FRAME_LAST_SEGMENT + 1] = self.frame_stack.pop()
+
+class FrameLayout:
+    """Forma del registro de activación de una función: tamaño de cada
+    segmento local/temporal y dónde va cada parámetro"""
+    def __init__(self, name, sizes, param_addresses, memory, memoizable=False):
+        self.name = name
+        self.sizes = sizes
+        self.param_addresses = param_addresses
+        # Función pura con valor de retorno: sus resultados se pueden memorizar
+        self.memoizable = memoizable
+        self.template = memory.new_frame(sizes)
+        # (segmento dentro del registro, desplazamiento, conversión) por parámetro
+        self.param_slots = []
+        for address in param_addresses:
+            segment, offset = memory.resolve(address)
+            if offset >= sizes[segment - FRAME_FIRST_SEGMENT]:
+                raise ValueError(f"Parameter address {address} outside frame of '{name}'")
+            self.param_slots.append((segment - FRAME_FIRST_SEGMENT, offset, memory.coercers[segment]))
+    
+    def new_frame(self):
+        """Registro de activación nuevo con los valores iniciales"""
+        return [cells[:] for cells in self.template]
+    
+    def memo_key(self, frame):
+        """Llave de memorización: la función y los argumentos ya convertidos"""
+        return (self.name,) + tuple(frame[slot][offset] for slot, offset, _ in self.param_slots)
+
+MEMO_MISS = object()
+DEFAULT_MEMO_CAPACITY = 4096
+
+class MemoCache:
+    """Resultados de funciones puras por (función, argumentos), con política
+    LRU y capacidad acotada"""
+    def __init__(self, capacity=DEFAULT_MEMO_CAPACITY):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def lookup(self, key):
+        """Valor memorizado o MEMO_MISS"""
+        entries = self.entries
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return entries[key]
+        self.misses += 1
+        return MEMO_MISS
+    
+    def store(self, key, value):
+        entries = self.entries
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+    
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'size': len(self.entries), 'capacity': self.capacity}
+
+def _divide_int(left, right):
+    """División entre enteros: el cubo dice que el resultado es entero"""
+    return int(left / right) if right != 0 else 0
+
+def _divide_float(left, right):
+    return left / right if right != 0 else 0.0
+
+# Código genérico -> función que calcula la operación
+OPERATIONS = {
+    OP_PLUS: operator.add, OP_MINUS: operator.sub, OP_MULTIPLY: operator.mul,
+    OP_DIVIDE: _divide_float, OP_GREATER: operator.gt, OP_LESS: operator.lt,
+    OP_NOT_EQUAL: operator.ne,
+}
+
+def typed_operation(opcode):
+    """Función de Python para un código tipado (OP_DIV_II divide truncando)"""
+    if opcode in INTEGER_OPCODES and BASE_OPCODES[opcode] == OP_DIVIDE:
+        return _divide_int
+    return OPERATIONS[BASE_OPCODES[opcode]]
+
+# Niveles de verbosidad de la máquina virtual
+VERBOSITY_SILENT = 0    # No imprime nada, los outputs quedan en program_outputs
+VERBOSITY_OUTPUTS = 1   # Solo imprime las líneas OUTPUT del programa
+VERBOSITY_TRACE = 2     # Traza completa de cada cuádruplo (modo didáctico)
 
 class VirtualMachine:
     """Máquina Virtual para ejecutar cuádruplos con memoria segmentada"""
-    def __init__(self, quadruples, constants_table, function_directory):
+    # El ciclo de ejecución mantiene instruction_pointer al día (lo leen los perfiladores)
+    tracks_instruction_pointer = True
+    
+    def __init__(self, quadruples, constants_table, function_directory, memory_sizes=None,
+                 verbosity=VERBOSITY_TRACE, memo_capacity=DEFAULT_MEMO_CAPACITY):
         self.quadruples = quadruples
-        self.memory = ExecutionMemory()
+        self.verbosity = verbosity
+        self.trace = verbosity >= VERBOSITY_TRACE
+        self.echo_outputs = verbosity >= VERBOSITY_OUTPUTS
+        self.memory = ExecutionMemory(memory_sizes)
         self.function_directory = function_directory
         self.instruction_pointer = 0
+        self.instructions_executed = 0
         self.call_stack = []
-        self.param_stack = []
-        self.current_function = None
-        self.memory_context_stack = []     
+        # Registros de activación creados por ERA que esperan su GOSUB:
+        # [nombre de función, registro, siguiente parámetro]
+        self.pending_frames = []
         self.program_outputs = []
-        for value, address in constants_table.items():
+        # Perfilador opcional (profiler.QuadProfiler); None = ciclo sin medición
+        self.profiler = None
+        # Memorización de funciones puras; memo_capacity=0 la desactiva
+        self.memo = MemoCache(memo_capacity) if memo_capacity else None
+        for address, value in constants_table.items():
             self.memory.set_value(address, value)
+        self.dispatch_table = self._build_dispatch_table()
+        self.code = self._decode(quadruples)
+        self.frame_layouts = self._compute_frame_layouts()
+    
+    def _build_dispatch_table(self):
+        """Construye la tabla de handlers indexada por código de operación"""
+        table = [None] * OPCODE_COUNT
+        table[OP_PLUS] = self._execute_plus
+        table[OP_MINUS] = self._execute_minus
+        table[OP_MULTIPLY] = self._execute_multiply
+        table[OP_DIVIDE] = self._execute_divide
+        table[OP_GREATER] = self._execute_greater
+        table[OP_LESS] = self._execute_less
+        table[OP_NOT_EQUAL] = self._execute_not_equal
+        table[OP_ASSIGN] = self._execute_assignment
+        table[OP_GOTO] = self._execute_goto
+        table[OP_GOTOF] = self._execute_gotof
+        table[OP_PRINT] = self._execute_print
+        table[OP_ERA] = self._execute_era
+        table[OP_PARAM] = self._execute_param
+        table[OP_GOSUB] = self._execute_gosub
+        table[OP_ENDFUNC] = self._execute_endfunc
+        table[OP_RETURN] = self._execute_return
+        table[OP_END] = self._execute_end
+        table[OP_GOTOF_GREATER] = self._execute_gotof_greater
+        table[OP_GOTOF_LESS] = self._execute_gotof_less
+        table[OP_GOTOF_NOT_EQUAL] = self._execute_gotof_not_equal
+        table[OP_NEGATE] = self._execute_negate
+        table[OP_TAILCALL] = self._execute_tailcall
+        table[OP_UNKNOWN] = self._execute_unknown
+        for opcode in BASE_OPCODES:
+            table[opcode] = self._make_typed_handler(opcode)
+        return table
+    
+    def _make_typed_handler(self, opcode):
+        """Handler de una operación tipada: el compilador ya eligió el tipo del
+        resultado con el cubo semántico, así que se guarda sin conversión"""
+        function = typed_operation(opcode)
+        symbol = OPCODE_NAMES[BASE_OPCODES[opcode]]
+        label = "Comparación" if symbol in ('>', '<', '!=') else "Aritmética"
+        def handler(left, right, result):
+            left_val = self.memory.get_value(left)
+            right_val = self.memory.get_value(right)
+            value = function(left_val, right_val)
+            self.memory.store(result, value)
+            if self.trace:
+                print(f"  {label}: {left_val} {symbol} {right_val} = {value}")
+            return True
+        return handler
+    
+    def _decode(self, quadruples):
+        """Traduce los cuádruplos a tuplas (código, izq, der, resultado) una sola vez"""
+        if hasattr(quadruples, 'decode'):
+            # bytecode.QuadTable: lee los registros binarios sin crear Quadruples
+            return quadruples.decode()
+        return [(get_opcode(quad.operator), quad.left_operand, quad.right_operand, quad.result)
+                for quad in quadruples]
+    
+    def _compute_frame_layouts(self):
+        """Prepara el registro de activación de cada función a partir de la
+        convención de llamada que dejó el compilador en el directorio"""
+        layouts = {}
+        for name, func_info in self.function_directory.items():
+            sizes = func_info.frame_sizes if func_info.frame_sizes is not None else EMPTY_FRAME
+            memoizable = func_info.is_pure and func_info.return_type != Type.VOID
+            layouts[name] = FrameLayout(name, sizes, func_info.param_addresses, self.memory,
+                                        memoizable)
+        return layouts
     
     def execute(self):
         """Ejecuta el programa completo"""
-        print("=== INICIANDO EJECUCIÓN ===")
         self.instruction_pointer = 0
+        self.instructions_executed = 0
         self.program_outputs = []  
-        while self.instruction_pointer < len(self.quadruples):
-            quad = self.quadruples[self.instruction_pointer]
-            print(f"IP: {self.instruction_pointer} -> Ejecutando: {quad}")
-            if not self.execute_quadruple(quad):
+        self.call_stack = []
+        self.pending_frames = []
+        if self.memo is not None:
+            self.memo.clear()
+        main_layout = self.frame_layouts.get('main')
+        main_frame = main_layout.new_frame() if main_layout else self.memory.new_frame(EMPTY_FRAME)
+        self.memory.install_frame(main_frame)
+        if self.profiler is None:
+            self._run_selected()
+            return
+        # El perfilador también mide la ejecución con traza (la verbosidad
+        # por defecto de execute_program)
+        self.profiler.start(self)
+        try:
+            self._run_selected()
+        finally:
+            self.profiler.stop()
+    
+    def _run_selected(self):
+        """Ciclo principal según la verbosidad y el perfilador"""
+        if self.trace:
+            print("=== INICIANDO EJECUCIÓN ===")
+            self._run_traced()
+            print("=== EJECUCIÓN TERMINADA ===")
+        elif self.profiler is not None and self.profiler.counts_quads:
+            self._run_profiled()
+        else:
+            self._run()
+    
+    def _run(self):
+        """Ciclo principal sin traza: no formatea ningún mensaje"""
+        code = self.code
+        table = self.dispatch_table
+        end = len(code)
+        executed = 0
+        while self.instruction_pointer < end:
+            opcode, left, right, result = code[self.instruction_pointer]
+            executed += 1
+            if not table[opcode](left, right, result):
+                break
+            self.instruction_pointer += 1
+        self.instructions_executed = executed
+    
+    def _run_profiled(self):
+        """Ciclo principal midiendo veces y tiempo de cada cuádruplo"""
+        code = self.code
+        table = self.dispatch_table
+        end = len(code)
+        counts = self.profiler.counts
+        times = self.profiler.times
+        clock = time.perf_counter
+        executed = 0
+        while self.instruction_pointer < end:
+            index = self.instruction_pointer
+            opcode, left, right, result = code[index]
+            executed += 1
+            started = clock()
+            keep_running = table[opcode](left, right, result)
+            times[index] += clock() - started
+            counts[index] += 1
+            if not keep_running:
+                break
+            self.instruction_pointer += 1
+        self.instructions_executed = executed
+    
+    def _run_traced(self):
+        """Ciclo principal imprimiendo cada cuádruplo ejecutado. Con un
+        perfilador por cuádruplo mide cada uno sin contar la impresión"""
+        code = self.code
+        table = self.dispatch_table
+        end = len(code)
+        profiler = self.profiler if self.profiler is not None and self.profiler.counts_quads else None
+        clock = time.perf_counter
+        while self.instruction_pointer < end:
+            index = self.instruction_pointer
+            opcode, left, right, result = code[index]
+            print(f"IP: {index} -> Ejecutando: {self.quadruples[index]}")
+            self.instructions_executed += 1
+            if profiler is None:
+                keep_running = table[opcode](left, right, result)
+            else:
+                started = clock()
+                keep_running = table[opcode](left, right, result)
+                profiler.times[index] += clock() - started
+                profiler.counts[index] += 1
+            if not keep_running:
                 break   
             self.instruction_pointer += 1
-        print("=== EJECUCIÓN TERMINADA ===")
     
-    def _execute_end(self, quad):
+    def _execute_end(self, left, right, result):
         """Termina la ejecución del programa"""
-        print("  END: Terminando programa")
+        if self.trace:
+            print("  END: Terminando programa")
         return False
 
+    def _execute_unknown(self, left, right, result):
+        """Operador sin handler en la tabla"""
+        if self.trace:
+            print(f"Operación no implementada: {self.quadruples[self.instruction_pointer].operator}")
+        return True
+
     def execute_quadruple(self, quad):
         """Ejecuta un cuádruplo individual"""
-        op = quad.operator
-        
-        if op == '+':
-            return self._execute_arithmetic(quad, lambda a, b: a + b)
-        elif op == '-':
-            return self._execute_arithmetic(quad, lambda a, b: a - b)
-        elif op == '*':
-            return self._execute_arithmetic(quad, lambda a, b: a * b)
-        elif op == '/':
-            return self._execute_arithmetic(quad, lambda a, b: a / b if b != 0 else 0)
-        elif op == '>':
-            return self._execute_comparison(quad, lambda a, b: a > b)
-        elif op == '<':
-            return self._execute_comparison(quad, lambda a, b: a < b)
-        elif op == '!=':
-            return self._execute_comparison(quad, lambda a, b: a != b)
-        elif op == '=':
-            return self._execute_assignment(quad)
-        elif op == 'goto':
-            return self._execute_goto(quad)
-        elif op == 'gotof':
-            return self._execute_gotof(quad)
-        elif op == 'print':
-            return self._execute_print(quad)
-        elif op == 'ERA':
-            return self._execute_era(quad)
-        elif op == 'parámetro':
-            return self._execute_param(quad)
-        elif op == 'GOSUB':
-            return self._execute_gosub(quad)
-        elif op == 'ENDFUNC':
-            return self._execute_endfunc(quad)
-        elif op == 'RETURN':
-            return self._execute_return(quad)
-        elif op == 'END':
-            return self._execute_end(quad)
-        else:
-            print(f"Operación no implementada: {op}")
+        opcode = get_opcode(quad.operator)
+        if opcode == OP_UNKNOWN:
+            if self.trace:
+                print(f"Operación no implementada: {quad.operator}")
             return True
+        return self.dispatch_table[opcode](quad.left_operand, quad.right_operand, quad.result)
+    
+    def _execute_plus(self, left, right, result):
+        """Ejecuta suma"""
+        left_val = self.memory.get_value(left)
+        right_val = self.memory.get_value(right)
+        value = left_val + right_val
+        self.memory.set_value(result, value)
+        if self.trace:
+            print(f"  Aritmética: {left_val} + {right_val} = {value}")
+        return True
+    
+    def _execute_minus(self, left, right, result):
+        """Ejecuta resta"""
+        left_val = self.memory.get_value(left)
+        right_val = self.memory.get_value(right)
+        value = left_val - right_val
+        self.memory.set_value(result, value)
+        if self.trace:
+            print(f"  Aritmética: {left_val} - {right_val} = {value}")
+        return True
+    
+    def _execute_multiply(self, left, right, result):
+        """Ejecuta multiplicación"""
+        left_val = self.memory.get_value(left)
+        right_val = self.memory.get_value(right)
+        value = left_val * right_val
+        self.memory.set_value(result, value)
+        if self.trace:
+            print(f"  Aritmética: {left_val} * {right_val} = {value}")
+        return True
     
-    def _execute_arithmetic(self, quad, operation):
-        """Ejecuta operaciones aritméticas"""
-        left_val = self.memory.get_value(quad.left_operand)
-        right_val = self.memory.get_value(quad.right_operand)
-        result = operation(left_val, right_val)
-        self.memory.set_value(quad.result, result)
-        print(f"  Aritmética: {left_val} {quad.operator} {right_val} = {result}")
+    def _execute_divide(self, left, right, result):
+        """Ejecuta división (división entre cero da 0)"""
+        left_val = self.memory.get_value(left)
+        right_val = self.memory.get_value(right)
+        value = left_val / right_val if right_val != 0 else 0
+        self.memory.set_value(result, value)
+        if self.trace:
+            print(f"  Aritmética: {left_val} / {right_val} = {value}")
         return True
     
-    def _execute_comparison(self, quad, operation):
-        """Ejecuta operaciones de comparación"""
-        left_val = self.memory.get_value(quad.left_operand)
-        right_val = self.memory.get_value(quad.right_operand)
-        result = operation(left_val, right_val)
-        self.memory.set_value(quad.result, result)
-        print(f"  Comparación: {left_val} {quad.operator} {right_val} = {result}")
+    def _execute_greater(self, left, right, result):
+        """Ejecuta comparación mayor que"""
+        left_val = self.memory.get_value(left)
+        right_val = self.memory.get_value(right)
+        value = left_val > right_val
+        self.memory.set_value(result, value)
+        if self.trace:
+            print(f"  Comparación: {left_val} > {right_val} = {value}")
         return True
     
-    def _execute_logical(self, quad, operation):
-        """Ejecuta operaciones lógicas"""
-        left_val = bool(self.memory.get_value(quad.left_operand))
-        right_val = bool(self.memory.get_value(quad.right_operand))
-        result = operation(left_val, right_val)
-        self.memory.set_value(quad.result, result)
-        print(f"  Lógica: {left_val} {quad.operator} {right_val} = {result}")
+    def _execute_less(self, left, right, result):
+        """Ejecuta comparación menor que"""
+        left_val = self.memory.get_value(left)
+        right_val = self.memory.get_value(right)
+        value = left_val < right_val
+        self.memory.set_value(result, value)
+        if self.trace:
+            print(f"  Comparación: {left_val} < {right_val} = {value}")
         return True
     
-    def _execute_assignment(self, quad):
+    def _execute_not_equal(self, left, right, result):
+        """Ejecuta comparación diferente de"""
+        left_val = self.memory.get_value(left)
+        right_val = self.memory.get_value(right)
+        value = left_val != right_val
+        self.memory.set_value(result, value)
+        if self.trace:
+            print(f"  Comparación: {left_val} != {right_val} = {value}")
+        return True
+    
+    def _execute_assignment(self, left, right, result):
         """Ejecuta asignación"""
-        value = self.memory.get_value(quad.left_operand)
-        self.memory.set_value(quad.result, value)
-        print(f"  Asignación: direccion[{quad.result}] = {value}")
+        value = self.memory.get_value(left)
+        self.memory.set_value(result, value)
+        if self.trace:
+            print(f"  Asignación: direccion[{result}] = {value}")
         return True
     
-    def _execute_goto(self, quad):
+    def _execute_goto(self, left, right, result):
         """Ejecuta salto incondicional"""
-        self.instruction_pointer = quad.result - 1 
-        print(f"  Salto a: {quad.result}")
+        self.instruction_pointer = result - 1 
+        if self.trace:
+            print(f"  Salto a: {result}")
         return True
     
-    def _execute_gotof(self, quad):
+    def _execute_gotof(self, left, right, result):
         """Ejecuta salto condicional (si falso)"""
-        condition = self.memory.get_value(quad.left_operand)
+        condition = self.memory.get_value(left)
         if not condition:
-            self.instruction_pointer = quad.result - 1
-            print(f"  Salto condicional a: {quad.result} (condición falsa)")
+            self.instruction_pointer = result - 1
+            if self.trace:
+                print(f"  Salto condicional a: {result} (condición falsa)")
         else:
-            print(f"  No hay salto (condición verdadera)")
+            if self.trace:
+                print(f"  No hay salto (condición verdadera)")
         return True
     
-    def _execute_print(self, quad):
+    def _execute_gotof_greater(self, left, right, result):
+        """Compara mayor que y salta si es falso (superinstrucción)"""
+        left_val = self.memory.get_value(left)
+        right_val = self.memory.get_value(right)
+        return self._branch_unless(left_val > right_val, left_val, '>', right_val, result)
+    
+    def _execute_gotof_less(self, left, right, result):
+        """Compara menor que y salta si es falso (superinstrucción)"""
+        left_val = self.memory.get_value(left)
+        right_val = self.memory.get_value(right)
+        return self._branch_unless(left_val < right_val, left_val, '<', right_val, result)
+    
+    def _execute_gotof_not_equal(self, left, right, result):
+        """Compara diferente de y salta si es falso (superinstrucción)"""
+        left_val = self.memory.get_value(left)
+        right_val = self.memory.get_value(right)
+        return self._branch_unless(left_val != right_val, left_val, '!=', right_val, result)
+    
+    def _branch_unless(self, condition, left_val, symbol, right_val, result):
+        """Salto de las comparaciones fusionadas con gotof; la descripción de
+        la comparación solo se arma con traza"""
+        if not condition:
+            self.instruction_pointer = result - 1
+            if self.trace:
+                print(f"  Salto condicional a: {result} ({left_val} {symbol} {right_val} es falso)")
+        elif self.trace:
+            print(f"  No hay salto ({left_val} {symbol} {right_val} es verdadero)")
+        return True
+    
+    def _execute_negate(self, left, right, result):
+        """Ejecuta el menos unario (superinstrucción de -1 * x)"""
+        operand = self.memory.get_value(left)
+        value = -operand
+        self.memory.set_value(result, value)
+        if self.trace:
+            print(f"  Aritmética: -({operand}) = {value}")
+        return True
+    
+    def _execute_print(self, left, right, result):
         """Ejecuta impresión"""
-        if isinstance(quad.left_operand, str):
-            output_value = quad.left_operand
-            print(f"OUTPUT: {output_value}")
+        if isinstance(left, str):
+            output_value = left
+            if self.echo_outputs:
+                print(f"OUTPUT: {output_value}")
             self.program_outputs.append(output_value)
         else:
-            value = self.memory.get_value(quad.left_operand)
-            print(f"OUTPUT: {value}")
+            value = self.memory.get_value(left)
+            if self.echo_outputs:
+                print(f"OUTPUT: {value}")
             self.program_outputs.append(str(value))
         return True
     
-    def _execute_era(self, quad):
-        """Reserva espacio para función (ERA)"""
-        func_name = quad.left_operand
-        print(f"  ERA: Reservando espacio para función '{func_name}'")
-        
-        self.param_stack = []
-        self.current_function = func_name
-        
+    def _execute_era(self, left, right, result):
+        """Reserva el registro de activación de la función (ERA)"""
+        layout = self.frame_layouts[left]
+        self.pending_frames.append([layout, layout.new_frame(), 0])
+        if self.trace:
+            print(f"  ERA: Reservando espacio para función '{left}' {layout.sizes}")
         return True
     
-    def _execute_param(self, quad):
-        """Pasa parámetro a función"""
-        param_value = self.memory.get_value(quad.left_operand)
-        self.param_stack.append(param_value)
-        print(f"  Parámetro: {param_value} -> posición {len(self.param_stack)}")
+    def _execute_param(self, left, right, result):
+        """Escribe un parámetro directamente en el registro de la función llamada"""
+        param_value = self.memory.get_value(left)
+        pending = self.pending_frames[-1]
+        param_slots = pending[0].param_slots
+        position = pending[2]
+        pending[2] = position + 1
+        if position < len(param_slots):
+            slot, offset, coerce = param_slots[position]
+            pending[1][slot][offset] = coerce(param_value)
+        if self.trace:
+            print(f"  Parámetro: {param_value} -> posición {position + 1}")
         return True
     
-    def _execute_gosub(self, quad):
-        """Llama a función"""
-        func_name = quad.left_operand
-        return_address = quad.result  
+    def _execute_gosub(self, left, right, result):
+        """Llama a función activando su registro de activación"""
+        return_address = result  
+        layout, frame, _ = self.pending_frames.pop()
+        func_name = layout.name
         if func_name in self.function_directory:
-            func_info = self.function_directory[func_name]
-            func_start = func_info.start_address
-            if hasattr(self, 'current_function') and self.current_function:
-                context = self.memory.save_local_context()
-                self.memory_context_stack.append(context)          
-            self.memory.clear_local_memory()
-            if hasattr(func_info, 'local_vars') and self.param_stack:
-                param_vars = []
-                for var_name, var_info in func_info.local_vars.items():
-                    param_vars.append((var_name, var_info.address))
-                param_vars.sort(key=lambda x: x[1])
-                for i, param_value in enumerate(self.param_stack):
-                    if i < len(param_vars):
-                        param_address = param_vars[i][1]
-                        self.memory.set_value(param_address, param_value)
-                        print(f"    Asignando parámetro {param_vars[i][0]} (addr: {param_address}) = {param_value}")           
+            func_start = self.function_directory[func_name].start_address
             context = {
                 'return_address': self.instruction_pointer + 1,
                 'return_value_address': return_address,
                 'function_name': func_name
             }
+            if self.memo is not None and layout.memoizable and return_address:
+                key = layout.memo_key(frame)
+                value = self.memo.lookup(key)
+                if value is not MEMO_MISS:
+                    self.memory.set_value(return_address, value)
+                    if self.trace:
+                        print(f"  GOSUB: '{func_name}{key[1:]}' ya calculado = {value} (memorizado)")
+                    return True
+                # RETURN guardará el resultado con esta llave
+                context['memo_key'] = key
             self.call_stack.append(context)
+            self.memory.push_frame(frame)
             
             self.instruction_pointer = func_start - 1
-            print(f"  GOSUB: Llamando función '{func_name}' en dirección {func_start}")
-            if return_address:
-                print(f"    Valor de retorno se guardará en dirección: {return_address}")
+            if self.trace:
+                print(f"  GOSUB: Llamando función '{func_name}' en dirección {func_start}")
+                if return_address:
+                    print(f"    Valor de retorno se guardará en dirección: {return_address}")
         return True
     
-    def _execute_endfunc(self, quad):
+    def _execute_tailcall(self, left, right, result):
+        """Llamada en posición de cola: el registro nuevo reemplaza al actual y
+        el llamado regresa directo a quien llamó a la función actual"""
+        if not self.call_stack:
+            return self._execute_gosub(left, right, result)
+        layout, frame, _ = self.pending_frames.pop()
+        func_name = layout.name
+        if func_name in self.function_directory:
+            func_start = self.function_directory[func_name].start_address
+            context = self.call_stack.pop()
+            tail_context = {
+                'return_address': context['return_address'],
+                'return_value_address': context['return_value_address'],
+                'function_name': func_name
+            }
+            # El resultado del llamado en cola es el de la función actual
+            if 'memo_key' in context:
+                tail_context['memo_key'] = context['memo_key']
+            self.call_stack.append(tail_context)
+            self.memory.replace_frame(frame)
+            self.instruction_pointer = func_start - 1
+            if self.trace:
+                print(f"  TAILCALL: Llamando función '{func_name}' en dirección {func_start} "
+                      f"reutilizando el registro de '{context['function_name']}'")
+        return True
+    
+    def _execute_endfunc(self, left, right, result):
         """Termina función"""
+        self._leave_function()
+        return True
+    
+    def _leave_function(self):
+        """Regresa al registro de activación y dirección de quien llamó"""
         if self.call_stack:
             context = self.call_stack.pop()
+            self.memory.pop_frame()
             self.instruction_pointer = context['return_address'] - 1
-            print(f"  ENDFUNC: Retornando a dirección {context['return_address']}")
-            if self.memory_context_stack:
-                previous_context = self.memory_context_stack.pop()
-                self.memory.restore_local_context(previous_context)
-            else:
-                self.memory.clear_local_memory()
-            self.param_stack = []
-            self.current_function = None
-        return True
+            if self.trace:
+                print(f"  ENDFUNC: Retornando a dirección {context['return_address']}")
+            return context
+        return None
     
-    def _execute_return(self, quad):
+    def _execute_return(self, left, right, result):
         """Retorna de función con valor"""
-        if quad.left_operand is not None:
-            return_value = self.memory.get_value(quad.left_operand)
-            print(f"  RETURN: Retornando valor {return_value}")
-            if self.call_stack:
-                context = self.call_stack[-1] 
-                if context.get('return_value_address'):
-                    self.memory.set_value(context['return_value_address'], return_value)
+        if left is not None:
+            return_value = self.memory.get_value(left)
+            if self.trace:
+                print(f"  RETURN: Retornando valor {return_value}")
+            context = self._leave_function()
+            # El registro de quien llamó ya está activo: el temporal de retorno es suyo
+            if context and context['return_value_address']:
+                self.memory.set_value(context['return_value_address'], return_value)
+                if 'memo_key' in context:
+                    self.memo.store(context['memo_key'], return_value)
+                if self.trace:
                     print(f"    Valor guardado en dirección temporal: {context['return_value_address']}")
         else:
-            print(f"  RETURN: Retorno sin valor")
-        return self._execute_endfunc(quad)
+            if self.trace:
+                print(f"  RETURN: Retorno sin valor")
+            self._leave_function()
+        return True
     
     def print_program_outputs(self):
         """Imprime solo los outputs del programa de manera limpia"""
@@ -336,41 +738,20 @@ class VirtualMachine:
     def print_memory_state(self):
         """Imprime el estado actual de la memoria segmentada"""
         print("\n=== ESTADO DE LA MEMORIA SEGMENTADA ===")
-        
-        print("Memoria Global Enteros (5000-7999):")
-        for addr, value in sorted(self.memory.global_int_memory.items()):
-            print(f"  [{addr}]: {value}")
-            
-        print("Memoria Global Flotantes (8000-10999):")
-        for addr, value in sorted(self.memory.global_float_memory.items()):
-            print(f"  [{addr}]: {value}")
-            
-        print("Memoria Local Enteros (11000-12999):")
-        for addr, value in sorted(self.memory.local_int_memory.items()):
-            print(f"  [{addr}]: {value}")
-            
-        print("Memoria Local Flotantes (13000-14999):")
-        for addr, value in sorted(self.memory.local_float_memory.items()):
-            print(f"  [{addr}]: {value}")
-            
-        print("Memoria Temporal Enteros (15000-16999):")
-        for addr, value in sorted(self.memory.temp_int_memory.items()):
-            print(f"  [{addr}]: {value}")
-            
-        print("Memoria Temporal Flotantes (17000-18999):")
-        for addr, value in sorted(self.memory.temp_float_memory.items()):
-            print(f"  [{addr}]: {value}")
-            
-        print("Memoria Temporal Booleanos (19000-19999):")
-        for addr, value in sorted(self.memory.temp_bool_memory.items()):
-            print(f"  [{addr}]: {value}")
-            
-        print("Constantes Enteras (20000-20499):")
-        for addr, value in sorted(self.memory.const_int_memory.items()):
-            print(f"  [{addr}]: {value}")
-            
-        print("Constantes Flotantes (20500+):")
-        for addr, value in sorted(self.memory.const_float_memory.items()):
-            print(f"  [{addr}]: {value}")
+        titles = [
+            "Memoria Global Enteros (5000-7999):",
+            "Memoria Global Flotantes (8000-10999):",
+            "Memoria Local Enteros (11000-12999):",
+            "Memoria Local Flotantes (13000-14999):",
+            "Memoria Temporal Enteros (15000-16999):",
+            "Memoria Temporal Flotantes (17000-18999):",
+            "Memoria Temporal Booleanos (19000-19999):",
+            "Constantes Enteras (20000-20499):",
+            "Constantes Flotantes (20500+):",
+        ]
+        for segment, title in enumerate(titles):
+            print(title)
+            for addr, value in self.memory.segment_items(segment):
+                print(f"  [{addr}]: {value}")
             
-        print("="*40)
\ No newline at end of file
+        print("="*40)
@@ -1,67 +1,44 @@
+import copy
+import os
+import pickle
+import sys
+import threading
 import ply.yacc as yacc
-from lex import tokens
+from lex import tokens, get_lexer, FastLexer
 from semantic_cube import Type, Operation, get_result_type
 from semantic_analyzer import SemanticAnalyzer
 from quadruple_generator import QuadrupleGenerator, Quadruple
-semantic = SemanticAnalyzer()
-quad_gen = QuadrupleGenerator(semantic)
-
-def get_operand_name(expr_node):
-    if isinstance(expr_node, tuple):
-        if expr_node[0] == 'id':
-            result = expr_node[1]
-            return result
-        elif expr_node[0] == 'constant':
-            result = str(expr_node[1])
-            return result
-        elif expr_node[0] == 'string':
-            result = expr_node[1]
-            return result
-        elif expr_node[0] == 'temp_result':
-            result = expr_node[1]
-            return result
-        elif expr_node[0] == 'function_call_expr':
-            if hasattr(expr_node, '__len__') and len(expr_node) > 3:
-                for i, item in enumerate(expr_node):
-                    if item == 'temp_result' and i + 1 < len(expr_node):
-                        return expr_node[i + 1]
-            if quad_gen.PilaO:
-                result = quad_gen.PilaO[-1]
-                return result
-            else:
-                return f"func_result_{expr_node[1]}"
-        elif expr_node[0] in ['operation', 'comparison', 'unary']:
-            if quad_gen.PilaO:
-                result = quad_gen.PilaO[-1]
-                return result
-        else:
-            raise SyntaxError("error_msg: Invalid expression node type")
-    result = str(expr_node)
-    return result
+from ast_nodes import (Expression, Id, Constant, StringLiteral, TempResult, BinaryOperation,
+                       Comparison, Unary, FunctionCall, UNRESOLVED)
 
 def p_programa(p):
     '''programa : TOKEN_PROGRAM TOKEN_ID TOKEN_SEMICOLON saveGo dec_var dec_funcs TOKEN_MAIN fillMain body TOKEN_END'''
-    semantic.program_start(p[2])
+    compiler = p.parser.compiler
+    compiler.semantic.end_main()
+    compiler.semantic.program_start(p[2])
     p[0] = ('programa', p[2], p[5], p[6], p[9])
-    semantic.program_end()
-    quad_gen.generate_end_quad()
-    quad_gen.print_quads()
+    compiler.semantic.program_end()
+    compiler.quad_gen.generate_end_quad()
+    compiler.quad_gen.classify_pure_functions()
+    compiler.quad_gen.print_quads()
 
 def p_saveGo(p):
     '''saveGo : empty'''
-    goto_index = quad_gen.generate_goto_quad()
-    quad_gen.main_goto_index = goto_index
+    compiler = p.parser.compiler
+    goto_index = compiler.quad_gen.generate_goto_quad()
+    compiler.quad_gen.main_goto_index = goto_index
     p[0] = goto_index
 
 def p_fillMain(p):
     '''fillMain : empty'''
-    semantic.declare_main()
-    if 'main' in semantic.function_directory:
-        semantic.function_directory['main'].start_address = len(quad_gen.Quads)
+    compiler = p.parser.compiler
+    compiler.semantic.declare_main()
+    if 'main' in compiler.semantic.function_directory:
+        compiler.semantic.function_directory['main'].start_address = len(compiler.quad_gen.Quads)
     else:
-        semantic.add_error("'main' function not declared")
-    if hasattr(quad_gen, 'main_goto_index'):
-        quad_gen.fill_quad(quad_gen.main_goto_index, len(quad_gen.Quads))
+        compiler.semantic.add_error("'main' function not declared")
+    if hasattr(compiler.quad_gen, 'main_goto_index'):
+        compiler.quad_gen.fill_quad(compiler.quad_gen.main_goto_index, len(compiler.quad_gen.Quads))
     p[0] = None
 
 def p_dec_var(p):
@@ -70,63 +47,58 @@ def p_dec_var(p):
     p[0] = p[1]
 
 def p_dec_funcs(p):
-    '''dec_funcs : funcs dec_funcs
+    '''dec_funcs : dec_funcs funcs
     | empty'''
-    if p[1] == None:
+    # Recursión izquierda: cada reducción agrega al final de la misma lista
+    if len(p) == 2:
         p[0] = []
     else:
-        if isinstance(p[2], list):
-            p[0] = [p[1]] + p[2]
-        else:
-            p[0] = [p[1]]
+        p[1].append(p[2])
+        p[0] = p[1]
 
 def p_vars(p):
     '''vars : TOKEN_VAR variable rep_var'''
-    semantic.start_var_declaration()
-    if p[3] == None:
-        p[0] = ('vars', [p[2]])
-    else:
-        p[0] = ('vars', [p[2]] + p[3])
+    compiler = p.parser.compiler
+    compiler.semantic.start_var_declaration()
+    p[0] = ('vars', [p[2]] + p[3])
 
 def p_rep_var(p):
-    '''rep_var  : variable rep_var
+    '''rep_var  : rep_var variable
     |  empty'''
-    if p[1] == None:
-        p[0] = None
+    if len(p) == 2:
+        p[0] = []
     else:
-        if p[2] == None:
-            p[0] = [p[1]]
-        else:
-            p[0] = [p[1]] + p[2]
+        p[1].append(p[2])
+        p[0] = p[1]
 
 def p_variable(p):
     '''variable : TOKEN_ID mas_ids TOKEN_COLON type TOKEN_SEMICOLON'''
-    semantic.add_id_to_temp_list(p[1])
-    ids = [p[1]] + (p[2] if p[2] else [])
+    compiler = p.parser.compiler
+    compiler.semantic.add_id_to_temp_list(p[1])
+    ids = [p[1]] + p[2]
     for id in ids[1:]:
-        semantic.add_id_to_temp_list(id)
-    semantic.set_current_type(p[4])
-    semantic.add_vars_to_table()
+        compiler.semantic.add_id_to_temp_list(id)
+    compiler.semantic.set_current_type(p[4])
+    compiler.semantic.add_vars_to_table()
     p[0] = ('variable', ids, p[4])
 
 def p_mas_ids(p):
-    '''mas_ids : TOKEN_COMMA TOKEN_ID mas_ids
+    '''mas_ids : mas_ids TOKEN_COMMA TOKEN_ID
     |  empty'''
-    if p[1] == None:
+    if len(p) == 2:
         p[0] = []
     else:
-        if p[3] == None:
-            p[0] = [p[2]]
-        else:
-            p[0] = [p[2]] + p[3]
+        p[1].append(p[3])
+        p[0] = p[1]
             
 def p_type_fun(p):
     '''type_fun : TOKEN_INT
     | TOKEN_FLOAT
     | TOKEN_VOID''' 
+    compiler = p.parser.compiler
     if p[1] not in ['int', 'float', 'void']:
         print(f"Error: Tipo inválido '{p[1]}', se esperaba 'int', 'float' o 'void'")
-        semantic.add_error(f"Invalid type: '{p[1]}', expected 'int', 'float' or 'void'")
+        compiler.semantic.add_error(f"Invalid type: '{p[1]}', expected 'int', 'float' or 'void'")
         p[0] = 'int'  
     else:
         p[0] = p[1]
@@ -134,9 +106,10 @@ def p_type_fun(p):
 def p_type(p):
     '''type : TOKEN_INT
     | TOKEN_FLOAT'''
+    compiler = p.parser.compiler
     if p[1] not in ['int', 'float']:
         print(f"Error: Tipo inválido '{p[1]}', se esperaba 'int' o 'float'")
-        semantic.add_error(f"Invalid type: '{p[1]}', expected 'int' or 'float'")
+        compiler.semantic.add_error(f"Invalid type: '{p[1]}', expected 'int' or 'float'")
         p[0] = 'int'  
     else:
         p[0] = p[1]
@@ -146,15 +119,13 @@ def p_body(p):
     p[0] = ('body', p[2] if p[2] else [])
     
 def p_dec_statements(p):
-    '''dec_statements : statement dec_statements
+    '''dec_statements : dec_statements statement
     | empty'''
-    if p[1] == None:
+    if len(p) == 2:
         p[0] = []
     else:
-        if isinstance(p[2], list):
-            p[0] = [p[1]] + p[2]
-        else:
-            p[0] = [p[1]]
+        p[1].append(p[2])
+        p[0] = p[1]
             
 def p_statement(p):
     '''statement : assign
@@ -168,84 +139,91 @@ def p_statement(p):
 
 def p_return_stmt(p):
     '''return_stmt : TOKEN_RETURN expresion TOKEN_SEMICOLON'''
+    compiler = p.parser.compiler
     if len(p) == 4: 
-        return_value = get_operand_name(p[2])
-        return_address = quad_gen.get_operand_address(return_value)
-        quad_gen.generate_return_quad(return_address)
+        return_address = p[2].operand
+        # return f(...) no necesita RETURN: el llamado regresa directo a quien nos llamó
+        if not compiler.quad_gen.generate_tail_call(return_address):
+            compiler.quad_gen.generate_return_quad(return_address)
         p[0] = ('return', p[2])
    
     
 def p_print(p):
     '''print : TOKEN_PRINT TOKEN_LPAREN expresiones TOKEN_RPAREN TOKEN_SEMICOLON'''
+    compiler = p.parser.compiler
     for i, expr in enumerate(p[3]):
-        if isinstance(expr, tuple) and expr[0] == 'string':
-            quad_gen.generate_print_quad(expr[1])
+        if isinstance(expr, StringLiteral):
+            compiler.quad_gen.generate_print_quad(expr.value)
         else:
-            operand = get_operand_name(expr)
-            operand_address = quad_gen.get_operand_address(operand)
-            quad_gen.generate_print_quad(operand_address)
+            compiler.quad_gen.generate_print_quad(expr.operand)
     p[0] = ('print', p[3])
     
 def p_expresiones(p):
     '''expresiones : TOKEN_CTE_STRING comas
     | expresion comas'''
     if p.slice[1].type == 'TOKEN_CTE_STRING':
-        p[0] = [('string', p[1])] + (p[2] if p[2] else [])
+        p[0] = [StringLiteral(p[1])] + p[2]
     else:
-        p[0] = [p[1]] + (p[2] if p[2] else [])
+        p[0] = [p[1]] + p[2]
         
 def p_comas(p):
-    '''comas : TOKEN_COMMA expresion comas
-    | TOKEN_COMMA TOKEN_CTE_STRING comas
+    '''comas : comas TOKEN_COMMA expresion
+    | comas TOKEN_COMMA TOKEN_CTE_STRING
     | empty'''
-    if p[1] == None:
+    if len(p) == 2:
         p[0] = []
-    elif p.slice[2].type == 'TOKEN_CTE_STRING':
-        value = p[2]
-        p[0] = [('string', value)] + (p[3] if p[3] else [])
+    elif p.slice[3].type == 'TOKEN_CTE_STRING':
+        p[1].append(StringLiteral(p[3]))
+        p[0] = p[1]
     else:
-        p[0] = [p[2]] + (p[3] if p[3] else [])
+        p[1].append(p[3])
+        p[0] = p[1]
 
 def p_saveQuad(p):
     '''saveQuad : empty'''
-    p[0] = len(quad_gen.Quads)
+    compiler = p.parser.compiler
+    p[0] = len(compiler.quad_gen.Quads)
 
 def p_GotoF(p):
     '''GotoF : empty'''
-    condition = get_operand_name(p[-1]) 
-    gotof_index = quad_gen.generate_gotof_quad(condition)
+    compiler = p.parser.compiler
+    condition = p[-1].operand 
+    gotof_index = compiler.quad_gen.generate_gotof_quad(condition)
     p[0] = gotof_index
            
 def p_cycle(p):
     '''cycle : TOKEN_WHILE TOKEN_LPAREN saveQuad expresion GotoF TOKEN_RPAREN TOKEN_DO body TOKEN_SEMICOLON'''
+    compiler = p.parser.compiler
     return_position = p[3]  
-    quad_gen.generate_goto_quad()
-    quad_gen.fill_quad(len(quad_gen.Quads) - 1, return_position)
+    compiler.quad_gen.generate_goto_quad()
+    compiler.quad_gen.fill_quad(len(compiler.quad_gen.Quads) - 1, return_position)
     gotof_index = p[5]
-    quad_gen.fill_quad(gotof_index, len(quad_gen.Quads))
+    compiler.quad_gen.fill_quad(gotof_index, len(compiler.quad_gen.Quads))
     
     p[0] = ('while', p[4], p[8])
 
 def p_saveQuadIF(p):
     '''saveQuadIF : empty'''
-    condition = get_operand_name(p[-1])
-    gotof_index = quad_gen.generate_gotof_quad(condition)
+    compiler = p.parser.compiler
+    condition = p[-1].operand
+    gotof_index = compiler.quad_gen.generate_gotof_quad(condition)
     p[0] = gotof_index
     
 def p_GotoFIF(p):
     '''GotoFIF : empty'''
-    goto_index = quad_gen.generate_goto_quad()
+    compiler = p.parser.compiler
+    goto_index = compiler.quad_gen.generate_goto_quad()
     gotof_index = p[-3]
-    quad_gen.fill_quad(gotof_index, len(quad_gen.Quads))
+    compiler.quad_gen.fill_quad(gotof_index, len(compiler.quad_gen.Quads))
     p[0] = goto_index
 
 def p_condition(p):
     '''condition : TOKEN_IF TOKEN_LPAREN expresion saveQuadIF TOKEN_RPAREN body GotoFIF else TOKEN_SEMICOLON'''
-    expr_type = get_expr_type(p[3])
-    semantic.check_condition(expr_type)
+    compiler = p.parser.compiler
+    compiler.semantic.check_condition(p[3].type)
     if p[7] is not None:
         goto_index = p[7]
-        quad_gen.fill_quad(goto_index, len(quad_gen.Quads))       
+        compiler.quad_gen.fill_quad(goto_index, len(compiler.quad_gen.Quads))       
     p[0] = ('if', p[3], p[6], p[8])
  
 def p_else(p):
@@ -259,28 +237,27 @@ def p_else(p):
 def p_cte(p):
     '''cte : TOKEN_CTE_INT
     | TOKEN_CTE_FLOAT'''
+    compiler = p.parser.compiler
     if p.slice[1].type == 'TOKEN_CTE_INT':
-        p[0] = ('constant', p[1], Type.INT)
+        p[0] = Constant(p[1], Type.INT, compiler.quad_gen.constant_address(p[1]))
     else:  
-        p[0] = ('constant', p[1], Type.FLOAT)
+        p[0] = Constant(p[1], Type.FLOAT, compiler.quad_gen.constant_address(p[1]))
 
 def p_expresion(p):
     '''expresion : exp comparar'''
+    compiler = p.parser.compiler
     if p[2] == None:
         p[0] = p[1]
     else:
-        left_type = get_expr_type(p[1])
-        right_type = get_expr_type(p[2][1])
-        op = token_to_operation(p[2][0])
-        result_type = semantic.check_expression_compatibility(left_type, right_type, op)  
-        left_operand = get_operand_name(p[1])
-        quad_gen.process_operand(left_operand, left_type)     
-        quad_gen.process_operator(p[2][0])       
-        right_operand = get_operand_name(p[2][1])
-        quad_gen.process_operand(right_operand, right_type)       
-        quad_gen.generate_arithmetic_quad()
-        p[0] = ('comparison', p[1], p[2][0], p[2][1])
-        p[0] = set_expr_type(p[0], result_type)
+        left, (operator, right) = p[1], p[2]
+        op = token_to_operation(operator)
+        result_type = compiler.semantic.check_expression_compatibility(left.type, right.type, op)  
+        compiler.quad_gen.process_operand(left.operand, left.type)     
+        compiler.quad_gen.process_operator(operator)       
+        compiler.quad_gen.process_operand(right.operand, right.type)       
+        compiler.quad_gen.generate_arithmetic_quad()
+        address = compiler.quad_gen.PilaO[-1] if compiler.quad_gen.PilaO else None
+        p[0] = Comparison(left, operator, right, result_type, address)
       
 def p_comparar(p):
     '''comparar  : signo exp
@@ -298,25 +275,24 @@ def p_signo(p):
 
 def p_exp(p):
     '''exp : termino suma_resta'''
+    compiler = p.parser.compiler
     if p[2] is None:
         p[0] = p[1]
     else:
         result = p[1]
-        first_type = get_expr_type(result)
-        first_operand = get_operand_name(result)
-        quad_gen.process_operand(first_operand, first_type)
-        for i, (op, operand) in enumerate(p[2]):
-            quad_gen.process_operator(op)
-            right_type = get_expr_type(operand)
-            right_operand = get_operand_name(operand)
-            quad_gen.process_operand(right_operand, right_type)
-            quad_gen.generate_arithmetic_quad()
-        if hasattr(quad_gen, 'PilaO') and quad_gen.PilaO:
-            temp_address = quad_gen.PilaO[-1]
-            final_type = quad_gen.PTypes[-1] if quad_gen.PTypes else Type.INT
-            result = ('temp_result', temp_address, 'type', final_type)
+        compiler.quad_gen.process_operand(result.operand, result.type)
+        for op, operand in p[2]:
+            compiler.quad_gen.process_operator(op)
+            compiler.quad_gen.process_operand(operand.operand, operand.type)
+            compiler.quad_gen.generate_arithmetic_quad()
+        if compiler.quad_gen.PilaO:
+            temp_address = compiler.quad_gen.PilaO[-1]
+            final_type = compiler.quad_gen.PTypes[-1] if compiler.quad_gen.PTypes else Type.INT
+            result = TempResult(final_type, temp_address)
         else:
-            result = ('operation', result, p[2][-1][0], p[2][-1][1])
+            op, operand = p[2][-1]
+            result_type = get_result_type(result.type, operand.type, token_to_operation(op))
+            result = BinaryOperation(result, op, operand, result_type)
         p[0] = result
 
 def p_operacion_sum_res(p):
@@ -337,25 +313,24 @@ def p_suma_resta(p):
             
 def p_termino(p):
     '''termino : factor multi_div'''  
+    compiler = p.parser.compiler
     if p[2] is None:
         p[0] = p[1]
     else:
         result = p[1]
-        first_type = get_expr_type(result)
-        first_operand = get_operand_name(result)
-        quad_gen.process_operand(first_operand, first_type)
-        for i, (op, operand) in enumerate(p[2]):
-            quad_gen.process_operator(op)
-            right_type = get_expr_type(operand)
-            right_operand = get_operand_name(operand)
-            quad_gen.process_operand(right_operand, right_type)
-            quad_gen.generate_arithmetic_quad()
-        if hasattr(quad_gen, 'PilaO') and quad_gen.PilaO:
-            temp_address = quad_gen.PilaO[-1]
-            final_type = quad_gen.PTypes[-1] if quad_gen.PTypes else Type.INT
-            result = ('temp_result', temp_address, 'type', final_type)
+        compiler.quad_gen.process_operand(result.operand, result.type)
+        for op, operand in p[2]:
+            compiler.quad_gen.process_operator(op)
+            compiler.quad_gen.process_operand(operand.operand, operand.type)
+            compiler.quad_gen.generate_arithmetic_quad()
+        if compiler.quad_gen.PilaO:
+            temp_address = compiler.quad_gen.PilaO[-1]
+            final_type = compiler.quad_gen.PTypes[-1] if compiler.quad_gen.PTypes else Type.INT
+            result = TempResult(final_type, temp_address)
         else:
-            result = ('operation', result, p[2][-1][0], p[2][-1][1])       
+            op, operand = p[2][-1]
+            result_type = get_result_type(result.type, operand.type, token_to_operation(op))
+            result = BinaryOperation(result, op, operand, result_type)       
         p[0] = result
 
 def p_multi_div(p):
@@ -381,26 +356,28 @@ def p_factor(p):
     
 def p_definicion(p):
     '''definicion : TOKEN_LPAREN expresion TOKEN_RPAREN'''
-    quad_gen.push_false_bottom()
-    quad_gen.pop_false_bottom()
+    compiler = p.parser.compiler
+    compiler.quad_gen.push_false_bottom()
+    compiler.quad_gen.pop_false_bottom()
     p[0] = p[2]
     
 def p_operaciones(p):
     '''operaciones : opciones_mas_menos id_cte'''
+    compiler = p.parser.compiler
     if p[1] == None:
         p[0] = p[2]
     else:
-        expr_type = get_expr_type(p[2])
+        expr_type = p[2].type
         if expr_type not in [Type.INT, Type.FLOAT]:
-            semantic.add_error(f"Unary operation not supported for type {expr_type}")
-        operand = get_operand_name(p[2])
+            compiler.semantic.add_error(f"Unary operation not supported for type {expr_type}")
+        address = None
         if p[1] == '-':
-            quad_gen.process_operand("-1", Type.INT)  
-            quad_gen.process_operand(operand, expr_type) 
-            quad_gen.process_operator('*')  
-            quad_gen.generate_arithmetic_quad() 
-        p[0] = ('unary', p[1], p[2])
-        p[0] = set_expr_type(p[0], expr_type)
+            compiler.quad_gen.process_operand(compiler.quad_gen.constant_address(-1), Type.INT)  
+            compiler.quad_gen.process_operand(p[2].operand, expr_type) 
+            compiler.quad_gen.process_operator('*')  
+            compiler.quad_gen.generate_arithmetic_quad() 
+            address = compiler.quad_gen.PilaO[-1] if compiler.quad_gen.PilaO else None
+        p[0] = Unary(p[1], p[2], expr_type, address)
         
 def p_opciones_mas_menos(p):
     '''opciones_mas_menos : TOKEN_PLUS
@@ -412,27 +389,26 @@ def p_id_cte(p):
     '''id_cte : TOKEN_ID
     | cte
     | function_call_expr'''  
-    if isinstance(p[1], tuple):
+    compiler = p.parser.compiler
+    if isinstance(p[1], Expression):
         p[0] = p[1]
     else:
-        if p[1] and p.slice[1].type == 'TOKEN_ID':
-            var_type = semantic.check_variable(p[1])
-            p[0] = ('id', p[1])
-            p[0] = set_expr_type(p[0], var_type)
+        variable = compiler.semantic.lookup_variable(p[1])
+        if variable is None:
+            p[0] = Id(p[1], compiler.semantic.check_variable(p[1]), UNRESOLVED)
         else:
-            if p.slice[1].type == 'cte':
-                p[0] = p[1]
-            else:
-                p[0] = ('id', p[1])
+            p[0] = Id(p[1], variable.type, variable.address)
 
 def p_funcs(p):
     '''funcs : type_fun TOKEN_ID save_func_start TOKEN_LPAREN tipo TOKEN_RPAREN TOKEN_LCOL var body TOKEN_RCOL end_func TOKEN_SEMICOLON'''
-    semantic.check_function(p[2])    
+    compiler = p.parser.compiler
+    compiler.semantic.check_function(p[2])    
     params = p[5] if p[5] else []   
     p[0] = ('function', p[2], params, p[8], p[9])
 
 def p_save_func_start(p):
     '''save_func_start : empty'''
+    compiler = p.parser.compiler
     function_name = p[-1]  
     return_type_str = p[-2] 
     if return_type_str == 'int':
@@ -441,48 +417,44 @@ def p_save_func_start(p):
         return_type = Type.FLOAT
     else:
         return_type = Type.VOID  
-    semantic.declare_function(function_name, return_type)
-    quad_gen.save_function_start(function_name)
+    compiler.semantic.declare_function(function_name, return_type)
+    compiler.quad_gen.save_function_start(function_name)
     p[0] = None
 
 def p_end_func(p):
     '''end_func : empty'''
-    quad_gen.generate_endfunc_quad()
-    semantic.end_function_declaration()
+    compiler = p.parser.compiler
+    compiler.quad_gen.generate_endfunc_quad()
+    compiler.semantic.end_function_declaration()
     p[0] = None
     
 def p_tipo(p):
     '''tipo : def_tipo
     | empty'''
+    compiler = p.parser.compiler
     if p[1]:
         for param in p[1]:
             if isinstance(param, tuple) and len(param) >= 3 and param[0] == 'param':
                 param_id = param[1]
                 param_type = param[2]
                 if param_type not in ['int', 'float']:
-                    semantic.add_error(f"Invalid parameter type '{param_type}' for parameter '{param_id}' in function")
+                    compiler.semantic.add_error(f"Invalid parameter type '{param_type}' for parameter '{param_id}' in function")
                     continue
-                semantic.add_parameter(param_id, param_type)
+                compiler.semantic.add_parameter(param_id, param_type)
     p[0] = p[1]
     
 def p_def_tipo(p):
     '''def_tipo : TOKEN_ID TOKEN_COLON type coma'''
-    if p[4] == None:
-        p[0] = [('param', p[1], p[3])]
-    else:
-        p[0] = [('param', p[1], p[3])] + p[4]
+    p[0] = [('param', p[1], p[3])] + p[4]
         
 def p_coma(p):
-    '''coma : TOKEN_COMMA TOKEN_ID TOKEN_COLON type coma
+    '''coma : coma TOKEN_COMMA TOKEN_ID TOKEN_COLON type
     | empty'''
-    if p[1] == None:
-        p[0] = None
+    if len(p) == 2:
+        p[0] = []
     else:
-        new_param = ('param', p[2], p[4])
-        if p[5] == None:
-            p[0] = [new_param]
-        else:
-            p[0] = [new_param] + p[5]
+        p[1].append(('param', p[3], p[5]))
+        p[0] = p[1]
             
 def p_var(p):
     '''var : vars 
@@ -491,54 +463,56 @@ def p_var(p):
     
 def p_f_call(p):
     '''f_call : TOKEN_ID era_quad TOKEN_LPAREN def_exp TOKEN_RPAREN gosub_quad TOKEN_SEMICOLON'''
-    func = semantic.check_function(p[1])
+    compiler = p.parser.compiler
+    func = compiler.semantic.check_function(p[1])
     if func:
         args = p[4] if p[4] else []
         if len(args) != len(func.parameters):
-            semantic.add_error(f"Function '{p[1]}' expects {len(func.parameters)} arguments, got {len(args)}")
+            compiler.semantic.add_error(f"Function '{p[1]}' expects {len(func.parameters)} arguments, got {len(args)}")
         else:
             for i, (arg, param) in enumerate(zip(args, func.parameters)):
-                arg_type = get_expr_type(arg)
+                arg_type = arg.type
                 param_type = param.type
                 result_type = get_result_type(param_type, arg_type, Operation.ASSIGN)
                 if result_type == Type.ERROR:
-                    semantic.add_error(f"No hay coincidencia de tipo parametro en la llamada '{p[1]}': Parametro{i+1} espera {param_type}, obtiene {arg_type}")
+                    compiler.semantic.add_error(f"No hay coincidencia de tipo parametro en la llamada '{p[1]}': Parametro{i+1} espera {param_type}, obtiene {arg_type}")
         
     p[0] = ('function_call', p[1], p[4] if p[4] else [])
 
 def p_function_call_expr(p):
     '''function_call_expr : TOKEN_ID era_quad TOKEN_LPAREN def_exp TOKEN_RPAREN gosub_quad'''
-    func = semantic.check_function(p[1])
+    compiler = p.parser.compiler
+    func = compiler.semantic.check_function(p[1])
     if func:
         args = p[4] if p[4] else []
         if len(args) != len(func.parameters):
-            semantic.add_error(f"Funcion '{p[1]}' espera {len(func.parameters)} argumentos, obtiene {len(args)}")
+            compiler.semantic.add_error(f"Funcion '{p[1]}' espera {len(func.parameters)} argumentos, obtiene {len(args)}")
         else:
             for i, (arg, param) in enumerate(zip(args, func.parameters)):
-                arg_type = get_expr_type(arg)
+                arg_type = arg.type
                 param_type = param.type
                 result_type = get_result_type(param_type, arg_type, Operation.ASSIGN)
                 if result_type == Type.ERROR:
-                    semantic.add_error(f"No hay coincidencia de tipo parametro en la llamada '{p[1]}': Parametro{i+1} espera {param_type}, obtiene {arg_type}")
-    p[0] = ('function_call_expr', p[1], p[4] if p[4] else [])
-
-    if func and func.return_type != Type.VOID:
-        p[0] = set_expr_type(p[0], func.return_type)
-        if quad_gen.PilaO:
-            temp_result = quad_gen.PilaO[-1]
-            p[0] = p[0] + ('temp_result', temp_result)
+                    compiler.semantic.add_error(f"No hay coincidencia de tipo parametro en la llamada '{p[1]}': Parametro{i+1} espera {param_type}, obtiene {arg_type}")
+    return_type = func.return_type if func else Type.ERROR
+    temp_result = None
+    if return_type not in (Type.VOID, Type.ERROR) and compiler.quad_gen.PilaO:
+        temp_result = compiler.quad_gen.PilaO[-1]
+    p[0] = FunctionCall(p[1], p[4] if p[4] else [], return_type, temp_result)
         
 def p_era_quad(p):
     '''era_quad : empty'''
+    compiler = p.parser.compiler
     function_name = p[-1]
-    quad_gen.generate_era_quad(function_name)
-    quad_gen.reset_param_counter()
+    compiler.quad_gen.generate_era_quad(function_name)
+    compiler.quad_gen.reset_param_counter()
     p[0] = None
 
 def p_gosub_quad(p):
     '''gosub_quad : empty'''
+    compiler = p.parser.compiler
     function_name = p[-5]
-    quad_gen.generate_gosub_quad(function_name)
+    compiler.quad_gen.generate_gosub_quad(function_name)
     p[0] = None
 
 def p_def_exp(p):
@@ -547,58 +521,54 @@ def p_def_exp(p):
     if p[1] is None:
         p[0] = []
     else:
-        args = [p[1]]
-        if p[3]:
-            args.extend(p[3])
-        p[0] = args
+        p[0] = [p[1]] + p[3]
 
 def p_param_quad(p):
     '''param_quad : empty'''
+    compiler = p.parser.compiler
     if len(p) > 1 and p[-1] is not None:
-        operand = get_operand_name(p[-1])
-        operand_address = quad_gen.get_operand_address(operand)
-        param_number = quad_gen.increment_param_counter()
-        quad_gen.generate_param_quad(operand_address, param_number)
+        param_number = compiler.quad_gen.increment_param_counter()
+        compiler.quad_gen.generate_param_quad(p[-1].operand, param_number)
     p[0] = None
          
 def p_coma2(p):
-    '''coma2 : TOKEN_COMMA expresion param_quad_coma coma2
+    '''coma2 : coma2 TOKEN_COMMA expresion param_quad_coma
     | empty'''
-    if p[1] == None:
+    if len(p) == 2:
         p[0] = []
     else:
-        p[0] = [p[2]] + (p[4] if p[4] else [])
+        p[1].append(p[3])
+        p[0] = p[1]
 
 def p_param_quad_coma(p):
     '''param_quad_coma : empty'''
+    compiler = p.parser.compiler
     if len(p) > 1 and p[-1] is not None:
-        operand = get_operand_name(p[-1])
-        operand_address = quad_gen.get_operand_address(operand)
-        param_number = quad_gen.increment_param_counter()
-        quad_gen.generate_param_quad(operand_address, param_number)
+        param_number = compiler.quad_gen.increment_param_counter()
+        compiler.quad_gen.generate_param_quad(p[-1].operand, param_number)
     p[0] = None
         
 def p_assign(p):
     '''assign : TOKEN_ID TOKEN_ASSIGN expresion TOKEN_SEMICOLON'''
-    var_type = semantic.check_variable(p[1])
-    expr_type = get_expr_type(p[3])
-    semantic.check_assignment_compatibility(p[1], expr_type)
-    expression_result = get_operand_name(p[3])
-    quad_gen.generate_assignment_quad(p[1], expression_result)  
+    compiler = p.parser.compiler
+    target = compiler.semantic.lookup_variable(p[1])
+    compiler.semantic.check_assignment_compatibility(p[1], p[3].type)
+    target_address = target.address if target else UNRESOLVED
+    compiler.quad_gen.generate_assignment_quad(target_address, p[3].operand)  
     p[0] = ('assign', p[1], p[3])
 
 def p_for_cycle(p):
     '''for_cycle : TOKEN_FOR TOKEN_LPAREN for_init TOKEN_SEMICOLON saveQuadFor expresion GotoFFor TOKEN_SEMICOLON for_increment TOKEN_RPAREN TOKEN_DO body TOKEN_SEMICOLON'''
+    compiler = p.parser.compiler
     if p[9]:  
         if p[9][0] == 'assign':
             var_name = p[9][1] 
-            expr_result = get_operand_name(p[9][2])
-            quad_gen.generate_assignment_quad(var_name, expr_result) 
+            compiler.quad_gen.generate_assignment_quad(var_name, p[9][2].operand) 
     loop_start = p[5]
-    quad_gen.generate_goto_quad()
-    quad_gen.fill_quad(len(quad_gen.Quads) - 1, loop_start)
+    compiler.quad_gen.generate_goto_quad()
+    compiler.quad_gen.fill_quad(len(compiler.quad_gen.Quads) - 1, loop_start)
     gotof_index = p[7]  
-    quad_gen.fill_quad(gotof_index, len(quad_gen.Quads))
+    compiler.quad_gen.fill_quad(gotof_index, len(compiler.quad_gen.Quads))
     
     p[0] = ('for', p[3], p[6], p[9], p[12])
 
@@ -609,11 +579,11 @@ def p_for_init(p):
 
 def p_assign_for(p):
     '''assign_for : TOKEN_ID TOKEN_ASSIGN expresion'''
-    var_type = semantic.check_variable(p[1])
-    expr_type = get_expr_type(p[3])
-    semantic.check_assignment_compatibility(p[1], expr_type)
-    expression_result = get_operand_name(p[3])
-    quad_gen.generate_assignment_quad(p[1], expression_result)  
+    compiler = p.parser.compiler
+    target = compiler.semantic.lookup_variable(p[1])
+    compiler.semantic.check_assignment_compatibility(p[1], p[3].type)
+    target_address = target.address if target else UNRESOLVED
+    compiler.quad_gen.generate_assignment_quad(target_address, p[3].operand)  
     p[0] = ('assign', p[1], p[3])
 
 def p_for_increment(p):
@@ -623,20 +593,20 @@ def p_for_increment(p):
 
 def p_assign_for_increment(p):
     '''assign_for_increment : TOKEN_ID TOKEN_ASSIGN expresion'''
-    var_type = semantic.check_variable(p[1])
-    expr_type = get_expr_type(p[3])
-    semantic.check_assignment_compatibility(p[1], expr_type)
-    expression_result = get_operand_name(p[3])
+    compiler = p.parser.compiler
+    compiler.semantic.check_assignment_compatibility(p[1], p[3].type)
     p[0] = ('assign', p[1], p[3])
 
 def p_saveQuadFor(p):
     '''saveQuadFor : empty'''
-    p[0] = len(quad_gen.Quads)
+    compiler = p.parser.compiler
+    p[0] = len(compiler.quad_gen.Quads)
 
 def p_GotoFFor(p):
     '''GotoFFor : empty'''
-    condition = get_operand_name(p[-1])  
-    gotof_index = quad_gen.generate_gotof_quad(condition)
+    compiler = p.parser.compiler
+    condition = p[-1].operand  
+    gotof_index = compiler.quad_gen.generate_gotof_quad(condition)
     p[0] = gotof_index
 
        
@@ -673,84 +643,135 @@ def token_to_operation(token):
     else:
         raise SyntaxError("error_msg: token invalido {token}")
         
-def set_expr_type(expr_node, expr_type):
-    if isinstance(expr_node, tuple):
-        for i in range(len(expr_node)):
-            if expr_node[i] == 'type':
-                return expr_node[:i] + ('type', expr_type) + expr_node[i+2:]
-        expr_node = expr_node + ('type', expr_type)
-    return expr_node
+# Tablas LALR en un archivo fijo junto a este módulo, sin importar el
+# directorio de trabajo. PLY guarda con ellas la firma de la gramática (reglas,
+# precedencias y tokens) y las regenera si no coincide con la actual.
+PARSER_TABLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parser_tables.pickle')
+_parser_lock = threading.Lock()
+
+def get_parser():
+    """Parser plantilla, construido la primera vez que se pide. Sus tablas se
+    comparten entre todas las compilaciones."""
+    global parser
+    with _parser_lock:
+        if 'parser' not in globals():
+            module = sys.modules[__name__]
+            try:
+                parser = yacc.yacc(module=module, debug=False, picklefile=PARSER_TABLES)
+            except (EOFError, pickle.UnpicklingError):
+                # Archivo de tablas truncado o corrupto: se regenera
+                os.remove(PARSER_TABLES)
+                parser = yacc.yacc(module=module, debug=False, picklefile=PARSER_TABLES)
+    return parser
+
+def __getattr__(name):
+    if name == 'parser':
+        return get_parser()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class Compiler:
+    """Estado de una compilación: analizador semántico, generador de
+    cuádruplos, un clon del lexer y una copia del parser. Las acciones de la
+    gramática lo alcanzan con p.parser.compiler, así que cada Compiler puede
+    compilar en su propio hilo sin compartir estado con los demás.
+    fast_lexer=True usa lex.FastLexer en lugar del lexer de PLY."""
+    def __init__(self, fast_lexer=False):
+        self.lexer = FastLexer() if fast_lexer else get_lexer().clone()
+        # Copia superficial: las tablas se comparten, las pilas del análisis no
+        self.parser = copy.copy(get_parser())
+        self.parser.compiler = self
+        self.semantic = None
+        self.quad_gen = None
     
-def get_expr_type(expr_node):
-    if isinstance(expr_node, tuple):
-        if expr_node[0] == 'temp_result':
-            for i in range(len(expr_node) - 1):
-                if expr_node[i] == 'type' and i + 1 < len(expr_node):
-                    return expr_node[i + 1]
-        
-        for i in range(len(expr_node) - 1):
-            if expr_node[i] == 'type' and i + 1 < len(expr_node):
-                return expr_node[i + 1]
-        if expr_node[0] == 'id':
-            return semantic.check_variable(expr_node[1])
-        elif expr_node[0] == 'constant':
-            if len(expr_node) > 2:
-                return expr_node[2]
-            elif isinstance(expr_node[1], int):
-                return Type.INT
-            elif isinstance(expr_node[1], float):
-                return Type.FLOAT
-            elif isinstance(expr_node[1], str):
-                try:
-                    float(expr_node[1])
-                    if '.' in expr_node[1]:
-                        return Type.FLOAT
-                    else:
-                        return Type.INT
-                except:
-                    return Type.ERROR
-        elif expr_node[0] == 'operation':
-            left_type = get_expr_type(expr_node[1])
-            right_type = get_expr_type(expr_node[3])
-            op = token_to_operation(expr_node[2])
-            return get_result_type(left_type, right_type, op)
-        elif expr_node[0] == 'comparison':
-            return Type.BOOL
-        elif expr_node[0] == 'function_call_expr':  
-            func = semantic.check_function(expr_node[1])
-            if func:
-                return func.return_type
-            return Type.ERROR
-    return Type.ERROR
+    def parse(self, code):
+        """Compila un programa desde cero y regresa (resultado, errores)"""
+        self.semantic = SemanticAnalyzer()
+        self.quad_gen = QuadrupleGenerator(self.semantic)
+        self.lexer.lineno = 1
+        result = self.parser.parse(code, lexer=self.lexer)
+        return result, self.semantic.error_list
     
-parser = yacc.yacc(debug=False)
+    def get_execution_data(self):
+        return self.quad_gen.get_execution_data()
 
 def parse_program(code):
-    global semantic
-    semantic = SemanticAnalyzer()
-    global quad_gen
-    quad_gen = QuadrupleGenerator(semantic)
-    result = parser.parse(code)
-    return result, semantic.error_list
-
-def execute_program(code):
-    from virtual_machine import VirtualMachine
-    result, errors = parse_program(code)
+    return Compiler().parse(code)
+
+def compile_program(code, optimize=False, cache=None):
+    """Compila un programa y regresa (datos de ejecución, errores).
+    Si el código ya se compiló con esta versión del compilador los datos se
+    leen de la caché en disco sin pasar por el front end, imprimiendo el
+    mismo listado de cuádruplos que una compilación completa. cache=None usa
+    la caché por defecto y cache=False la desactiva."""
+    if cache is None:
+        from compile_cache import default_cache
+        cache = default_cache()
+    if cache:
+        entry = cache.load_entry(code, optimize)
+        if entry is not None:
+            execution_data, listing = entry
+            print("\n".join(listing))
+            return execution_data, []
+    compiler = Compiler()
+    result, errors = compiler.parse(code)
+    if errors:
+        return None, errors
+    # El listado que imprimió el parser es el de antes de optimizar
+    listing = compiler.quad_gen.listing or ()
+    if optimize:
+        import optimizer
+        optimizer.optimize(compiler.quad_gen)
+    execution_data = compiler.get_execution_data()
+    if cache:
+        cache.store(code, execution_data, optimize, listing)
+    return execution_data, errors
+
+def get_machine_class(backend):
+    """Clase de máquina virtual para el backend indicado ('vm', 'closure' o 'python')"""
+    if backend == 'vm':
+        from virtual_machine import VirtualMachine
+        return VirtualMachine
+    if backend == 'closure':
+        from closure_backend import ClosureVirtualMachine
+        return ClosureVirtualMachine
+    if backend == 'python':
+        from python_backend import PythonVirtualMachine
+        return PythonVirtualMachine
+    raise ValueError(f"Backend desconocido: {backend}")
+
+def execute_program(code, verbosity=None, backend='vm', optimize=False, profiler=None,
+                    memo_capacity=None, cache=None):
+    execution_data, errors = compile_program(code, optimize, cache)
     
     if errors:
         print("ERRORES SEMÁNTICOS:")
         for error in errors:
             print(f"  {error}")
         return None
-    execution_data = quad_gen.get_execution_data()
-    vm = VirtualMachine(
+    return run_execution_data(execution_data, verbosity, backend, profiler, memo_capacity)
+
+def run_execution_data(execution_data, verbosity=None, backend='vm', profiler=None,
+                       memo_capacity=None):
+    """Ejecuta un programa ya compilado (de compile_program o de bytecode.load)"""
+    from virtual_machine import VERBOSITY_TRACE, DEFAULT_MEMO_CAPACITY
+    if memo_capacity is None:
+        memo_capacity = DEFAULT_MEMO_CAPACITY
+    if verbosity is None:
+        verbosity = VERBOSITY_TRACE
+    machine_class = get_machine_class(backend)
+    vm = machine_class(
         execution_data['quadruples'],
         execution_data['constants_table'],
-        execution_data['function_directory']
+        execution_data['function_directory'],
+        execution_data['memory_sizes'],
+        verbosity=verbosity,
+        memo_capacity=memo_capacity
     )
+    vm.profiler = profiler
     vm.execute()
-    vm.print_memory_state()
-    vm.print_program_outputs()
+    if verbosity >= VERBOSITY_TRACE:
+        vm.print_memory_state()
+        vm.print_program_outputs()
     
     return vm
     